@@ -1,14 +1,24 @@
 """Job matching agent using LangChain."""
 
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, List, Sequence
 
+from langchain_core.exceptions import OutputParserException
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 
-from app.core.llm import get_llm
+from app.core.hashing import content_hash
+from app.core.llm import get_llm, get_model_name
+from app.core.llm_metrics import chain_config
+from app.core.singleflight import SingleFlight
 from app.models.candidate import CandidateMatch
 
+PROMPT_VERSION = "1"
+
+# Identical prompts in flight at once (e.g. the same ranking opened twice) share one LLM call.
+_inflight: SingleFlight[Any] = SingleFlight("matcher")
+
 
 class MatchAnalysis(BaseModel):
     """Match analysis result."""
@@ -21,11 +31,21 @@ class MatchAnalysis(BaseModel):
     strengths: list[str] = Field(description="Candidate's notable strengths for this role")
 
 
+class BatchMatchItem(MatchAnalysis):
+    """Match analysis for one candidate in a batch."""
+    candidate_id: int = Field(description="ID of the candidate being scored")
+
+
+class BatchMatchAnalysis(BaseModel):
+    """Match analyses for several candidates against one job."""
+    matches: list[BatchMatchItem] = Field(description="One analysis per candidate")
+
+
 class JobMatcherAgent:
     """Agent for matching candidates to job requirements."""
 
     def __init__(self):
-        self.llm = get_llm()
+        self.llm = get_llm("matcher")
         self.parser = JsonOutputParser(pydantic_object=MatchAnalysis)
 
         self.prompt = ChatPromptTemplate.from_messages([
@@ -60,24 +80,134 @@ Work History: {work_history}
 Provide a detailed match analysis."""),
         ])
 
-    async def match(self, candidate, job) -> CandidateMatch:
-        """Match a candidate against a job posting."""
-        chain = self.prompt | self.llm | self.parser
+        self.batch_parser = JsonOutputParser(pydantic_object=BatchMatchAnalysis)
+        self.batch_prompt = ChatPromptTemplate.from_messages([
+            ("system", """You are an expert recruiter analyzing candidate-job fit.
+
+Analyze how well each candidate matches the job posting. For every candidate consider:
+1. Skills match - how well the candidate's skills align with requirements
+2. Experience match - years of experience and relevance
+3. Education match - education level and field relevance
+4. Overall fit - combining all factors
+
+Score each candidate independently. Be fair and objective. Provide specific
+reasoning for every candidate and return exactly one analysis per candidate ID.
+
+{format_instructions}"""),
+            ("human", """Analyze these candidates against the job posting:
 
-        result = await chain.ainvoke({
+## JOB POSTING
+Title: {job_title}
+Description: {job_description}
+Required Skills: {required_skills}
+Preferred Skills: {preferred_skills}
+Experience Required: {experience_required}
+Education: {education_required}
+
+## CANDIDATES
+{candidates}
+
+Provide a detailed match analysis for each candidate."""),
+        ])
+
+    @staticmethod
+    def job_inputs(job) -> Dict[str, Any]:
+        """Prompt variables taken from the job posting."""
+        return {
             "job_title": job.title,
             "job_description": job.description,
             "required_skills": ", ".join(job.required_skills or []),
             "preferred_skills": ", ".join(job.preferred_skills or []),
             "experience_required": f"{job.experience_min}-{job.experience_max or 'any'} years",
             "education_required": job.education_level or "Not specified",
+        }
+
+    @staticmethod
+    def candidate_inputs(candidate) -> Dict[str, Any]:
+        """Prompt variables taken from the candidate profile."""
+        return {
             "candidate_name": candidate.name,
             "candidate_skills": ", ".join(candidate.skills or []),
             "candidate_experience": candidate.experience_years or 0,
             "candidate_education": str(candidate.education or []),
             "work_history": str(candidate.work_history or []),
+        }
+
+    @staticmethod
+    def _call_key(prompt: ChatPromptTemplate, inputs: Dict[str, Any]) -> str:
+        return content_hash(get_model_name("matcher"), prompt.format(**inputs))
+
+    @classmethod
+    def _format_candidate(cls, candidate) -> str:
+        inputs = cls.candidate_inputs(candidate)
+        return f"""### Candidate ID {candidate.id}
+Name: {inputs["candidate_name"]}
+Skills: {inputs["candidate_skills"]}
+Experience: {inputs["candidate_experience"]} years
+Education: {inputs["candidate_education"]}
+Work History: {inputs["work_history"]}"""
+
+    async def match_batch(
+        self,
+        candidates: Sequence[Any],
+        job,
+        fallback: bool = True,
+    ) -> List[CandidateMatch]:
+        """Match several candidates against one job in a single prompt.
+
+        Each returned item is validated on its own. Candidates that are missing
+        from the response or fail validation are re-scored with ``match`` when
+        ``fallback`` is set, and left out of the result otherwise.
+        """
+        chain = self.batch_prompt | self.llm | self.batch_parser
+        inputs = {
+            **self.job_inputs(job),
+            "candidates": "\n\n".join(self._format_candidate(c) for c in candidates),
+            "format_instructions": self.batch_parser.get_format_instructions(),
+        }
+
+        try:
+            result = await _inflight.do(
+                self._call_key(self.batch_prompt, inputs),
+                lambda: chain.ainvoke(inputs, config=chain_config("matcher")),
+            )
+        except OutputParserException:
+            result = {}
+
+        items = result.get("matches", []) if isinstance(result, dict) else []
+        wanted = {candidate.id for candidate in candidates}
+        matches: Dict[int, CandidateMatch] = {}
+        for item in items:
+            try:
+                analysis = BatchMatchItem.model_validate(item)
+                if analysis.candidate_id in wanted:
+                    matches[analysis.candidate_id] = CandidateMatch(
+                        job_id=job.id,
+                        **analysis.model_dump(),
+                    )
+            except ValidationError:
+                continue
+
+        missing = [c for c in candidates if c.id not in matches]
+        if fallback and missing:
+            singles = await asyncio.gather(*(self.match(c, job) for c in missing))
+            matches.update((m.candidate_id, m) for m in singles)
+
+        return [matches[c.id] for c in candidates if c.id in matches]
+
+    async def match(self, candidate, job) -> CandidateMatch:
+        """Match a candidate against a job posting."""
+        chain = self.prompt | self.llm | self.parser
+        inputs = {
+            **self.job_inputs(job),
+            **self.candidate_inputs(candidate),
             "format_instructions": self.parser.get_format_instructions(),
-        })
+        }
+
+        result = await _inflight.do(
+            self._call_key(self.prompt, inputs),
+            lambda: chain.ainvoke(inputs, config=chain_config("matcher")),
+        )
 
         return CandidateMatch(
             candidate_id=candidate.id,
@@ -1,13 +1,34 @@
 """Resume parsing agent using LangChain."""
 
-import io
-from typing import Dict, Any, Optional
+import copy
+from typing import Dict, Any, List, Optional, Tuple
 
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
 
-from app.core.llm import get_llm
+from app.core.config import settings
+from app.core.hashing import content_hash
+from app.core.llm import get_llm, get_model_name, llm_spec
+from app.core.llm_metrics import chain_config
+from app.core.singleflight import SingleFlight
+from app.core.tokens import get_token_counter
+from app.services.extraction import extract_text
+from app.services.uploads import ResumeSource
+from app.tools.resume_extractor import pre_extract
+from app.tools.resume_sections import fit_to_budget
+from app.tools.skill_taxonomy import canonical_skill_name
+
+PROMPT_VERSION = "1"
+# Bumped when pre_extract changes, so hybrid and fast parses are redone.
+PRE_EXTRACT_VERSION = "2"
+PARSE_MODES = ("full", "hybrid", "fast")
+# Found by patterns but still asked of the LLM in hybrid mode: taxonomy
+# skills are not exhaustive, and a first line can look like a name.
+LLM_CHECKED_FIELDS = ("name", "skills")
+
+# Identical prompts in flight at once (e.g. a retried upload) share one LLM call.
+_inflight: SingleFlight[Dict[str, Any]] = SingleFlight("parser")
 
 
 class ParsedResume(BaseModel):
@@ -22,11 +43,38 @@ class ParsedResume(BaseModel):
     work_history: list[Dict[str, Any]] = Field(description="Work experience")
 
 
+EMPTY_RESUME: Dict[str, Any] = {
+    "name": "Unknown",
+    "email": None,
+    "phone": None,
+    "summary": None,
+    "skills": [],
+    "experience_years": 0,
+    "education": [],
+    "work_history": [],
+}
+
+
+def parse_version(mode: str) -> str:
+    """Version tag for parser output produced in a given mode."""
+    return PROMPT_VERSION if mode == "full" else f"{PROMPT_VERSION}-{mode}.{PRE_EXTRACT_VERSION}"
+
+
+def _field_instructions(fields: List[str]) -> str:
+    lines = [f'- "{name}": {ParsedResume.model_fields[name].description}' for name in fields]
+    return "Return only a JSON object with these keys:\n" + "\n".join(lines)
+
+
 class ResumeParserAgent:
-    """Agent for parsing and extracting information from resumes."""
+    """Agent for parsing and extracting information from resumes.
+
+    Parse modes: ``full`` sends everything to the LLM; ``hybrid`` fills the
+    fields the deterministic pre-extractor finds and asks the LLM only for
+    the rest, plus the name and skills it checks; ``fast`` skips the LLM
+    entirely.
+    """
 
     def __init__(self):
-        self.llm = get_llm()
         self.parser = JsonOutputParser(pydantic_object=ParsedResume)
 
         self.prompt = ChatPromptTemplate.from_messages([
@@ -46,50 +94,92 @@ Be thorough and accurate. If information is not present, use null or empty value
             ("human", "Parse this resume:\n\n{resume_text}"),
         ])
 
-    async def parse(self, content: bytes, filename: str) -> Dict[str, Any]:
-        """Parse resume content and extract structured data."""
-        raw_text = await self._extract_text(content, filename)
-        chain = self.prompt | self.llm | self.parser
-
-        result = await chain.ainvoke({
-            "resume_text": raw_text,
-            "format_instructions": self.parser.get_format_instructions(),
-        })
+    @property
+    def llm(self):
+        return get_llm("parser")
 
+    async def parse(
+        self, content: ResumeSource, filename: str, mode: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Parse resume content, or a spooled upload's path, and extract structured data."""
+        raw_text = await self._extract_text(content, filename)
+        return await self.parse_text(raw_text, mode)
+
+    async def parse_text(self, raw_text: str, mode: Optional[str] = None) -> Dict[str, Any]:
+        """Extract structured data from already extracted resume text."""
+        mode = mode or settings.resume_parse_mode
+        if mode not in PARSE_MODES:
+            raise ValueError(f"Unknown parse mode: {mode}")
+
+        if mode == "full":
+            instructions = self.parser.get_format_instructions()
+            result, trimming = await self._llm_parse(raw_text, instructions)
+            result["trimming"] = trimming
+        else:
+            found = pre_extract(raw_text)
+            result = {**EMPTY_RESUME, **found}
+            if mode == "hybrid":
+                missing = [
+                    f for f in ParsedResume.model_fields
+                    if f not in found or f in LLM_CHECKED_FIELDS
+                ]
+                extracted, result["trimming"] = await self._llm_parse(
+                    raw_text, _field_instructions(missing)
+                )
+                answered = {
+                    f: extracted[f]
+                    for f in missing
+                    if f in extracted and (f not in found or extracted[f])
+                }
+                result.update(answered)
+                result["skills"] = self._merge_skills(
+                    found.get("skills", []), result["skills"] or []
+                )
+                found = {f: v for f, v in found.items() if f == "skills" or f not in answered}
+            result["deterministic_fields"] = sorted(found)
+
+        result["parse_mode"] = mode
         result["raw_text"] = raw_text
         return result
 
-    async def _extract_text(self, content: bytes, filename: str) -> str:
+    def token_budget(self, format_instructions: str) -> int:
+        """Tokens of resume text the parse prompt can carry.
+
+        Capped at ``settings.resume_max_tokens``; for llama.cpp also by the
+        context window minus the prompt and the room kept for the answer.
+        """
+        budget = settings.resume_max_tokens
+        if llm_spec("parser").provider == "llamacpp":
+            count_tokens = get_token_counter("parser")
+            overhead = count_tokens(
+                self.prompt.format(resume_text="", format_instructions=format_instructions)
+            )
+            budget = min(budget, settings.llamacpp_n_ctx - overhead - settings.resume_output_tokens)
+        return max(budget, 0)
+
+    async def _llm_parse(
+        self, raw_text: str, format_instructions: str
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Run the parse prompt on budget-trimmed text; returns (result, trimming report)."""
+        text, trimming = fit_to_budget(
+            raw_text, self.token_budget(format_instructions), get_token_counter("parser")
+        )
+        chain = self.prompt | self.llm | self.parser
+        inputs = {"resume_text": text, "format_instructions": format_instructions}
+        result = await _inflight.do(
+            content_hash(get_model_name("parser"), self.prompt.format(**inputs)),
+            lambda: chain.ainvoke(inputs, config=chain_config("parser")),
+        )
+        return copy.deepcopy(result), trimming
+
+    @staticmethod
+    def _merge_skills(*lists: List[str]) -> List[str]:
+        merged: Dict[str, str] = {}
+        for skills in lists:
+            for skill in skills:
+                merged.setdefault(canonical_skill_name(skill), skill)
+        return list(merged.values())
+
+    async def _extract_text(self, content: ResumeSource, filename: str) -> str:
         """Extract text from various file formats."""
-        filename_lower = filename.lower()
-
-        if filename_lower.endswith(".pdf"):
-            return await self._extract_from_pdf(content)
-        elif filename_lower.endswith(".docx"):
-            return await self._extract_from_docx(content)
-        elif filename_lower.endswith(".txt"):
-            return content.decode("utf-8", errors="ignore")
-        else:
-            return content.decode("utf-8", errors="ignore")
-
-    async def _extract_from_pdf(self, content: bytes) -> str:
-        """Extract text from PDF."""
-        try:
-            from pypdf import PdfReader
-            reader = PdfReader(io.BytesIO(content))
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            return text
-        except Exception as e:
-            return f"Error extracting PDF: {e}"
-
-    async def _extract_from_docx(self, content: bytes) -> str:
-        """Extract text from DOCX."""
-        try:
-            from docx import Document
-            doc = Document(io.BytesIO(content))
-            text = "\n".join([para.text for para in doc.paragraphs])
-            return text
-        except Exception as e:
-            return f"Error extracting DOCX: {e}"
\ No newline at end of file
+        return await extract_text(content, filename)
@@ -8,6 +8,7 @@ from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
 
 from app.core.llm import get_llm
+from app.core.llm_metrics import chain_config
 
 
 class ScheduleRecommendation(BaseModel):
@@ -21,7 +22,7 @@ class SchedulerAgent:
     """Agent for scheduling interviews."""
 
     def __init__(self):
-        self.llm = get_llm()
+        self.llm = get_llm("scheduler")
         self.parser = JsonOutputParser(pydantic_object=ScheduleRecommendation)
 
         self.prompt = ChatPromptTemplate.from_messages([
@@ -69,7 +70,7 @@ Recommend the best interview time."""),
             "preferred_dates": preferred_str,
             "current_time": datetime.now().isoformat(),
             "format_instructions": self.parser.get_format_instructions(),
-        })
+        }, config=chain_config("scheduler"))
 
         try:
             scheduled_at = datetime.fromisoformat(
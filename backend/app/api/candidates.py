@@ -1,62 +1,202 @@
 """Candidate API endpoints."""
 
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+import asyncio
+import zipfile
+from typing import List, Literal, Optional
+from fastapi import (
+    APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile, File, Form, Query
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from app.core.config import settings
 from app.core.database import get_session
-from app.models.candidate import Candidate, CandidateCreate, CandidateResponse, CandidateMatch
+from app.models.candidate import (
+    Candidate,
+    CandidateCreate,
+    CandidateResponse,
+    CandidateMatch,
+    JobRanking,
+    RankingStats,
+)
 from app.agents.resume_parser import ResumeParserAgent
 from app.agents.job_matcher import JobMatcherAgent
+from app.models.ingestion import IngestionBatchResponse, IngestionFileResponse
+from app.services.ingestion import (
+    candidate_from_parsed,
+    create_batch,
+    load_batch,
+    load_batch_files,
+    resume_email,
+    run_ingestion,
+)
+from app.services.match_store import delete_matches, load_matches, save_matches
+from app.services.parse_cache import (
+    find_duplicates,
+    forget_candidate,
+    load_parsed,
+    save_parsed,
+)
+from app.services.prescoring import get_prescore_pool
+from app.services.ranking import rank_jobs
+from app.services.skill_index import (
+    find_candidates_with_skills,
+    index_candidate_skills,
+    remove_candidate_skills,
+)
+from app.services.uploads import UploadTooLarge, discard, expand_archives, spool_upload
+from app.services.vector_index import index_candidate, remove_candidate, run_index_task
 
 router = APIRouter()
 
 
+def _duplicate_response(candidate: Candidate) -> CandidateResponse:
+    return CandidateResponse.model_validate(candidate).model_copy(update={"duplicate": True})
+
+
+def _batch_response(batch, rows) -> IngestionBatchResponse:
+    return IngestionBatchResponse.model_validate(batch).model_copy(
+        update={"files": [IngestionFileResponse.model_validate(row) for row in rows]}
+    )
+
+
 @router.post("", response_model=CandidateResponse)
 async def create_candidate(
     candidate: CandidateCreate,
+    background_tasks: BackgroundTasks,
     session: AsyncSession = Depends(get_session),
 ):
     """Create a new candidate."""
     db_candidate = Candidate(**candidate.model_dump())
     session.add(db_candidate)
+    await session.flush()
+    await index_candidate_skills(session, db_candidate)
     await session.commit()
     await session.refresh(db_candidate)
+    if settings.semantic_index_enabled:
+        background_tasks.add_task(run_index_task, index_candidate, db_candidate)
     return db_candidate
 
 
 @router.post("/upload", response_model=CandidateResponse)
 async def upload_resume(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     name: Optional[str] = Form(None),
     email: Optional[str] = Form(None),
+    job_id: Optional[int] = Form(None),
+    parse_mode: Optional[Literal["full", "hybrid", "fast"]] = Form(None),
     session: AsyncSession = Depends(get_session),
 ):
-    """Upload and parse a resume."""
-    content = await file.read()
-    parser = ResumeParserAgent()
-    parsed_data = await parser.parse(content, file.filename)
-
-    candidate_data = {
-        "name": name or parsed_data.get("name", "Unknown"),
-        "email": email or parsed_data.get("email", "unknown@example.com"),
-        "phone": parsed_data.get("phone"),
-        "resume_text": parsed_data.get("raw_text", ""),
-        "skills": parsed_data.get("skills", []),
-        "experience_years": parsed_data.get("experience_years", 0),
-        "education": parsed_data.get("education", []),
-        "work_history": parsed_data.get("work_history", []),
-        "parsed_data": parsed_data,
-    }
-
-    db_candidate = Candidate(**candidate_data)
+    """Upload and parse a resume.
+
+    ``parse_mode`` overrides ``settings.resume_parse_mode``: ``hybrid`` and
+    ``fast`` fill what they can with deterministic patterns first.
+
+    Parses are cached by the SHA-256 of the file. Re-uploading a file that
+    already produced a candidate, or a resume whose email is already on
+    file, returns the existing candidate flagged as ``duplicate``. Resumes
+    without an email are never matched this way.
+
+    With pre-scoring enabled, the candidate is then matched in the background
+    against ``job_id`` (the job applied to) or, if not given, every open job.
+
+    The file is copied to a spool and rejected with 413 once it passes
+    ``settings.upload_max_bytes``.
+    """
+    try:
+        resume = await spool_upload(file)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e)) from e
+    digest = resume.digest
+    try:
+        duplicates = await find_duplicates(session, [digest])
+        if digest in duplicates:
+            return _duplicate_response(await session.get_one(Candidate, duplicates[digest]))
+
+        mode = parse_mode or settings.resume_parse_mode
+        cached = await load_parsed(session, [digest], mode)
+        if digest in cached:
+            parsed_data = cached[digest]
+        else:
+            parser = ResumeParserAgent()
+            parsed_data = await parser.parse(resume.source, resume.filename, mode)
+    finally:
+        discard([resume])
+
+    db_candidate = candidate_from_parsed(parsed_data, name=name, email=email)
+    existing = None
+    if resume_email(parsed_data, email):
+        existing = await session.scalar(
+            select(Candidate).where(Candidate.email == db_candidate.email)
+        )
+    if existing:
+        await save_parsed(session, digest, parsed_data, existing.id, mode)
+        await session.commit()
+        return _duplicate_response(existing)
+
     session.add(db_candidate)
+    await session.flush()
+    await index_candidate_skills(session, db_candidate)
+    await save_parsed(session, digest, parsed_data, db_candidate.id, mode)
     await session.commit()
     await session.refresh(db_candidate)
+    if settings.semantic_index_enabled:
+        background_tasks.add_task(run_index_task, index_candidate, db_candidate)
+    if settings.prescore_on_upload:
+        get_prescore_pool().submit(db_candidate.id, job_id)
     return db_candidate
 
 
+@router.post("/bulk", response_model=IngestionBatchResponse, status_code=202)
+async def bulk_upload_resumes(
+    background_tasks: BackgroundTasks,
+    files: List[UploadFile] = File(...),
+    parse_mode: Optional[Literal["full", "hybrid", "fast"]] = Form(None),
+    session: AsyncSession = Depends(get_session),
+):
+    """Upload many resumes, or zip archives of resumes, for background ingestion.
+
+    Returns the batch; poll ``GET /bulk/{batch_id}`` for per-file progress.
+    Files are spooled as for single uploads until ingestion has read them.
+    """
+    uploads = []
+    try:
+        for file in files:
+            uploads.append(await spool_upload(file))
+        uploads = await asyncio.to_thread(expand_archives, uploads)
+    except (UploadTooLarge, ValueError, zipfile.BadZipFile) as e:
+        discard(uploads)
+        raise HTTPException(
+            status_code=413 if isinstance(e, UploadTooLarge) else 400, detail=str(e)
+        ) from e
+    if not uploads:
+        raise HTTPException(status_code=400, detail="No resume files in upload")
+
+    batch = await create_batch(session, [resume.filename for resume in uploads])
+    rows = await load_batch_files(session, batch.id)
+    background_tasks.add_task(
+        run_ingestion,
+        batch.id,
+        [(row.id, resume) for row, resume in zip(rows, uploads)],
+        parse_mode or settings.resume_parse_mode,
+    )
+    return _batch_response(batch, rows)
+
+
+@router.get("/bulk/{batch_id}", response_model=IngestionBatchResponse)
+async def get_bulk_upload_status(
+    batch_id: int,
+    session: AsyncSession = Depends(get_session),
+):
+    """Get the progress of a bulk upload, with the status of each file."""
+    found = await load_batch(session, batch_id)
+    if not found:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    batch, rows = found
+    return _batch_response(batch, rows)
+
+
 @router.get("", response_model=List[CandidateResponse])
 async def list_candidates(
     skip: int = 0,
@@ -73,6 +213,27 @@ async def list_candidates(
     return result.scalars().all()
 
 
+@router.get("/search", response_model=List[CandidateResponse])
+async def search_candidates_by_skills(
+    skills: List[str] = Query(...),
+    match: Literal["all", "any"] = "all",
+    skip: int = 0,
+    limit: int = 100,
+    session: AsyncSession = Depends(get_session),
+):
+    """Find candidates with all (or any) of the given skills via the skill index."""
+    candidate_ids = await find_candidates_with_skills(
+        session, skills, match_all=match == "all"
+    )
+    candidate_ids = candidate_ids[skip:skip + limit]
+    if not candidate_ids:
+        return []
+    result = await session.execute(
+        select(Candidate).where(Candidate.id.in_(candidate_ids)).order_by(Candidate.id)
+    )
+    return result.scalars().all()
+
+
 @router.get("/{candidate_id}", response_model=CandidateResponse)
 async def get_candidate(
     candidate_id: int,
@@ -109,14 +270,60 @@ async def match_candidate_to_job(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
+    stored = await load_matches(session, [(candidate, job)])
+    if stored:
+        return stored[(candidate.id, job.id)]
+
     matcher = JobMatcherAgent()
     match_result = await matcher.match(candidate, job)
+    await save_matches(session, [(candidate, job, match_result)])
     return match_result
 
 
+@router.get("/{candidate_id}/jobs", response_model=JobRanking)
+async def get_matched_jobs(
+    candidate_id: int,
+    min_score: float = 50.0,
+    limit: int = 20,
+    prefilter_top_n: Optional[int] = None,
+    use_llm: bool = True,
+    session: AsyncSession = Depends(get_session),
+):
+    """Get open jobs matched to a candidate, ranked by score.
+
+    Uses the same prefilter, concurrency limits and match store as job-side
+    ranking: only the best ``prefilter_top_n`` jobs reach the LLM matcher.
+    """
+    from app.models.job import Job
+
+    result = await session.execute(
+        select(Candidate).where(Candidate.id == candidate_id)
+    )
+    candidate = result.scalar_one_or_none()
+    if not candidate:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+
+    result = await session.execute(select(Job).where(Job.status == "open"))
+    jobs = result.scalars().all()
+    if not jobs:
+        return JobRanking(candidate_id=candidate.id, stats=RankingStats())
+
+    return await rank_jobs(
+        JobMatcherAgent() if use_llm else None,
+        candidate,
+        jobs,
+        min_score=min_score,
+        limit=limit,
+        prefilter_top_n=prefilter_top_n,
+        session=session,
+        use_llm=use_llm,
+    )
+
+
 @router.delete("/{candidate_id}")
 async def delete_candidate(
     candidate_id: int,
+    background_tasks: BackgroundTasks,
     session: AsyncSession = Depends(get_session),
 ):
     """Delete a candidate."""
@@ -127,6 +334,11 @@ async def delete_candidate(
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
 
+    await delete_matches(session, candidate_id=candidate.id)
+    await forget_candidate(session, candidate.id)
+    await remove_candidate_skills(session, candidate.id)
     await session.delete(candidate)
     await session.commit()
+    if settings.semantic_index_enabled:
+        background_tasks.add_task(run_index_task, remove_candidate, candidate_id)
     return {"message": "Candidate deleted"}
\ No newline at end of file
@@ -1,6 +1,9 @@
 """Health check endpoints."""
 
 from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics import registry
 
 router = APIRouter()
 
@@ -14,4 +17,10 @@ async def health_check():
 @router.get("/ready")
 async def readiness_check():
     """Readiness check endpoint."""
-    return {"status": "ready"}
\ No newline at end of file
+    return {"status": "ready"}
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics endpoint."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -1,21 +1,72 @@
 """Job API endpoints."""
 
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException
+import json
+import logging
+from typing import List, Literal, Optional, Tuple
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, select
 
+from app.core.config import settings
 from app.core.database import get_session
 from app.models.job import Job, JobCreate, JobResponse
-from app.models.candidate import Candidate, CandidateMatch
+from app.models.candidate import Candidate, CandidateRanking, CandidateSimilarity, RankingStats
 from app.agents.job_matcher import JobMatcherAgent
+from app.services.match_store import delete_matches
+from app.services.ranking import iter_ranking_events, rank_candidates
+from app.services.rerank import (
+    classify_job_change,
+    refresh_job_matches,
+    snapshot_job,
+)
+from app.services.vector_index import (
+    index_job,
+    nearest_candidates,
+    remove_job,
+    run_index_task,
+    unindexed_candidate_ids,
+)
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+async def _load_candidates(
+    session: AsyncSession,
+    job: Job,
+    semantic_k: Optional[int],
+) -> Tuple[List[Candidate], int]:
+    """Load the candidates to rank, returning them and how many the semantic stage dropped.
+
+    Candidates missing from the semantic index are always kept, and a
+    failing index falls back to ranking everyone.
+    """
+    k = settings.ranking_semantic_k if semantic_k is None else semantic_k
+    if k <= 0 or not settings.semantic_index_enabled:
+        result = await session.execute(select(Candidate))
+        return list(result.scalars().all()), 0
+
+    try:
+        nearest = await nearest_candidates(job, k)
+        unindexed = await unindexed_candidate_ids(session)
+    except Exception:
+        logger.exception("Semantic candidate search failed; ranking every candidate")
+        result = await session.execute(select(Candidate))
+        return list(result.scalars().all()), 0
+
+    ids = [candidate_id for candidate_id, _ in nearest] + unindexed
+    result = await session.execute(select(Candidate).where(Candidate.id.in_(ids)))
+    candidates = list(result.scalars().all())
+    total = await session.scalar(select(func.count(Candidate.id))) or 0
+    return candidates, total - len(candidates)
+
+
 @router.post("", response_model=JobResponse)
 async def create_job(
     job: JobCreate,
+    background_tasks: BackgroundTasks,
     session: AsyncSession = Depends(get_session),
 ):
     """Create a new job posting."""
@@ -23,6 +74,8 @@ async def create_job(
     session.add(db_job)
     await session.commit()
     await session.refresh(db_job)
+    if settings.semantic_index_enabled:
+        background_tasks.add_task(run_index_task, index_job, db_job)
     return db_job
 
 
@@ -55,37 +108,134 @@ async def get_job(
     return job
 
 
-@router.get("/{job_id}/candidates", response_model=List[CandidateMatch])
+@router.get("/{job_id}/candidates", response_model=CandidateRanking)
 async def get_matched_candidates(
     job_id: int,
     min_score: float = 50.0,
     limit: int = 20,
+    prefilter_top_n: Optional[int] = None,
+    semantic_k: Optional[int] = None,
+    use_llm: bool = True,
     session: AsyncSession = Depends(get_session),
 ):
-    """Get candidates matched to a job, ranked by score."""
+    """Get candidates matched to a job, ranked by score.
+
+    When the semantic index is enabled and ``semantic_k`` is set, only the
+    ``semantic_k`` nearest candidates are considered. Candidates are then
+    scored deterministically and only the best ``prefilter_top_n`` are sent
+    to the LLM matcher, concurrently. With ``use_llm=false`` the
+    deterministic scores are returned directly.
+    """
     result = await session.execute(select(Job).where(Job.id == job_id))
     job = result.scalar_one_or_none()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    result = await session.execute(select(Candidate))
-    candidates = result.scalars().all()
+    candidates, semantic_dropped = await _load_candidates(session, job, semantic_k)
+    stats = RankingStats(semantic_dropped=semantic_dropped)
+
+    if not candidates:
+        stats.total = semantic_dropped
+        return CandidateRanking(job_id=job.id, stats=stats)
+
+    return await rank_candidates(
+        JobMatcherAgent() if use_llm else None,
+        job,
+        candidates,
+        min_score=min_score,
+        limit=limit,
+        prefilter_top_n=prefilter_top_n,
+        session=session,
+        use_llm=use_llm,
+        stats=stats,
+    )
 
-    matcher = JobMatcherAgent()
-    matches = []
-    for candidate in candidates:
-        match = await matcher.match(candidate, job)
-        if match.overall_score >= min_score:
-            matches.append(match)
 
-    matches.sort(key=lambda x: x.overall_score, reverse=True)
-    return matches[:limit]
+@router.get("/{job_id}/candidates/stream")
+async def stream_matched_candidates(
+    job_id: int,
+    min_score: float = 50.0,
+    limit: int = 20,
+    prefilter_top_n: Optional[int] = None,
+    snapshot_every: int = 10,
+    format: Literal["ndjson", "sse"] = "ndjson",
+    semantic_k: Optional[int] = None,
+    use_llm: bool = True,
+    session: AsyncSession = Depends(get_session),
+):
+    """Stream candidate matches for a job as they are scored.
+
+    Emits a ``match`` event per scored candidate, a ``snapshot`` of the current
+    top ``limit`` every ``snapshot_every`` matches, and a final ``done`` event
+    with the full ranking and stage statistics.
+    """
+    result = await session.execute(select(Job).where(Job.id == job_id))
+    job = result.scalar_one_or_none()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    candidates, semantic_dropped = await _load_candidates(session, job, semantic_k)
+
+    events = iter_ranking_events(
+        JobMatcherAgent() if candidates and use_llm else None,
+        job,
+        candidates,
+        min_score=min_score,
+        limit=limit,
+        prefilter_top_n=prefilter_top_n,
+        session=session,
+        snapshot_every=snapshot_every,
+        use_llm=use_llm,
+        stats=RankingStats(semantic_dropped=semantic_dropped),
+    )
+
+    async def body():
+        async for event in events:
+            if format == "sse":
+                yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+            else:
+                yield json.dumps(event) + "\n"
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(body(), media_type=media_type)
+
+
+@router.get("/{job_id}/similar-candidates", response_model=List[CandidateSimilarity])
+async def get_similar_candidates(
+    job_id: int,
+    k: int = 20,
+    status: Optional[str] = None,
+    min_experience: Optional[int] = None,
+    max_experience: Optional[int] = None,
+    session: AsyncSession = Depends(get_session),
+):
+    """Get the candidates semantically nearest to a job description."""
+    if not settings.semantic_index_enabled:
+        raise HTTPException(status_code=503, detail="Semantic index is disabled")
+
+    result = await session.execute(select(Job).where(Job.id == job_id))
+    job = result.scalar_one_or_none()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    nearest = await nearest_candidates(
+        job,
+        k,
+        status=status,
+        min_experience=min_experience,
+        max_experience=max_experience,
+    )
+    return [
+        CandidateSimilarity(candidate_id=candidate_id, distance=distance)
+        for candidate_id, distance in nearest
+    ]
 
 
 @router.put("/{job_id}", response_model=JobResponse)
 async def update_job(
     job_id: int,
     job_update: JobCreate,
+    background_tasks: BackgroundTasks,
     session: AsyncSession = Depends(get_session),
 ):
     """Update a job posting."""
@@ -94,17 +244,24 @@ async def update_job(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
+    before = snapshot_job(job)
     for key, value in job_update.model_dump().items():
         setattr(job, key, value)
 
+    change = classify_job_change(before, job)
     await session.commit()
     await session.refresh(job)
+    if settings.semantic_index_enabled:
+        background_tasks.add_task(run_index_task, index_job, job)
+    if change.fields and settings.rescore_on_job_update:
+        background_tasks.add_task(refresh_job_matches, job.id, before, change)
     return job
 
 
 @router.delete("/{job_id}")
 async def delete_job(
     job_id: int,
+    background_tasks: BackgroundTasks,
     session: AsyncSession = Depends(get_session),
 ):
     """Delete a job posting."""
@@ -113,6 +270,9 @@ async def delete_job(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
+    await delete_matches(session, job_id=job.id)
     await session.delete(job)
     await session.commit()
+    if settings.semantic_index_enabled:
+        background_tasks.add_task(run_index_task, remove_job, job_id)
     return {"message": "Job deleted"}
\ No newline at end of file
@@ -1,6 +1,6 @@
 """Application configuration."""
 
-from typing import List, Literal
+from typing import Dict, List, Literal, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -35,8 +35,82 @@ class Settings(BaseSettings):
     llamacpp_model_path: str = ""
     llamacpp_n_ctx: int = 4096
 
+    llm_temperature: float = 0.7
+    llm_fallbacks: List[str] = []
+    llm_fallback_timeout_seconds: float = 0.0
+
+    parser_llm_provider: str = ""
+    parser_llm_model: str = ""
+    parser_llm_temperature: Optional[float] = None
+    parser_llm_fallbacks: List[str] = []
+    matcher_llm_provider: str = ""
+    matcher_llm_model: str = ""
+    matcher_llm_temperature: Optional[float] = None
+    matcher_llm_fallbacks: List[str] = []
+    scheduler_llm_provider: str = ""
+    scheduler_llm_model: str = ""
+    scheduler_llm_temperature: Optional[float] = None
+    scheduler_llm_fallbacks: List[str] = []
+
     database_url: str = "sqlite+aiosqlite:///./data/recruiter.db"
     chroma_persist_dir: str = "./data/chroma"
+    semantic_index_enabled: bool = False
+
+    embedding_cache_enabled: bool = True
+    embedding_cache_path: str = "./data/embeddings.db"
+    embedding_cache_max_entries: int = 100_000
+
+    llm_cache_enabled: bool = False
+    llm_cache_path: str = "./data/llm_cache.db"
+    llm_cache_ttl_seconds: float = 7 * 24 * 3600
+    llm_cache_max_entries: int = 50_000
+    llm_cache_force: bool = False
+
+    skill_taxonomy_path: str = ""
+
+    ranking_semantic_k: int = 0
+    ranking_prefilter_top_n: int = 50
+    match_timeout_seconds: float = 60.0
+    match_batch_size: int = 1
+    ranking_deterministic_fallback: bool = True
+    rescore_on_job_update: bool = False
+    rescore_patched_matches: bool = False
+
+    prescore_on_upload: bool = False
+    prescore_workers: int = 2
+    prescore_queue_size: int = 1000
+
+    resume_parse_mode: str = "full"
+    resume_max_tokens: int = 6000
+    resume_output_tokens: int = 1024
+
+    upload_max_bytes: int = 10 * 1024 * 1024
+    upload_max_request_bytes: int = 200 * 1024 * 1024
+    upload_spool_bytes: int = 1024 * 1024
+
+    extraction_workers: int = 2
+    extraction_max_pages: int = 50
+    extraction_max_chars: int = 100_000
+    extraction_chunk_pages: int = 25
+    extraction_cpu_seconds: float = 10.0
+    extraction_timeout_seconds: float = 30.0
+
+    ingestion_max_files: int = 500
+    ingestion_queue_size: int = 16
+    ingestion_parse_workers: int = 4
+    ingestion_commit_batch_size: int = 25
+
+    openai_max_concurrency: int = 8
+    anthropic_max_concurrency: int = 8
+    ollama_max_concurrency: int = 2
+    llamacpp_max_concurrency: int = 1
+    openai_requests_per_minute: int = 0
+    openai_tokens_per_minute: int = 0
+    anthropic_requests_per_minute: int = 0
+    anthropic_tokens_per_minute: int = 0
+    llm_max_retries: int = 4
+    llm_retry_max_wait_seconds: float = 60.0
+    llm_prices: Dict[str, List[float]] = {}
 
 
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,148 @@
+"""Content-addressed on-disk cache for embedding vectors."""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Mapping, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from app.core.hashing import content_hash
+
+
+def _as_float32(vector: Sequence[float]) -> List[float]:
+    return np.asarray(vector, dtype=np.float32).tolist()
+
+
+class EmbeddingStore:
+    """SQLite table of float32 vectors with least-recently-used eviction."""
+
+    def __init__(self, path: str, max_entries: int):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_embeddings_last_used ON embeddings (last_used)"
+        )
+        self._conn.commit()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        """Return cached vectors for the given keys and mark them as used."""
+        found: Dict[str, List[float]] = {}
+        unique = list(dict.fromkeys(keys))
+        with self._lock:
+            for i in range(0, len(unique), 500):
+                chunk = unique[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                self._conn.commit()
+        return found
+
+    def put_many(self, vectors: Mapping[str, Sequence[float]]) -> None:
+        """Store vectors, evicting the least recently used beyond max_entries."""
+        if not vectors:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                [
+                    (key, np.asarray(vector, dtype=np.float32).tobytes(), now)
+                    for key, vector in vectors.items()
+                ],
+            )
+            [count] = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN ("
+                    "SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that only sends uncached texts to the provider.
+
+    Vectors are keyed on a hash of the model name and the exact text, and all
+    cache misses in a call are embedded with a single ``embed_documents``.
+    """
+
+    def __init__(self, inner: Embeddings, model_name: str, store: EmbeddingStore):
+        self.inner = inner
+        self.model_name = model_name
+        self.store = store
+
+    def _key(self, kind: str, text: str) -> str:
+        return content_hash(self.model_name, kind, text)
+
+    def _split(self, texts: List[str], cached: Dict[str, List[float]]) -> List[str]:
+        keys = [self._key("document", text) for text in texts]
+        return list(dict.fromkeys(t for t, k in zip(texts, keys) if k not in cached))
+
+    def _assemble(self, texts: List[str], cached: Dict[str, List[float]]) -> List[List[float]]:
+        return [cached[self._key("document", text)] for text in texts]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        cached = self.store.get_many([self._key("document", t) for t in texts])
+        misses = self._split(texts, cached)
+        if misses:
+            fresh = {
+                self._key("document", text): _as_float32(vector)
+                for text, vector in zip(misses, self.inner.embed_documents(misses))
+            }
+            self.store.put_many(fresh)
+            cached.update(fresh)
+        return self._assemble(texts, cached)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self._key("document", t) for t in texts]
+        cached = await asyncio.to_thread(self.store.get_many, keys)
+        misses = self._split(texts, cached)
+        if misses:
+            vectors = await self.inner.aembed_documents(misses)
+            fresh = {self._key("document", t): _as_float32(v) for t, v in zip(misses, vectors)}
+            await asyncio.to_thread(self.store.put_many, fresh)
+            cached.update(fresh)
+        return self._assemble(texts, cached)
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self._key("query", text)
+        cached = self.store.get_many([key])
+        if key not in cached:
+            cached[key] = _as_float32(self.inner.embed_query(text))
+            self.store.put_many({key: cached[key]})
+        return cached[key]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        key = self._key("query", text)
+        cached = await asyncio.to_thread(self.store.get_many, [key])
+        if key not in cached:
+            cached[key] = _as_float32(await self.inner.aembed_query(text))
+            await asyncio.to_thread(self.store.put_many, {key: cached[key]})
+        return cached[key]
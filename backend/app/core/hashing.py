@@ -0,0 +1,11 @@
+"""Stable content hashing for cache keys."""
+
+import hashlib
+import json
+from typing import Any
+
+
+def content_hash(*parts: Any) -> str:
+    """Return a SHA-256 hex digest of JSON-serializable parts."""
+    payload = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -1,59 +1,197 @@
 """LLM provider configuration and factory."""
 
+import os
 from functools import lru_cache
+from typing import Any, List, NamedTuple, Optional
 from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable
 from app.core.config import settings
 
 
+AGENT_ROLES = ("parser", "matcher", "scheduler")
+
+
+class LLMSpec(NamedTuple):
+    """A chat model to build: provider, model name (a file path for llama.cpp) and temperature."""
+    provider: str
+    model: str
+    temperature: float
+
+
+def _default_model(provider: str) -> str:
+    return {
+        "openai": settings.openai_model,
+        "anthropic": settings.anthropic_model,
+        "ollama": settings.ollama_model,
+        "llamacpp": settings.llamacpp_model_path,
+    }.get(provider, "")
+
+
+def _role_setting(role: Optional[str], name: str):
+    if role is None:
+        return None
+    if role not in AGENT_ROLES:
+        raise ValueError(f"Unknown agent role: {role}")
+    return getattr(settings, f"{role}_{name}")
+
+
+def llm_spec(role: Optional[str] = None) -> LLMSpec:
+    """Resolve the primary model for an agent role.
+
+    Role overrides (``parser_llm_provider``, ``matcher_llm_model``, ...) that
+    are unset fall back to the global provider, that provider's configured
+    model and ``llm_temperature``.
+    """
+    provider = (_role_setting(role, "llm_provider") or settings.llm_provider).lower()
+    model = _role_setting(role, "llm_model") or _default_model(provider)
+    temperature = _role_setting(role, "llm_temperature")
+    if temperature is None:
+        temperature = settings.llm_temperature
+    return LLMSpec(provider, model, temperature)
+
+
+def fallback_specs(role: Optional[str] = None) -> List[LLMSpec]:
+    """Models to try, in order, when the role's primary model fails.
+
+    Entries are ``provider`` or ``provider:model`` strings.
+    """
+    temperature = llm_spec(role).temperature
+    specs = []
+    for entry in _role_setting(role, "llm_fallbacks") or settings.llm_fallbacks:
+        provider, _, model = entry.partition(":")
+        provider = provider.strip().lower()
+        specs.append(LLMSpec(provider, model.strip() or _default_model(provider), temperature))
+    return specs
+
+
 @lru_cache()
-def get_llm() -> BaseChatModel:
-    """Get configured LLM instance.
+def get_llm(role: Optional[str] = None) -> Runnable:
+    """Get the chat model for an agent role (``parser``, ``matcher`` or ``scheduler``).
 
     Supports:
     - OpenAI (GPT-4, GPT-3.5)
     - Anthropic (Claude)
     - Ollama (Local models)
     - LlamaCpp (Local GGUF models)
+
+    Calls go through the provider's process-wide rate limiter. With
+    ``llm_cache_enabled``, responses are cached on disk. Sampled output
+    (temperature > 0) is not cached unless ``llm_cache_force`` is set.
+
+    With a fallback chain configured, a model that fails, or takes longer
+    than ``llm_fallback_timeout_seconds``, hands the call to the next one.
     """
-    provider = settings.llm_provider.lower()
+    specs = [llm_spec(role), *fallback_specs(role)]
+    timeout = settings.llm_fallback_timeout_seconds or None
+    models = [
+        _limited_model(spec, timeout if i < len(specs) - 1 else None)
+        for i, spec in enumerate(specs)
+    ]
+    if len(models) == 1:
+        return models[0]
+    return models[0].with_fallbacks(models[1:])
+
+
+def _limited_model(spec: LLMSpec, timeout: Optional[float] = None) -> BaseChatModel:
+    from app.core.rate_limit import RateLimitedChatModel
+    inner = _build_chat_model(spec)
+    llm = RateLimitedChatModel(inner=inner, provider=spec.provider, timeout=timeout)
+    if settings.llm_cache_enabled and (settings.llm_cache_force or not llm_is_sampled(inner)):
+        llm.cache = get_llm_cache()
+    return llm
 
-    if provider == "openai":
+
+def primary_chat_model(llm: Runnable) -> BaseChatModel:
+    """The provider model behind ``get_llm()``'s fallbacks and rate limiting."""
+    model: Any = getattr(llm, "runnable", llm)
+    return getattr(model, "inner", model)
+
+
+def llm_is_sampled(llm: BaseChatModel) -> bool:
+    """Whether the model samples, so identical prompts may get different answers."""
+    return (getattr(llm, "temperature", None) or 0) > 0
+
+
+@lru_cache()
+def get_llm_cache():
+    """Get the shared on-disk LLM response cache."""
+    from app.core.llm_cache import LLMCache
+    return LLMCache(
+        settings.llm_cache_path,
+        ttl_seconds=settings.llm_cache_ttl_seconds,
+        max_entries=settings.llm_cache_max_entries,
+    )
+
+
+def _build_chat_model(spec: LLMSpec) -> BaseChatModel:
+    if spec.provider == "openai":
         from langchain_openai import ChatOpenAI
         return ChatOpenAI(
             api_key=settings.openai_api_key,
-            model=settings.openai_model,
-            temperature=0.7,
+            model=spec.model,
+            temperature=spec.temperature,
         )
 
-    elif provider == "anthropic":
+    elif spec.provider == "anthropic":
         from langchain_anthropic import ChatAnthropic
         return ChatAnthropic(
             api_key=settings.anthropic_api_key,
-            model=settings.anthropic_model,
-            temperature=0.7,
+            model=spec.model,
+            temperature=spec.temperature,
         )
 
-    elif provider == "ollama":
+    elif spec.provider == "ollama":
         from langchain_community.chat_models import ChatOllama
         return ChatOllama(
             base_url=settings.ollama_base_url,
-            model=settings.ollama_model,
-            temperature=0.7,
+            model=spec.model,
+            temperature=spec.temperature,
         )
 
-    elif provider == "llamacpp":
+    elif spec.provider == "llamacpp":
         from langchain_community.chat_models import ChatLlamaCpp
         return ChatLlamaCpp(
-            model_path=settings.llamacpp_model_path,
+            model_path=spec.model,
             n_ctx=settings.llamacpp_n_ctx,
-            temperature=0.7,
+            temperature=spec.temperature,
         )
 
-    raise ValueError(f"Unknown LLM provider: {provider}")
+    raise ValueError(f"Unknown LLM provider: {spec.provider}")
+
+
+def get_model_name(role: Optional[str] = None) -> str:
+    """Get a provider-qualified name for an agent role's primary chat model."""
+    spec = llm_spec(role)
+    model = os.path.basename(spec.model) if spec.provider == "llamacpp" else spec.model
+    return f"{spec.provider}:{model}"
+
+
+@lru_cache()
+def get_embedding_store():
+    """Get the shared on-disk embedding cache."""
+    from app.core.embedding_cache import EmbeddingStore
+    return EmbeddingStore(
+        settings.embedding_cache_path,
+        max_entries=settings.embedding_cache_max_entries,
+    )
 
 
 def get_embedding_model():
-    """Get embedding model for vector operations."""
+    """Get embedding model for vector operations.
+
+    Wrapped in an on-disk, content-addressed cache unless
+    ``embedding_cache_enabled`` is turned off.
+    """
+    embeddings = _build_embedding_model()
+    if not settings.embedding_cache_enabled:
+        return embeddings
+
+    from app.core.embedding_cache import CachedEmbeddings
+    model_name = f"{type(embeddings).__name__}:{getattr(embeddings, 'model', '')}"
+    return CachedEmbeddings(embeddings, model_name, get_embedding_store())
+
+
+def _build_embedding_model():
     provider = settings.llm_provider.lower()
 
     if provider in ["openai", "llamacpp"]:
@@ -68,4 +206,4 @@ def get_embedding_model():
         )
 
     from langchain_openai import OpenAIEmbeddings
-    return OpenAIEmbeddings(api_key=settings.openai_api_key)
\ No newline at end of file
+    return OpenAIEmbeddings(api_key=settings.openai_api_key)
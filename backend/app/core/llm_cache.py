@@ -0,0 +1,119 @@
+"""On-disk cache of chat model responses."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional, Sequence
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+from app.core.hashing import content_hash
+from app.core.metrics import registry
+
+cache_hits = registry.counter(
+    "llm_cache_hits_total", "Chat model calls answered from the LLM cache"
+)
+cache_misses = registry.counter(
+    "llm_cache_misses_total", "Chat model calls not found in the LLM cache"
+)
+
+
+def _dump(generations: Sequence[Generation]) -> str:
+    return json.dumps([
+        {"message": message_to_dict(g.message), "info": g.generation_info}
+        if isinstance(g, ChatGeneration) else {"text": g.text, "info": g.generation_info}
+        for g in generations
+    ])
+
+
+def _load(value: str) -> RETURN_VAL_TYPE:
+    return [
+        ChatGeneration(message=messages_from_dict([g["message"]])[0], generation_info=g["info"])
+        if "message" in g else Generation(text=g["text"], generation_info=g["info"])
+        for g in json.loads(value)
+    ]
+
+
+class LLMCache(BaseCache):
+    """SQLite-backed LangChain cache with a TTL and least-recently-used eviction.
+
+    Entries are keyed on a hash of LangChain's ``llm_string`` (model class,
+    model name, temperature and the other call parameters) and the rendered
+    messages. The database runs in WAL mode, so several worker processes can
+    share one file.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float, max_entries: int):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_llm_responses_last_used ON llm_responses (last_used)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return content_hash(llm_string, prompt)
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row and self.ttl_seconds > 0 and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+            if row:
+                self._conn.execute(
+                    "UPDATE llm_responses SET last_used = ? WHERE key = ?", (now, key)
+                )
+                self._conn.commit()
+        if row is None:
+            cache_misses.inc()
+            return None
+        cache_hits.inc()
+        return _load(row[0])
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, value, created, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (self._key(prompt, llm_string), _dump(return_val), now, now),
+            )
+            [count] = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM llm_responses WHERE key IN ("
+                    "SELECT key FROM llm_responses ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+            self._conn.commit()
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
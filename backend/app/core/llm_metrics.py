@@ -0,0 +1,195 @@
+"""Latency, token, cost and parse-failure metrics for the agents' LLM chains."""
+
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from fastapi import Request
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.exceptions import OutputParserException
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import LLMResult
+from langchain_core.runnables import RunnableConfig
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.tokens import approximate_tokens
+
+chain_seconds = registry.summary(
+    "agent_chain_seconds", "Time spent in an agent's prompt | llm | parser chain"
+)
+call_seconds = registry.summary("llm_call_seconds", "Time spent in one chat model call")
+first_token_seconds = registry.summary(
+    "llm_time_to_first_token_seconds", "Time until a chat model call produced its first token"
+)
+prompt_tokens = registry.counter("llm_prompt_tokens_total", "Prompt tokens sent to chat models")
+completion_tokens = registry.counter(
+    "llm_completion_tokens_total", "Completion tokens received from chat models"
+)
+estimated_cost = registry.counter("llm_cost_usd_total", "Estimated chat model spend in US dollars")
+parse_failures = registry.counter(
+    "llm_parse_failures_total", "Chain calls whose model output could not be parsed"
+)
+
+# USD per million (prompt, completion) tokens, matched on the longest model name prefix.
+DEFAULT_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4o-mini": (0.15, 0.6),
+    "gpt-4o": (2.5, 10.0),
+    "gpt-4-turbo": (10.0, 30.0),
+    "gpt-4": (30.0, 60.0),
+    "gpt-3.5-turbo": (0.5, 1.5),
+    "claude-3-5-haiku": (0.8, 4.0),
+    "claude-3-5-sonnet": (3.0, 15.0),
+    "claude-3-haiku": (0.25, 1.25),
+    "claude-3-sonnet": (3.0, 15.0),
+    "claude-3-opus": (15.0, 75.0),
+}
+_LOCAL_PROVIDERS = ("ollama", "llamacpp")
+
+current_endpoint: ContextVar[str] = ContextVar("llm_endpoint", default="background")
+
+
+async def track_endpoint(request: Request) -> None:
+    """Tag LLM calls made while handling a request with its route template.
+
+    The template is ``scope["route"].path``. FastAPI releases that copy
+    included routes onto the app give the full template, prefix included;
+    releases that mount the included router leave its prefix out. Either
+    way the segments of the request path in front of those the template
+    covers make up the prefix, and there are none when it is already there.
+    """
+    path = request.url.path
+    route = request.scope.get("route")
+    if route is not None:
+        segments, template = path.split("/"), route.path.split("/")
+        path = "/".join(segments[:len(segments) - len(template) + 1] + template[1:])
+    current_endpoint.set(f"{request.method} {path}")
+
+
+def model_price(model: str) -> Optional[Tuple[float, float]]:
+    """Price per million prompt and completion tokens for a ``provider:model`` name, if known."""
+    provider, _, name = model.partition(":")
+    if provider in _LOCAL_PROVIDERS:
+        return (0.0, 0.0)
+    prices = {**DEFAULT_PRICES, **{k: (v[0], v[1]) for k, v in settings.llm_prices.items()}}
+    matches = [prefix for prefix in prices if name.startswith(prefix)]
+    return prices[max(matches, key=len)] if matches else None
+
+
+def _usage(response: LLMResult) -> Optional[Dict[str, Any]]:
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                return usage
+    return None
+
+
+class LLMMetricsHandler(BaseCallbackHandler):
+    """Records metrics for one agent chain call, tagged by agent, endpoint and model.
+
+    Token counts come from the provider's usage metadata, or are estimated
+    when a model reports none. Answers served from the LLM cache cost
+    nothing and are not counted as tokens. Unless the model streams, the
+    first token arrives with the whole answer.
+    """
+
+    run_inline = True
+
+    def __init__(self, agent: str, model: str, endpoint: str):
+        self.agent = agent
+        self.model = model
+        self.endpoint = endpoint
+        self._chain: Optional[Tuple[UUID, float]] = None
+        self._calls: Dict[UUID, Dict[str, Any]] = {}
+        self._parse_failed = False
+
+    def _labels(self, model: Optional[str] = None) -> Dict[str, str]:
+        return {"agent": self.agent, "endpoint": self.endpoint, "model": model or self.model}
+
+    def on_chain_start(self, serialized: Any, inputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        if self._chain is None:
+            self._chain = (run_id, time.perf_counter())
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_chain(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        if isinstance(error, OutputParserException) and not self._parse_failed:
+            self._parse_failed = True
+            parse_failures.inc(1, **self._labels())
+        self._end_chain(run_id)
+
+    def _end_chain(self, run_id: UUID) -> None:
+        if self._chain and self._chain[0] == run_id:
+            chain_seconds.observe(time.perf_counter() - self._chain[1], **self._labels())
+
+    def on_chat_model_start(
+        self,
+        serialized: Any,
+        messages: List[List[BaseMessage]],
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        metadata = metadata or {}
+        model = self.model
+        if metadata.get("ls_model_name"):
+            model = f"{metadata.get('ls_provider')}:{metadata['ls_model_name']}"
+        self.model = model
+        self._calls[run_id] = {
+            "model": model,
+            "started": time.perf_counter(),
+            "first_token": None,
+            "prompt_tokens": sum(
+                approximate_tokens(str(m.content)) for batch in messages for m in batch
+            ),
+        }
+
+    def on_llm_new_token(self, token: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        call = self._calls.get(run_id)
+        if call and call["first_token"] is None:
+            call["first_token"] = time.perf_counter()
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        call = self._calls.pop(run_id, None)
+        if call is None:
+            return
+        labels = self._labels(call["model"])
+        ended = time.perf_counter()
+        call_seconds.observe(ended - call["started"], status="ok", **labels)
+        first_token_seconds.observe((call["first_token"] or ended) - call["started"], **labels)
+
+        usage = _usage(response)
+        if usage and usage.get("total_cost") == 0:
+            return  # LangChain marks cache hits with a zero cost
+        if usage:
+            used_prompt = usage.get("input_tokens", 0)
+            used_completion = usage.get("output_tokens", 0)
+        else:
+            used_prompt = call["prompt_tokens"]
+            used_completion = sum(
+                approximate_tokens(g.text) for gs in response.generations for g in gs
+            )
+        prompt_tokens.inc(used_prompt, **labels)
+        completion_tokens.inc(used_completion, **labels)
+        price = model_price(call["model"])
+        if price is not None:
+            cost = (used_prompt * price[0] + used_completion * price[1]) / 1e6
+            estimated_cost.inc(cost, **labels)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        call = self._calls.pop(run_id, None)
+        if call is not None:
+            call_seconds.observe(
+                time.perf_counter() - call["started"], status="error", **self._labels(call["model"])
+            )
+
+
+def chain_config(agent: str) -> RunnableConfig:
+    """Run config that instruments one call of an agent's chain."""
+    from app.core.llm import get_model_name
+    handler = LLMMetricsHandler(agent, get_model_name(agent), current_endpoint.get())
+    return {"callbacks": [handler], "tags": [agent]}
@@ -0,0 +1,106 @@
+"""In-process metrics rendered in the Prometheus text format."""
+
+import threading
+from typing import Dict, List, Tuple, Type, TypeVar, Union
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in key) + "}"
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = _labels(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(_labels(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+
+class Summary:
+    """Count and sum of observations (e.g. durations) with optional labels."""
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._values: Dict[LabelKey, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _labels(labels)
+        with self._lock:
+            count, total = self._values.get(key, (0, 0.0))
+            self._values[key] = (count + 1, total + value)
+
+    def count(self, **labels: str) -> int:
+        return self._values.get(_labels(labels), (0, 0.0))[0]
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} summary"]
+        with self._lock:
+            for key, (count, total) in sorted(self._values.items()):
+                lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {total}")
+        return lines
+
+
+Metric = TypeVar("Metric", Counter, Summary)
+
+
+class Registry:
+    """Named collection of metrics."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Union[Counter, Summary]] = {}
+
+    def _get(self, kind: Type[Metric], name: str, help: str) -> Metric:
+        metric = self._metrics.setdefault(name, kind(name, help))
+        if not isinstance(metric, kind):
+            raise TypeError(f"Metric {name} is already registered as a {type(metric).__name__}")
+        return metric
+
+    def counter(self, name: str, help: str) -> Counter:
+        """Get or create a counter."""
+        return self._get(Counter, name, help)
+
+    def summary(self, name: str, help: str) -> Summary:
+        """Get or create a summary."""
+        return self._get(Summary, name, help)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
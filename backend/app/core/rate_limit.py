@@ -0,0 +1,284 @@
+"""Per-provider rate limiting and adaptive concurrency for chat model calls."""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel, LangSmithParams
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatResult
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_random_exponential
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.tokens import approximate_tokens
+
+throttled_calls = registry.counter(
+    "llm_throttled_total", "Chat model calls rejected as rate limited or overloaded, by provider"
+)
+
+_OVERLOAD_STATUS = {429, 500, 502, 503, 504, 529}
+
+# Providers whose in-flight slot the current task already holds.
+_reserved: ContextVar[Tuple[str, ...]] = ContextVar("llm_reserved_slots", default=())
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    for obj in (exc, getattr(exc, "response", None)):
+        code = getattr(obj, "status_code", None)
+        if isinstance(code, int):
+            return code
+    return None
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """Whether the provider rejected a call for exceeding its rate limits."""
+    return _status_code(exc) == 429 or "ratelimit" in type(exc).__name__.lower()
+
+
+def is_overload_error(exc: BaseException) -> bool:
+    """Rate limits, overloaded or unavailable servers and timeouts.
+
+    All are worth a retry, with less load.
+    """
+    if is_rate_limit_error(exc) or _status_code(exc) in _OVERLOAD_STATUS:
+        return True
+    name = type(exc).__name__.lower()
+    if isinstance(exc, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    return "timeout" in name or "connect" in name
+
+
+class TokenBucket:
+    """Allows ``per_minute`` units a minute, with bursts of up to a minute's worth."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float) -> None:
+        """Wait until ``amount`` units are available and take them."""
+        amount = min(amount, self.capacity)
+        while True:
+            self._refill()
+            if self.level >= amount:
+                self.level -= amount
+                return
+            await asyncio.sleep((amount - self.level) / self.rate)
+
+    def charge(self, amount: float) -> None:
+        """Take units after the fact; the level may go negative, delaying later calls."""
+        self._refill()
+        self.level -= amount
+
+
+class AdaptiveConcurrency:
+    """In-flight cap that halves on overload and grows by one per window of successes (AIMD)."""
+
+    def __init__(self, max_limit: int):
+        self.max_limit = max(max_limit, 1)
+        self.limit = self.max_limit
+        self.in_flight = 0
+        self._successes = 0
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+
+    async def acquire(self) -> None:
+        while self.in_flight >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self._wake()  # pass the wake-up on
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.in_flight += 1
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def on_success(self) -> None:
+        self._successes += 1
+        if self._successes >= self.limit and self.limit < self.max_limit:
+            self.limit += 1
+            self._successes = 0
+            self._wake()
+
+    def on_overload(self) -> None:
+        self.limit = max(1, self.limit // 2)
+        self._successes = 0
+
+    def _wake(self) -> None:
+        free = self.limit - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+
+class ProviderLimiter:
+    """Request and token buckets plus an adaptive in-flight cap for one provider.
+
+    The in-flight cap is the only concurrency limit on a provider: pipelines
+    that queue work for it ``reserve`` a slot, and the calls they make use it.
+    """
+
+    def __init__(self, provider: str):
+        self.provider = provider
+        rpm = getattr(settings, f"{provider}_requests_per_minute", 0)
+        tpm = getattr(settings, f"{provider}_tokens_per_minute", 0)
+        self.requests = TokenBucket(rpm) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm) if tpm > 0 else None
+        self.concurrency = AdaptiveConcurrency(getattr(settings, f"{provider}_max_concurrency", 1))
+
+    @asynccontextmanager
+    async def reserve(self) -> AsyncIterator[None]:
+        """Hold an in-flight slot for a unit of work that calls the provider.
+
+        Calls made within it take their slot from the reservation, so the
+        work waits for the cap before it starts instead of inside a timeout.
+        """
+        if self.provider in _reserved.get():
+            yield
+            return
+        await self.concurrency.acquire()
+        token = _reserved.set(_reserved.get() + (self.provider,))
+        try:
+            yield
+        finally:
+            _reserved.reset(token)
+            self.concurrency.release()
+
+    @asynccontextmanager
+    async def slot(self, tokens: int) -> AsyncIterator[None]:
+        """Hold one in-flight call, after taking a request and ``tokens`` from the buckets."""
+        if self.requests:
+            await self.requests.acquire(1)
+        if self.tokens:
+            await self.tokens.acquire(tokens)
+        reserved = self.provider in _reserved.get()
+        if not reserved:
+            await self.concurrency.acquire()
+        try:
+            yield
+        except Exception as e:
+            if is_overload_error(e):
+                throttled_calls.inc(provider=self.provider)
+                self.concurrency.on_overload()
+            raise
+        else:
+            self.concurrency.on_success()
+        finally:
+            if not reserved:
+                self.concurrency.release()
+
+    def charge_tokens(self, tokens: int) -> None:
+        if self.tokens and tokens > 0:
+            self.tokens.charge(tokens)
+
+
+_limiters: Dict[str, ProviderLimiter] = {}
+
+
+def get_rate_limiter(provider: Optional[str] = None) -> ProviderLimiter:
+    """Get the process-wide limiter for an LLM provider."""
+    provider = (provider or settings.llm_provider).lower()
+    if provider not in _limiters:
+        _limiters[provider] = ProviderLimiter(provider)
+    return _limiters[provider]
+
+
+def _estimate_tokens(messages: List[BaseMessage]) -> int:
+    return sum(approximate_tokens(str(m.content)) for m in messages)
+
+
+def _used_tokens(result: ChatResult) -> Optional[int]:
+    for generation in result.generations:
+        usage = getattr(generation.message, "usage_metadata", None)
+        if usage:
+            return usage.get("total_tokens")
+    return None
+
+
+class RateLimitedChatModel(BaseChatModel):
+    """Chat model wrapper that routes every call through the provider's limiter.
+
+    Calls that fail with a rate limit or overload are retried with jittered
+    exponential backoff, all within ``timeout`` if one is set. Caching is
+    keyed on the wrapped model's parameters, so a cache hit uses no
+    rate-limit capacity.
+    """
+
+    inner: BaseChatModel
+    provider: str
+    timeout: Optional[float] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return self.inner._llm_type
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return dict(self.inner._identifying_params)
+
+    def _get_llm_string(self, stop: Optional[List[str]] = None, **kwargs: Any) -> str:
+        return self.inner._get_llm_string(stop=stop, **kwargs)
+
+    def _get_ls_params(self, stop: Optional[List[str]] = None, **kwargs: Any) -> LangSmithParams:
+        return self.inner._get_ls_params(stop=stop, **kwargs)
+
+    def _retrying(self) -> AsyncRetrying:
+        return AsyncRetrying(
+            retry=retry_if_exception(is_overload_error),
+            wait=wait_random_exponential(multiplier=1, max=settings.llm_retry_max_wait_seconds),
+            stop=stop_after_attempt(settings.llm_max_retries + 1),
+            reraise=True,
+        )
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        limiter = get_rate_limiter(self.provider)
+        estimate = _estimate_tokens(messages)
+
+        async def attempt() -> ChatResult:
+            async with limiter.slot(estimate):
+                return await self.inner._agenerate(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                )
+
+        result: ChatResult = await asyncio.wait_for(self._retrying()(attempt), self.timeout)
+        used = _used_tokens(result)
+        if used is not None:
+            limiter.charge_tokens(used - estimate)
+        return result
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """Pass synchronous calls through unthrottled; the agents call models asynchronously."""
+        return self.inner._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
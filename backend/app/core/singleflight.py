@@ -0,0 +1,64 @@
+"""Coalescing of identical concurrent calls into one in-flight execution."""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, TypeVar
+
+from app.core.metrics import registry
+
+T = TypeVar("T")
+
+shared_calls = registry.counter(
+    "singleflight_shared_total", "Calls that joined an identical call already in flight, by group"
+)
+
+
+class _Call(Generic[T]):
+    def __init__(self, task: "asyncio.Task[T]"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight(Generic[T]):
+    """Runs one call per key at a time and gives every concurrent caller its result.
+
+    The call runs in its own task, so a caller that is cancelled leaves it
+    running for the others; it is only cancelled once every caller has gone.
+    Nothing is kept after a call finishes: errors reach everyone waiting and
+    the next call with the same key starts afresh. Callers share the result
+    object, so copy it before changing it.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[str, _Call[T]] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        """Await ``func()``, or the identical call under ``key`` already in flight."""
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(func()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda task: self._finished(key, call))
+        else:
+            shared_calls.inc(group=self.name)
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                self._forget(key, call)
+                call.task.cancel()
+
+    def _forget(self, key: str, call: _Call[T]) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def _finished(self, key: str, call: _Call[T]) -> None:
+        self._forget(key, call)
+        if not call.task.cancelled():
+            call.task.exception()  # retrieved here in case every caller was cancelled
@@ -0,0 +1,50 @@
+"""Token counting with the tokenizer of the configured chat model."""
+
+import logging
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+TokenCounter = Callable[[str], int]
+
+
+def approximate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token) when no tokenizer is available."""
+    return (len(text) + 3) // 4
+
+
+def _tiktoken_counter(model: str) -> TokenCounter:
+    import tiktoken
+    try:
+        encoding = tiktoken.encoding_for_model(model)
+    except KeyError:
+        encoding = tiktoken.get_encoding("cl100k_base")
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+def _llamacpp_counter(role: Optional[str]) -> TokenCounter:
+    from app.core.llm import get_llm, primary_chat_model
+    model: Any = primary_chat_model(get_llm(role))
+    client = model.client
+    return lambda text: len(client.tokenize(text.encode("utf-8"), add_bos=False))
+
+
+@lru_cache()
+def get_token_counter(role: Optional[str] = None) -> TokenCounter:
+    """Get a token counter for an agent role's primary chat model.
+
+    llama.cpp models use their own tokenizer and OpenAI models tiktoken.
+    Anthropic and Ollama have no local tokenizer here, so tiktoken's
+    cl100k_base stands in. If a tokenizer cannot be loaded, a character
+    based estimate is used.
+    """
+    from app.core.llm import llm_spec
+    provider, model, _ = llm_spec(role)
+    try:
+        if provider == "llamacpp":
+            return _llamacpp_counter(role)
+        return _tiktoken_counter(model if provider == "openai" else "")
+    except Exception:
+        logger.warning("No tokenizer for %s, estimating token counts", provider, exc_info=True)
+        return approximate_tokens
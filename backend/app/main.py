@@ -1,19 +1,37 @@
 """FastAPI application entry point."""
 
+import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api import candidates, jobs, interviews, health
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.database import async_session, init_db
+from app.core.llm_metrics import track_endpoint
+from app.middleware import UploadSizeLimitMiddleware
+from app.services.extraction import shutdown_extraction_pool
+from app.services.prescoring import get_prescore_pool
+from app.services.skill_index import seed_skills
+from app.services.vector_index import backfill_candidate_index, run_index_task
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     await init_db()
+    async with async_session() as session:
+        await seed_skills(session)
+    if settings.prescore_on_upload:
+        get_prescore_pool().start()
+    backfill = None
+    if settings.semantic_index_enabled:
+        backfill = asyncio.create_task(run_index_task(backfill_candidate_index))
     yield
+    if backfill is not None:
+        backfill.cancel()
+    await get_prescore_pool().stop()
+    shutdown_extraction_pool()
 
 
 app = FastAPI(
@@ -21,8 +39,10 @@ app = FastAPI(
     description="AI-powered recruitment automation with LangChain and MCP",
     version="1.0.0",
     lifespan=lifespan,
+    dependencies=[Depends(track_endpoint)],
 )
 
+app.add_middleware(UploadSizeLimitMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
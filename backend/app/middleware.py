@@ -0,0 +1,35 @@
+"""ASGI middleware installed on the application."""
+
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+
+
+class UploadSizeLimitMiddleware:
+    """Reject multipart requests over ``settings.upload_max_request_bytes`` with 413.
+
+    Declared sizes are refused before any of the body is read. Requests
+    without a Content-Length are received in full, and only what is kept of
+    each file is then bounded, by ``spool_upload``.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and settings.upload_max_request_bytes > 0:
+            headers = dict(scope["headers"])
+            content_type = headers.get(b"content-type", b"")
+            length = headers.get(b"content-length", b"")
+            if (
+                content_type.startswith(b"multipart/form-data")
+                and length.isdigit()
+                and int(length) > settings.upload_max_request_bytes
+            ):
+                response = JSONResponse(
+                    {"detail": f"Upload is larger than {settings.upload_max_request_bytes} bytes"},
+                    status_code=413,
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
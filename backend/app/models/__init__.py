@@ -3,9 +3,17 @@
 from app.models.candidate import Candidate, CandidateCreate, CandidateResponse
 from app.models.job import Job, JobCreate, JobResponse
 from app.models.interview import Interview, InterviewCreate, InterviewResponse
+from app.models.ingestion import IngestionBatch, IngestionFile
+from app.models.match_result import MatchResult
+from app.models.parse_result import ResumeParseResult
+from app.models.skill import Skill, SkillAlias, CandidateSkill
 
 __all__ = [
     "Candidate", "CandidateCreate", "CandidateResponse",
     "Job", "JobCreate", "JobResponse",
     "Interview", "InterviewCreate", "InterviewResponse",
+    "IngestionBatch", "IngestionFile",
+    "MatchResult",
+    "ResumeParseResult",
+    "Skill", "SkillAlias", "CandidateSkill",
 ]
\ No newline at end of file
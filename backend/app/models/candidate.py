@@ -3,7 +3,8 @@
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, EmailStr, Field
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON
+from sqlalchemy import Integer, String, Text, DateTime, JSON
+from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -13,19 +14,21 @@ class Candidate(Base):
 
     __tablename__ = "candidates"
 
-    id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(255), nullable=False)
-    email = Column(String(255), unique=True, nullable=False, index=True)
-    phone = Column(String(50), nullable=True)
-    resume_text = Column(Text, nullable=True)
-    skills = Column(JSON, default=list)
-    experience_years = Column(Integer, default=0)
-    education = Column(JSON, default=list)
-    work_history = Column(JSON, default=list)
-    parsed_data = Column(JSON, default=dict)
-    status = Column(String(50), default="new")
-    created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
+    phone: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    resume_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    skills: Mapped[Optional[List[Any]]] = mapped_column(JSON, default=list)
+    experience_years: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    education: Mapped[Optional[List[Any]]] = mapped_column(JSON, default=list)
+    work_history: Mapped[Optional[List[Any]]] = mapped_column(JSON, default=list)
+    parsed_data: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, default=dict)
+    status: Mapped[Optional[str]] = mapped_column(String(50), default="new")
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, server_default=func.now(), onupdate=func.now()
+    )
 
 
 class CandidateCreate(BaseModel):
@@ -49,6 +52,7 @@ class CandidateResponse(BaseModel):
     status: str = "new"
     created_at: datetime
     updated_at: datetime
+    duplicate: bool = False
 
     class Config:
         from_attributes = True
@@ -64,4 +68,39 @@ class CandidateMatch(BaseModel):
     education_match: float = Field(..., ge=0, le=100)
     reasoning: str
     gaps: List[str] = []
-    strengths: List[str] = []
\ No newline at end of file
+    strengths: List[str] = []
+    provisional: bool = False
+
+
+class RankingStats(BaseModel):
+    """How many candidates (or jobs, when ranking jobs) each stage kept or dropped."""
+    total: int = 0
+    semantic_dropped: int = 0
+    prefilter_dropped: int = 0
+    cache_hits: int = 0
+    llm_scored: int = 0
+    llm_failed: int = 0
+    failed_ids: List[int] = []
+    deterministic_scored: int = 0
+    below_min_score: int = 0
+    returned: int = 0
+
+
+class CandidateRanking(BaseModel):
+    """Ranked candidates for a job with per-stage statistics."""
+    job_id: int
+    matches: List[CandidateMatch] = []
+    stats: RankingStats
+
+
+class JobRanking(BaseModel):
+    """Ranked jobs for a candidate with per-stage statistics."""
+    candidate_id: int
+    matches: List[CandidateMatch] = []
+    stats: RankingStats
+
+
+class CandidateSimilarity(BaseModel):
+    """Semantic similarity of a candidate to a job."""
+    candidate_id: int
+    distance: float
@@ -0,0 +1,77 @@
+"""Bulk resume ingestion models."""
+
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel
+from sqlalchemy import Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class IngestionBatch(Base):
+    """A bulk upload of resumes processed in the background."""
+
+    __tablename__ = "ingestion_batches"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    # queued, running, completed, failed
+    status: Mapped[Optional[str]] = mapped_column(String(50), default="queued")
+    total: Mapped[int] = mapped_column(Integer, default=0)
+    succeeded: Mapped[int] = mapped_column(Integer, default=0)
+    failed: Mapped[int] = mapped_column(Integer, default=0)
+    duplicates: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, server_default=func.now(), onupdate=func.now()
+    )
+
+
+class IngestionFile(Base):
+    """One resume file within an ingestion batch."""
+
+    __tablename__ = "ingestion_files"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    batch_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("ingestion_batches.id"), nullable=False, index=True
+    )
+    filename: Mapped[str] = mapped_column(String(500), nullable=False)
+    # queued, done, duplicate, failed
+    status: Mapped[Optional[str]] = mapped_column(String(50), default="queued")
+    candidate_id: Mapped[Optional[int]] = mapped_column(
+        Integer, ForeignKey("candidates.id"), nullable=True
+    )
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, server_default=func.now(), onupdate=func.now()
+    )
+
+
+class IngestionFileResponse(BaseModel):
+    """Ingestion file status schema."""
+    id: int
+    filename: str
+    status: str
+    candidate_id: Optional[int] = None
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class IngestionBatchResponse(BaseModel):
+    """Ingestion batch status schema."""
+    id: int
+    status: str
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    duplicates: int = 0
+    created_at: datetime
+    updated_at: datetime
+    files: List[IngestionFileResponse] = []
+
+    class Config:
+        from_attributes = True
@@ -1,9 +1,10 @@
 """Interview models."""
 
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Any
 from pydantic import BaseModel
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON
+from sqlalchemy import Integer, String, DateTime, ForeignKey, JSON
+from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -13,20 +14,22 @@ class Interview(Base):
 
     __tablename__ = "interviews"
 
-    id = Column(Integer, primary_key=True, index=True)
-    candidate_id = Column(Integer, ForeignKey("candidates.id"), nullable=False)
-    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
-    scheduled_at = Column(DateTime, nullable=False)
-    duration_minutes = Column(Integer, default=60)
-    interview_type = Column(String(50), default="video")
-    interviewers = Column(JSON, default=list)
-    location = Column(String(255), nullable=True)
-    meeting_link = Column(String(500), nullable=True)
-    notes = Column(String(1000), nullable=True)
-    status = Column(String(50), default="scheduled")
-    feedback = Column(JSON, nullable=True)
-    created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    candidate_id: Mapped[int] = mapped_column(Integer, ForeignKey("candidates.id"), nullable=False)
+    job_id: Mapped[int] = mapped_column(Integer, ForeignKey("jobs.id"), nullable=False)
+    scheduled_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    duration_minutes: Mapped[Optional[int]] = mapped_column(Integer, default=60)
+    interview_type: Mapped[Optional[str]] = mapped_column(String(50), default="video")
+    interviewers: Mapped[Optional[List[Any]]] = mapped_column(JSON, default=list)
+    location: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    meeting_link: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    notes: Mapped[Optional[str]] = mapped_column(String(1000), nullable=True)
+    status: Mapped[Optional[str]] = mapped_column(String(50), default="scheduled")
+    feedback: Mapped[Any] = mapped_column(JSON, nullable=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, server_default=func.now(), onupdate=func.now()
+    )
 
 
 class InterviewCreate(BaseModel):
@@ -1,9 +1,10 @@
 """Job models."""
 
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Any
 from pydantic import BaseModel, Field
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON
+from sqlalchemy import Integer, String, Text, DateTime, JSON
+from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -13,22 +14,24 @@ class Job(Base):
 
     __tablename__ = "jobs"
 
-    id = Column(Integer, primary_key=True, index=True)
-    title = Column(String(255), nullable=False)
-    department = Column(String(100), nullable=True)
-    location = Column(String(255), nullable=True)
-    description = Column(Text, nullable=False)
-    requirements = Column(JSON, default=list)
-    required_skills = Column(JSON, default=list)
-    preferred_skills = Column(JSON, default=list)
-    experience_min = Column(Integer, default=0)
-    experience_max = Column(Integer, nullable=True)
-    education_level = Column(String(50), nullable=True)
-    salary_min = Column(Integer, nullable=True)
-    salary_max = Column(Integer, nullable=True)
-    status = Column(String(50), default="open")
-    created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    department: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    location: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    description: Mapped[str] = mapped_column(Text, nullable=False)
+    requirements: Mapped[Optional[List[Any]]] = mapped_column(JSON, default=list)
+    required_skills: Mapped[Optional[List[Any]]] = mapped_column(JSON, default=list)
+    preferred_skills: Mapped[Optional[List[Any]]] = mapped_column(JSON, default=list)
+    experience_min: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    experience_max: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    education_level: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    salary_min: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    salary_max: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    status: Mapped[Optional[str]] = mapped_column(String(50), default="open")
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, server_default=func.now(), onupdate=func.now()
+    )
 
 
 class JobCreate(BaseModel):
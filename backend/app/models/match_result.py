@@ -0,0 +1,34 @@
+"""Persisted match result models."""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+from sqlalchemy import Integer, String, DateTime, ForeignKey, JSON, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class MatchResult(Base):
+    """Cached LLM match result for a candidate-job pair.
+
+    A row is only valid while the candidate and job hashes, model name and
+    prompt version still match what the matcher would send today.
+    """
+
+    __tablename__ = "match_results"
+    __table_args__ = (UniqueConstraint("candidate_id", "job_id"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    candidate_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("candidates.id"), nullable=False, index=True
+    )
+    job_id: Mapped[int] = mapped_column(Integer, ForeignKey("jobs.id"), nullable=False, index=True)
+    candidate_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    job_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    model_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    prompt_version: Mapped[str] = mapped_column(String(20), nullable=False)
+    result: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, server_default=func.now(), onupdate=func.now()
+    )
@@ -0,0 +1,30 @@
+"""Persisted resume parse result models."""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+from sqlalchemy import Integer, String, DateTime, ForeignKey, JSON, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class ResumeParseResult(Base):
+    """Parser output for a resume file, keyed by the SHA-256 of its bytes.
+
+    A row is reused only for the parser model and prompt version that
+    produced it. ``candidate_id`` is the candidate first created from the
+    file, used to flag re-uploads as duplicates.
+    """
+
+    __tablename__ = "parsed_resumes"
+    __table_args__ = (UniqueConstraint("content_sha256", "model_name", "prompt_version"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    content_sha256: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    model_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    prompt_version: Mapped[str] = mapped_column(String(20), nullable=False)
+    parsed_data: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
+    candidate_id: Mapped[Optional[int]] = mapped_column(
+        Integer, ForeignKey("candidates.id"), nullable=True, index=True
+    )
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
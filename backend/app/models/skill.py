@@ -0,0 +1,37 @@
+"""Skill dictionary and posting list models."""
+
+from sqlalchemy import Integer, String, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base
+
+
+class Skill(Base):
+    """Canonical skill."""
+
+    __tablename__ = "skills"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    name: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
+
+
+class SkillAlias(Base):
+    """Alternative spelling of a skill, including its canonical name."""
+
+    __tablename__ = "skill_aliases"
+
+    alias: Mapped[str] = mapped_column(String(255), primary_key=True)
+    skill_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("skills.id"), nullable=False, index=True
+    )
+
+
+class CandidateSkill(Base):
+    """Posting list entry: a candidate has a skill."""
+
+    __tablename__ = "candidate_skills"
+    __table_args__ = (Index("ix_candidate_skills_skill_candidate", "skill_id", "candidate_id"),)
+
+    candidate_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("candidates.id"), primary_key=True
+    )
+    skill_id: Mapped[int] = mapped_column(Integer, ForeignKey("skills.id"), primary_key=True)
@@ -0,0 +1 @@
+"""Matching and ranking services shared by the API routes."""
@@ -0,0 +1,291 @@
+"""Resume text extraction in a worker process pool.
+
+pypdf and python-docx are CPU bound, so PDF and DOCX files are parsed in
+separate processes with a CPU time limit instead of on the event loop.
+Spooled uploads are passed to the workers by path, so large files are never
+pickled across the process boundary.
+
+Long PDFs are split into chunks of pages extracted in parallel and joined in
+page order once, stopping at the page or character budget; a page that
+cannot be read is skipped rather than failing the document. The CPU time
+limit covers the whole file: each chunk gets what earlier chunks left.
+"""
+
+import asyncio
+import signal
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Awaitable, Callable, Deque, List, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.services.uploads import ResumeSource, open_source, read_source
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+extraction_seconds = registry.summary(
+    "resume_extraction_seconds", "Time spent extracting resume text, by format"
+)
+extraction_errors = registry.counter(
+    "resume_extraction_errors_total", "Resume text extractions that failed, by format"
+)
+page_errors = registry.counter(
+    "resume_extraction_page_errors_total", "PDF pages whose text could not be extracted"
+)
+
+_pool: Optional[Executor] = None
+
+
+class ExtractionTimeout(Exception):
+    """A file used up its CPU time budget."""
+
+
+def _on_cpu_limit(signum, frame):
+    raise ExtractionTimeout("CPU time limit exceeded")
+
+
+def _init_worker() -> None:
+    if resource is not None:
+        signal.signal(signal.SIGXCPU, _on_cpu_limit)
+
+
+def _limit_cpu(seconds: float) -> None:
+    """Let the current process use ``seconds`` more CPU time before SIGXCPU."""
+    if resource is None or seconds <= 0:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(usage.ru_utime + usage.ru_stime + seconds) + 1
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _clear_cpu_limit() -> None:
+    if resource is None:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+
+
+class PageText(NamedTuple):
+    """Text of a range of PDF pages."""
+    pages: List[str]
+    failed: int
+    total: int
+    cpu_seconds: float = 0.0
+
+
+def extract_pdf_pages(
+    source: ResumeSource, start: int = 0, stop: int = 0, max_chars: int = 0
+) -> PageText:
+    """Extract text from pages ``start`` to ``stop`` of a PDF (``stop`` 0 for the end).
+
+    Stops early once ``max_chars`` characters are extracted. A page that
+    fails yields empty text and is counted in ``failed``, but running out
+    of CPU time fails the whole range.
+    """
+    from pypdf import PdfReader
+    started = time.process_time()
+    with open_source(source) as f:
+        reader = PdfReader(f)
+        total = len(reader.pages)
+        stop = total if stop <= 0 else min(stop, total)
+        pages: List[str] = []
+        failed = chars = 0
+        for number in range(start, stop):
+            try:
+                text = reader.pages[number].extract_text() or ""
+            except ExtractionTimeout:
+                raise
+            except Exception:
+                text, failed = "", failed + 1
+            pages.append(text)
+            chars += len(text) + 1
+            if 0 < max_chars <= chars:
+                break
+    return PageText(pages, failed, total, time.process_time() - started)
+
+
+def join_pages(pages: List[str], max_chars: int = 0) -> str:
+    """Join page texts in one pass, cut to ``max_chars`` (0 for no limit)."""
+    text = "".join(page + "\n" for page in pages)
+    return text[:max_chars] if max_chars > 0 else text
+
+
+def extract_pdf_text(source: ResumeSource, max_pages: int = 0, max_chars: int = 0) -> str:
+    """Extract text from the first ``max_pages`` pages of a PDF (0 for all), serially."""
+    result = extract_pdf_pages(source, 0, max_pages, max_chars)
+    return join_pages(result.pages, max_chars)
+
+
+def extract_docx_text(source: ResumeSource) -> str:
+    """Extract paragraph text from a DOCX file."""
+    from docx import Document
+    with open_source(source) as f:
+        doc = Document(f)
+    return "\n".join(para.text for para in doc.paragraphs)
+
+
+def _run_extractor(func: Callable, cpu_seconds: float, *args):
+    """Worker entry point: run an extractor under a CPU time limit."""
+    _limit_cpu(cpu_seconds)
+    try:
+        return func(*args)
+    finally:
+        _clear_cpu_limit()
+
+
+def get_extraction_pool() -> Optional[Executor]:
+    """Get the extraction process pool, or None to use a thread instead."""
+    global _pool
+    if _pool is None and settings.extraction_workers > 0:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.extraction_workers, initializer=_init_worker
+        )
+    return _pool
+
+
+def shutdown_extraction_pool() -> None:
+    """Stop the worker processes."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def file_format(filename: str) -> str:
+    """Classify a file by extension: pdf, docx, or text."""
+    filename = filename.lower()
+    if filename.endswith(".pdf"):
+        return "pdf"
+    if filename.endswith(".docx"):
+        return "docx"
+    return "text"
+
+
+class ExtractionError(Exception):
+    """Text could not be extracted from a file."""
+
+
+def _submit(
+    pool: Optional[Executor], func: Callable, *args, cpu_seconds: Optional[float] = None
+) -> "asyncio.Future":
+    """Run an extractor in the process pool, or in a thread without a CPU limit."""
+    loop = asyncio.get_running_loop()
+    if pool is None:
+        return loop.run_in_executor(None, func, *args)
+    if cpu_seconds is None:
+        cpu_seconds = settings.extraction_cpu_seconds
+    return loop.run_in_executor(pool, _run_extractor, func, cpu_seconds, *args)
+
+
+async def _extract_pdf(pool: Optional[Executor], source: ResumeSource) -> str:
+    """Extract a PDF in chunks of pages, keeping one chunk per worker in flight.
+
+    The first chunk also reports the page count; results are consumed in
+    page order so extraction stops as soon as the character budget is met.
+    The CPU time the file has left is shared between the chunks in flight,
+    each starting with an equal part of what the others have not reserved,
+    and the file fails once the chunks have used it all.
+    """
+    max_pages, max_chars = settings.extraction_max_pages, settings.extraction_max_chars
+    budget = settings.extraction_cpu_seconds if pool is not None else 0
+    workers = max(settings.extraction_workers, 1)
+    size = max(settings.extraction_chunk_pages, 1)
+    if max_pages > 0:
+        size = min(size, max_pages)
+    first = await _submit(pool, extract_pdf_pages, source, 0, size, max_chars)
+    pages, failed = list(first.pages), first.failed
+    total = first.total if max_pages <= 0 else min(first.total, max_pages)
+    chars = sum(len(page) + 1 for page in pages)
+    spent = first.cpu_seconds
+    if 0 < budget <= spent:
+        raise ExtractionTimeout("CPU time limit exceeded")
+
+    chunks = iter(range(size, total, size))
+    in_flight: Deque[Tuple["asyncio.Future", float]] = deque()
+    reserved = 0.0
+
+    def submit_next() -> None:
+        nonlocal reserved
+        start = next(chunks, None)
+        if start is not None:
+            stop = min(start + size, total)
+            share = 0.0
+            if budget > 0:
+                share = (budget - spent - reserved) / (workers - len(in_flight))
+                if share <= 0:
+                    raise ExtractionTimeout("CPU time limit exceeded")
+                reserved += share
+            future = _submit(
+                pool, extract_pdf_pages, source, start, stop, max_chars, cpu_seconds=share
+            )
+            in_flight.append((future, share))
+
+    try:
+        if not (0 < max_chars <= chars):
+            for _ in range(workers):
+                submit_next()
+        while in_flight:
+            future, share = in_flight[0]
+            chunk = await future
+            in_flight.popleft()
+            reserved -= share
+            pages.extend(chunk.pages)
+            failed += chunk.failed
+            spent += chunk.cpu_seconds
+            if 0 < budget <= spent:
+                raise ExtractionTimeout("CPU time limit exceeded")
+            chars += sum(len(page) + 1 for page in chunk.pages)
+            if 0 < max_chars <= chars:
+                break
+            submit_next()
+    finally:
+        for future, _ in in_flight:
+            future.cancel()
+
+    if failed:
+        page_errors.inc(failed)
+        if failed == len(pages):
+            raise ExtractionError("no page text could be extracted")
+    return join_pages(pages, max_chars)
+
+
+async def extract_text(source: ResumeSource, filename: str, strict: bool = False) -> str:
+    """Extract text from a resume without blocking the event loop.
+
+    ``source`` is the file content or the path of a spooled upload.
+    Failures are returned as an error message in place of the text, as the
+    parser has always done, or raised as ``ExtractionError`` when ``strict``.
+    """
+    fmt = file_format(filename)
+    if fmt == "text":
+        if isinstance(source, str):
+            source = await asyncio.to_thread(read_source, source)
+        return source.decode("utf-8", errors="ignore")
+
+    started = time.perf_counter()
+    try:
+        pool = get_extraction_pool()
+        work: Awaitable[str]
+        if fmt == "pdf":
+            work = _extract_pdf(pool, source)
+        else:
+            work = _submit(pool, extract_docx_text, source)
+        return await asyncio.wait_for(work, settings.extraction_timeout_seconds)
+    except Exception as e:
+        if isinstance(e, BrokenProcessPool):
+            shutdown_extraction_pool()
+        extraction_errors.inc(format=fmt)
+        message = "timed out" if isinstance(e, asyncio.TimeoutError) else str(e)
+        if strict:
+            raise ExtractionError(message) from e
+        return f"Error extracting {fmt.upper()}: {message}"
+    finally:
+        extraction_seconds.observe(time.perf_counter() - started, format=fmt)
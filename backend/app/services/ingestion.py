@@ -0,0 +1,303 @@
+"""Bulk resume ingestion: a pipelined extract -> parse -> persist flow."""
+
+import asyncio
+import logging
+import uuid
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.agents.resume_parser import ResumeParserAgent
+from app.core.config import settings
+from app.core.database import async_session
+from app.core.llm import llm_spec
+from app.core.rate_limit import get_rate_limiter
+from app.models.candidate import Candidate
+from app.models.ingestion import IngestionBatch, IngestionFile
+from app.services.extraction import extract_text
+from app.services.parse_cache import find_duplicates, load_parsed, save_parsed
+from app.services.prescoring import get_prescore_pool
+from app.services.skill_index import index_candidate_skills
+from app.services.uploads import ResumeSource, SpooledResume, discard, discard_source
+from app.services.vector_index import index_candidate, run_index_task
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class IngestionItem(NamedTuple):
+    """A file travelling through the pipeline."""
+    file_id: int
+    filename: str
+    source: ResumeSource = b""
+    digest: str = ""
+    text: Optional[str] = None
+    parsed: Optional[Dict[str, Any]] = None
+    duplicate_of: Optional[int] = None
+    error: Optional[str] = None
+
+
+def resume_email(parsed_data: Dict[str, Any], email: Optional[str] = None) -> Optional[str]:
+    """The email given for a resume or found in it, if any."""
+    return email or parsed_data.get("email") or None
+
+
+def candidate_from_parsed(
+    parsed_data: Dict[str, Any],
+    name: Optional[str] = None,
+    email: Optional[str] = None,
+) -> Candidate:
+    """Build a candidate from resume parser output.
+
+    A resume without an email gets a unique placeholder address, so it is
+    never taken for another emailless candidate.
+    """
+    return Candidate(
+        name=name or parsed_data.get("name", "Unknown"),
+        email=resume_email(parsed_data, email) or f"unknown-{uuid.uuid4().hex}@example.com",
+        phone=parsed_data.get("phone"),
+        resume_text=parsed_data.get("raw_text", ""),
+        skills=parsed_data.get("skills", []),
+        experience_years=parsed_data.get("experience_years", 0),
+        education=parsed_data.get("education", []),
+        work_history=parsed_data.get("work_history", []),
+        parsed_data=parsed_data,
+    )
+
+
+async def create_batch(session: AsyncSession, filenames: Sequence[str]) -> IngestionBatch:
+    """Record a new batch and its files as queued."""
+    batch = IngestionBatch(status="queued", total=len(filenames))
+    session.add(batch)
+    await session.flush()
+    session.add_all(IngestionFile(batch_id=batch.id, filename=name) for name in filenames)
+    await session.commit()
+    await session.refresh(batch)
+    return batch
+
+
+async def load_batch(
+    session: AsyncSession, batch_id: int
+) -> Optional[Tuple[IngestionBatch, List[IngestionFile]]]:
+    """Get a batch and its files, or None."""
+    batch = await session.get(IngestionBatch, batch_id)
+    if batch is None:
+        return None
+    return batch, await load_batch_files(session, batch_id)
+
+
+async def load_batch_files(session: AsyncSession, batch_id: int) -> List[IngestionFile]:
+    """Get the files of a batch, in upload order."""
+    result = await session.execute(
+        select(IngestionFile).where(IngestionFile.batch_id == batch_id).order_by(IngestionFile.id)
+    )
+    return list(result.scalars().all())
+
+
+async def _extract_stage(items: Sequence[IngestionItem], out: asyncio.Queue) -> None:
+    """Extract items with a fixed set of workers.
+
+    A worker takes its next item only once it has handed the last one on, so
+    no more than one extracted text per worker waits for room in ``out``.
+    """
+    inbox: asyncio.Queue = asyncio.Queue()
+    for item in items:
+        inbox.put_nowait(item)
+
+    async def worker() -> None:
+        while not inbox.empty():
+            item = inbox.get_nowait()
+            if item.parsed is None and item.duplicate_of is None:
+                try:
+                    text = await extract_text(item.source, item.filename, strict=True)
+                    item = item._replace(text=text)
+                except Exception as e:
+                    item = item._replace(error=f"Text extraction failed: {e}")
+            discard_source(item.source)
+            await out.put(item._replace(source=b""))
+
+    async with asyncio.TaskGroup() as group:
+        for _ in range(max(settings.extraction_workers, 1)):
+            group.create_task(worker())
+
+
+async def _parse_stage(parser, mode: str, inbox: asyncio.Queue, out: asyncio.Queue) -> None:
+    limiter = get_rate_limiter(llm_spec("parser").provider)
+    while True:
+        item = await inbox.get()
+        if item is _DONE:
+            return
+        if item.error is None and item.parsed is None and item.duplicate_of is None:
+            try:
+                async with limiter.reserve():
+                    parsed = await parser.parse_text(item.text, mode)
+                item = item._replace(parsed=parsed)
+            except Exception as e:
+                item = item._replace(error=f"Parsing failed: {e}")
+        await out.put(item._replace(text=None))
+
+
+async def _persist_stage(
+    session: AsyncSession,
+    batch: IngestionBatch,
+    mode: str,
+    inbox: asyncio.Queue,
+) -> None:
+    files = {
+        f.id: f for f in (await session.execute(
+            select(IngestionFile).where(IngestionFile.batch_id == batch.id)
+        )).scalars().all()
+    }
+    pending: List[IngestionItem] = []
+    seen: Dict[str, int] = {}
+    finished = False
+    while not finished:
+        item = await inbox.get()
+        if item is _DONE:
+            finished = True
+        else:
+            pending.append(item)
+        full = len(pending) >= settings.ingestion_commit_batch_size
+        if pending and (finished or inbox.empty() or full):
+            await _persist(session, batch, files, pending, seen, mode)
+            pending = []
+
+
+async def _persist(
+    session: AsyncSession,
+    batch: IngestionBatch,
+    files: Dict[int, IngestionFile],
+    items: Sequence[IngestionItem],
+    seen: Dict[str, int],
+    mode: str,
+) -> None:
+    """Insert one batch of parsed resumes with a single commit.
+
+    ``seen`` maps file digests to candidates inserted earlier in the run, so
+    identical files within a batch are flagged as duplicates too.
+    """
+    inserted: List[Candidate] = []
+    for item in items:
+        row = files[item.file_id]
+        if item.error is None and item.duplicate_of is None:
+            item = item._replace(duplicate_of=seen.get(item.digest))
+        parsed = item.parsed
+        if item.error is None and item.duplicate_of is None and parsed is not None:
+            candidate = candidate_from_parsed(parsed)
+            try:
+                async with session.begin_nested():
+                    session.add(candidate)
+                    await session.flush()
+                    await index_candidate_skills(session, candidate)
+                    await session.flush()
+            except IntegrityError:
+                existing = None
+                if resume_email(parsed):
+                    existing = await session.scalar(
+                        select(Candidate.id).where(Candidate.email == candidate.email)
+                    )
+                item = item._replace(duplicate_of=existing)
+                if existing is None:
+                    item = item._replace(error="Candidate could not be saved")
+            else:
+                inserted.append(candidate)
+                row.candidate_id = seen[item.digest] = candidate.id
+        if item.parsed is not None:
+            await save_parsed(
+                session, item.digest, item.parsed, item.duplicate_of or row.candidate_id, mode
+            )
+
+        if item.error:
+            row.status, row.error = "failed", item.error
+            batch.failed += 1
+        elif item.duplicate_of is not None:
+            row.status, row.candidate_id = "duplicate", item.duplicate_of
+            batch.duplicates += 1
+        else:
+            row.status = "done"
+            batch.succeeded += 1
+    await session.commit()
+
+    for candidate in inserted:
+        if settings.semantic_index_enabled:
+            await run_index_task(index_candidate, candidate)
+        if settings.prescore_on_upload:
+            get_prescore_pool().submit(candidate.id)
+
+
+async def _prepare(
+    session: AsyncSession,
+    files: Sequence[Tuple[int, SpooledResume]],
+    mode: str,
+) -> List[IngestionItem]:
+    """Attach any cached parse or existing duplicate candidate to each file."""
+    items = [
+        IngestionItem(file_id, resume.filename, resume.source, resume.digest)
+        for file_id, resume in files
+    ]
+    digests = [item.digest for item in items]
+    duplicates = await find_duplicates(session, digests)
+    cached = await load_parsed(session, digests, mode)
+    return [
+        item._replace(duplicate_of=duplicates.get(item.digest), parsed=cached.get(item.digest))
+        for item in items
+    ]
+
+
+async def run_ingestion(
+    batch_id: int,
+    files: Sequence[Tuple[int, SpooledResume]],
+    mode: Optional[str] = None,
+    session_factory=None,
+) -> None:
+    """Process the (file_id, spooled resume) pairs of a batch.
+
+    Extraction, LLM parsing and inserts overlap, with bounded queues between
+    the stages; inserts are committed in groups of up to
+    ``settings.ingestion_commit_batch_size``. Files already parsed skip both
+    extraction and the LLM, and files that already produced a candidate are
+    marked as duplicates. Spooled files are removed once read. If a stage
+    fails, the other stages are cancelled and the batch is marked failed.
+    """
+    mode = mode or settings.resume_parse_mode
+    session_factory = session_factory or async_session
+    async with session_factory() as session:
+        batch = await session.get(IngestionBatch, batch_id)
+        batch.status = "running"
+        await session.commit()
+        try:
+            extracted: asyncio.Queue = asyncio.Queue(maxsize=settings.ingestion_queue_size)
+            parsed: asyncio.Queue = asyncio.Queue(maxsize=settings.ingestion_queue_size)
+            items = await _prepare(session, files, mode)
+            parser = ResumeParserAgent()
+            parse_workers = max(settings.ingestion_parse_workers, 1)
+
+            async def extract_then_close() -> None:
+                await _extract_stage(items, extracted)
+                for _ in range(parse_workers):
+                    await extracted.put(_DONE)
+
+            async def parse_then_close() -> None:
+                async with asyncio.TaskGroup() as workers:
+                    for _ in range(parse_workers):
+                        workers.create_task(_parse_stage(parser, mode, extracted, parsed))
+                await parsed.put(_DONE)
+
+            # A stage that fails cancels the others rather than leaving them
+            # blocked on a queue nobody drains.
+            async with asyncio.TaskGroup() as stages:
+                stages.create_task(extract_then_close())
+                stages.create_task(parse_then_close())
+                stages.create_task(_persist_stage(session, batch, mode, parsed))
+            batch.status = "completed"
+        except Exception:
+            logger.exception("Ingestion batch %s failed", batch_id)
+            await session.rollback()
+            batch = await session.get(IngestionBatch, batch_id)
+            batch.status = "failed"
+        finally:
+            discard(resume for _, resume in files)
+        await session.commit()
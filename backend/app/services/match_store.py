@@ -0,0 +1,126 @@
+"""Persistent store of LLM match results keyed by input content hashes."""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.agents.job_matcher import PROMPT_VERSION, JobMatcherAgent
+from app.core.hashing import content_hash
+from app.core.llm import get_model_name
+from app.models.candidate import CandidateMatch
+from app.models.match_result import MatchResult
+
+PairKey = Tuple[int, int]
+
+_UPSERT_COLUMNS = ("candidate_hash", "job_hash", "model_name", "prompt_version", "result")
+
+
+def candidate_hash(candidate) -> str:
+    """Hash the candidate fields the matcher prompt actually uses."""
+    return content_hash(JobMatcherAgent.candidate_inputs(candidate))
+
+
+def job_hash(job) -> str:
+    """Hash the job fields the matcher prompt actually uses."""
+    return content_hash(JobMatcherAgent.job_inputs(job))
+
+
+def _is_current(row: MatchResult, candidate, job, model_name: str) -> bool:
+    return (
+        row.candidate_hash == candidate_hash(candidate)
+        and row.job_hash == job_hash(job)
+        and row.model_name == model_name
+        and row.prompt_version == PROMPT_VERSION
+    )
+
+
+async def _load_rows(session: AsyncSession, keys: Iterable[PairKey]) -> Dict[PairKey, MatchResult]:
+    keys = list(keys)
+    if not keys:
+        return {}
+    job_ids = {job_id for _, job_id in keys}
+    candidate_ids = {candidate_id for candidate_id, _ in keys}
+    if len(job_ids) <= len(candidate_ids):
+        query = select(MatchResult).where(MatchResult.job_id.in_(job_ids))
+    else:
+        query = select(MatchResult).where(MatchResult.candidate_id.in_(candidate_ids))
+    result = await session.execute(query.execution_options(populate_existing=True))
+    wanted = set(keys)
+    return {
+        (row.candidate_id, row.job_id): row
+        for row in result.scalars().all()
+        if (row.candidate_id, row.job_id) in wanted
+    }
+
+
+async def load_matches(
+    session: AsyncSession,
+    pairs: Sequence[Tuple[Any, Any]],
+) -> Dict[PairKey, CandidateMatch]:
+    """Return stored matches whose inputs are unchanged since they were scored."""
+    rows = await _load_rows(session, [(c.id, j.id) for c, j in pairs])
+    model_name = get_model_name("matcher")
+    hits = {}
+    for candidate, job in pairs:
+        row = rows.get((candidate.id, job.id))
+        if row is not None and _is_current(row, candidate, job, model_name):
+            hits[(candidate.id, job.id)] = CandidateMatch(**row.result)
+    return hits
+
+
+def _insert(session: AsyncSession):
+    dialect = session.bind.dialect.name if session.bind is not None else "sqlite"
+    return postgresql.insert if dialect == "postgresql" else sqlite.insert
+
+
+async def save_matches(
+    session: AsyncSession,
+    scored: Sequence[Tuple[Any, Any, CandidateMatch]],
+) -> None:
+    """Insert or refresh stored matches for (candidate, job, match) triples.
+
+    Written as one upsert, so concurrent rankings of the same pairs (two
+    requests, or a request and the prescore pool) do not collide on the
+    (candidate_id, job_id) unique constraint; the last write wins.
+    """
+    if not scored:
+        return
+    model_name = get_model_name("matcher")
+    rows: Dict[PairKey, Dict[str, Any]] = {}
+    for candidate, job, match in scored:
+        rows[(candidate.id, job.id)] = {
+            "candidate_id": candidate.id,
+            "job_id": job.id,
+            "candidate_hash": candidate_hash(candidate),
+            "job_hash": job_hash(job),
+            "model_name": model_name,
+            "prompt_version": PROMPT_VERSION,
+            "result": match.model_dump(),
+        }
+    stmt = _insert(session)(MatchResult).values(list(rows.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["candidate_id", "job_id"],
+        set_={
+            **{key: stmt.excluded[key] for key in _UPSERT_COLUMNS},
+            "updated_at": func.now(),
+        },
+    )
+    await session.execute(stmt)
+    await session.commit()
+
+
+async def delete_matches(
+    session: AsyncSession,
+    candidate_id: Optional[int] = None,
+    job_id: Optional[int] = None,
+) -> None:
+    """Delete stored matches for a candidate and/or job."""
+    conditions: List[Any] = []
+    if candidate_id is not None:
+        conditions.append(MatchResult.candidate_id == candidate_id)
+    if job_id is not None:
+        conditions.append(MatchResult.job_id == job_id)
+    if conditions:
+        await session.execute(delete(MatchResult).where(*conditions))
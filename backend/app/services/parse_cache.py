@@ -0,0 +1,93 @@
+"""Persistent cache of resume parses keyed by the SHA-256 of the file bytes."""
+
+import hashlib
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.agents.resume_parser import parse_version
+from app.core.llm import get_model_name
+from app.models.candidate import Candidate
+from app.models.parse_result import ResumeParseResult
+
+
+def _parser_key(mode: str) -> Tuple[str, str]:
+    """(model name, version) that parser output in ``mode`` is stored under."""
+    model_name = "deterministic" if mode == "fast" else get_model_name("parser")
+    return model_name, parse_version(mode)
+
+
+def resume_digest(content: bytes) -> str:
+    """SHA-256 of a resume file's bytes."""
+    return hashlib.sha256(content).hexdigest()
+
+
+async def load_parsed(
+    session: AsyncSession,
+    digests: Iterable[str],
+    mode: str = "full",
+) -> Dict[str, Dict[str, Any]]:
+    """Return cached parser output for files parsed with the current model, prompt and mode."""
+    digests = set(digests)
+    if not digests:
+        return {}
+    model_name, version = _parser_key(mode)
+    result = await session.execute(
+        select(ResumeParseResult.content_sha256, ResumeParseResult.parsed_data).where(
+            ResumeParseResult.content_sha256.in_(digests),
+            ResumeParseResult.model_name == model_name,
+            ResumeParseResult.prompt_version == version,
+        )
+    )
+    return dict(result.all())
+
+
+async def find_duplicates(session: AsyncSession, digests: Iterable[str]) -> Dict[str, int]:
+    """Map file digests to the existing candidate created from the same bytes."""
+    digests = set(digests)
+    if not digests:
+        return {}
+    result = await session.execute(
+        select(ResumeParseResult.content_sha256, Candidate.id)
+        .join(Candidate, Candidate.id == ResumeParseResult.candidate_id)
+        .where(ResumeParseResult.content_sha256.in_(digests))
+    )
+    return dict(result.all())
+
+
+async def save_parsed(
+    session: AsyncSession,
+    digest: str,
+    parsed_data: Dict[str, Any],
+    candidate_id: Optional[int] = None,
+    mode: str = "full",
+) -> None:
+    """Store parser output for a file and link it to its candidate; the caller commits."""
+    model_name, version = _parser_key(mode)
+    row = await session.scalar(
+        select(ResumeParseResult).where(
+            ResumeParseResult.content_sha256 == digest,
+            ResumeParseResult.model_name == model_name,
+            ResumeParseResult.prompt_version == version,
+        )
+    )
+    if row is None:
+        session.add(ResumeParseResult(
+            content_sha256=digest,
+            model_name=model_name,
+            prompt_version=version,
+            parsed_data=parsed_data,
+            candidate_id=candidate_id,
+        ))
+    elif candidate_id is not None:
+        row.candidate_id = candidate_id
+
+
+async def forget_candidate(session: AsyncSession, candidate_id: int) -> None:
+    """Unlink cached parses from a deleted candidate, keeping the parses."""
+    await session.execute(
+        update(ResumeParseResult)
+        .where(ResumeParseResult.candidate_id == candidate_id)
+        .values(candidate_id=None)
+    )
@@ -0,0 +1,39 @@
+"""Deterministic shortlisting of candidates and jobs before any LLM call."""
+
+from typing import Any, List, Sequence, Tuple
+
+from app.models.candidate import CandidateMatch
+from app.services.scoring import score_candidate
+from app.services.skill_matrix import candidate_pool
+
+
+def prefilter_candidates(
+    candidates: Sequence[Any],
+    job,
+    top_n: int,
+) -> Tuple[List[Any], List[CandidateMatch]]:
+    """Keep the top_n candidates by deterministic score.
+
+    Returns the surviving candidates (best first) and their prefilter scores.
+    """
+    pool = candidate_pool(candidates)
+    scores = pool.score(job)
+    survivors = pool.top_n(scores, top_n)
+    return (
+        [pool.candidates[i] for i in survivors],
+        [pool.to_match(i, job, scores) for i in survivors],
+    )
+
+
+def prefilter_jobs(
+    candidate,
+    jobs: Sequence[Any],
+    top_n: int,
+) -> Tuple[List[Any], List[CandidateMatch]]:
+    """Keep the top_n jobs for a candidate by deterministic score."""
+    scored = sorted(
+        ((job, score_candidate(candidate, job)) for job in jobs),
+        key=lambda item: item[1].overall_score,
+        reverse=True,
+    )[:max(top_n, 0)]
+    return [job for job, _ in scored], [match for _, match in scored]
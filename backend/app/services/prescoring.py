@@ -0,0 +1,101 @@
+"""Background pre-scoring of new candidates against open jobs."""
+
+import asyncio
+import logging
+from functools import lru_cache
+from typing import List, NamedTuple, Optional
+
+from sqlalchemy import select
+
+from app.agents.job_matcher import JobMatcherAgent
+from app.core.config import settings
+from app.core.database import async_session
+from app.models.candidate import Candidate
+from app.models.job import Job
+from app.services.ranking import rank_jobs
+
+logger = logging.getLogger(__name__)
+
+
+class PrescoreRequest(NamedTuple):
+    """Score one candidate against one job, or against every open job."""
+    candidate_id: int
+    job_id: Optional[int] = None
+
+
+class PrescorePool:
+    """Fixed set of worker tasks draining a bounded queue of pre-scoring requests.
+
+    Results go to the match store through the normal ranking pipeline, so
+    ranking pages later read them as cache hits.
+    """
+
+    def __init__(self, workers: int, queue_size: int, session_factory=async_session):
+        self.workers = max(workers, 1)
+        self.queue_size = queue_size
+        self.session_factory = session_factory
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> asyncio.Queue:
+        """Start the workers on the running event loop; returns their queue."""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._tasks = [
+                asyncio.create_task(self._worker(self._queue)) for _ in range(self.workers)
+            ]
+        return self._queue
+
+    async def stop(self) -> None:
+        """Cancel the workers, dropping any queued requests."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def submit(self, candidate_id: int, job_id: Optional[int] = None) -> bool:
+        """Queue a candidate for pre-scoring; returns False if the queue is full."""
+        queue = self.start()
+        try:
+            queue.put_nowait(PrescoreRequest(candidate_id, job_id))
+        except asyncio.QueueFull:
+            logger.warning("Pre-scoring queue full, skipping candidate %s", candidate_id)
+            return False
+        return True
+
+    async def join(self) -> None:
+        """Wait until every queued request has been processed."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            request = await queue.get()
+            try:
+                await self.prescore(request)
+            except Exception:
+                logger.exception("Pre-scoring failed for candidate %s", request.candidate_id)
+            finally:
+                queue.task_done()
+
+    async def prescore(self, request: PrescoreRequest) -> None:
+        """Score a candidate and store the results."""
+        async with self.session_factory() as session:
+            candidate = await session.get(Candidate, request.candidate_id)
+            if candidate is None:
+                return
+            query = select(Job).where(Job.status == "open")
+            if request.job_id is not None:
+                query = query.where(Job.id == request.job_id)
+            jobs = (await session.execute(query)).scalars().all()
+            if jobs:
+                await rank_jobs(
+                    JobMatcherAgent(), candidate, jobs, min_score=0, limit=0, session=session
+                )
+
+
+@lru_cache()
+def get_prescore_pool() -> PrescorePool:
+    """Get the shared pre-scoring pool."""
+    return PrescorePool(settings.prescore_workers, settings.prescore_queue_size)
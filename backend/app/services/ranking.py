@@ -0,0 +1,339 @@
+"""Ranking pipeline: prefilter, concurrent LLM matching, ordering."""
+
+import asyncio
+import heapq
+from functools import partial
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.llm import llm_spec
+from app.core.rate_limit import get_rate_limiter
+from app.models.candidate import CandidateMatch, CandidateRanking, JobRanking, RankingStats
+from app.services.match_store import load_matches, save_matches
+from app.services.prefilter import prefilter_candidates, prefilter_jobs
+
+
+class MatchOutcome(NamedTuple):
+    """Result of matching one candidate against one job."""
+    candidate: Any
+    job: Any
+    match: Optional[CandidateMatch]
+    error: Optional[BaseException]
+
+
+async def iter_matches(
+    matcher,
+    pairs: Sequence[Tuple[Any, Any]],
+    timeout: Optional[float] = None,
+    batch_size: Optional[int] = None,
+) -> AsyncIterator[MatchOutcome]:
+    """Match (candidate, job) pairs concurrently, yielding as each finishes.
+
+    Concurrency is bounded by the provider's rate limiter and every LLM call
+    gets its own timeout, which starts once it holds a slot. With
+    ``batch_size`` > 1, candidates for the same job are scored several per
+    prompt and anything the batch call could not score is retried one by one.
+    Failures are yielded as outcomes rather than raised so one bad candidate
+    cannot sink the whole ranking.
+    """
+    limiter = get_rate_limiter(llm_spec("matcher").provider)
+    timeout = settings.match_timeout_seconds if timeout is None else timeout
+    batch_size = settings.match_batch_size if batch_size is None else batch_size
+    outcomes: asyncio.Queue = asyncio.Queue()
+    Emit = Callable[[MatchOutcome], None]
+
+    async def run_single(candidate, job, emit: Emit) -> None:
+        async with limiter.reserve():
+            try:
+                match = await asyncio.wait_for(matcher.match(candidate, job), timeout)
+                outcome = MatchOutcome(candidate, job, match, None)
+            except Exception as e:
+                outcome = MatchOutcome(candidate, job, None, e)
+        emit(outcome)
+
+    async def run_batch(candidates, job, emit: Emit) -> None:
+        async with limiter.reserve():
+            try:
+                matches = await asyncio.wait_for(
+                    matcher.match_batch(candidates, job, fallback=False), timeout
+                )
+            except Exception:
+                matches = []
+        scored = {match.candidate_id: match for match in matches}
+        leftovers = []
+        for candidate in candidates:
+            if candidate.id in scored:
+                emit(MatchOutcome(candidate, job, scored[candidate.id], None))
+            else:
+                leftovers.append(candidate)
+        await asyncio.gather(*(run_single(candidate, job, emit) for candidate in leftovers))
+
+    async def produce(group: List[Tuple[Any, Any]], run: Callable[[Emit], Awaitable[None]]) -> None:
+        """Run a producer; pairs it leaves unreported when it raises are failed outcomes."""
+        remaining = list(group)
+
+        def emit(outcome: MatchOutcome) -> None:
+            remaining.remove((outcome.candidate, outcome.job))
+            outcomes.put_nowait(outcome)
+
+        try:
+            await run(emit)
+        except BaseException as e:
+            for candidate, job in remaining:
+                outcomes.put_nowait(MatchOutcome(candidate, job, None, e))
+            if not isinstance(e, Exception):
+                raise
+
+    if batch_size > 1:
+        by_job: Dict[int, Tuple[Any, List[Any]]] = {}
+        for candidate, job in pairs:
+            by_job.setdefault(job.id, (job, []))[1].append(candidate)
+        coros = [
+            produce(
+                [(candidate, job) for candidate in chunk],
+                partial(run_batch, chunk, job)
+                if len(chunk) > 1
+                else partial(run_single, chunk[0], job),
+            )
+            for job, candidates in by_job.values()
+            for chunk in (
+                candidates[i:i + batch_size] for i in range(0, len(candidates), batch_size)
+            )
+        ]
+    else:
+        coros = [
+            produce([(candidate, job)], partial(run_single, candidate, job))
+            for candidate, job in pairs
+        ]
+
+    tasks = [asyncio.create_task(coro) for coro in coros]
+    try:
+        for _ in range(len(pairs)):
+            yield await outcomes.get()
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _iter_scored(
+    matcher,
+    shortlist: Sequence[Tuple[Any, Any, CandidateMatch]],
+    stats: RankingStats,
+    min_score: float,
+    session: Optional[AsyncSession],
+    use_llm: bool,
+    subject_id: Callable[[Any, Any], int],
+) -> AsyncIterator[CandidateMatch]:
+    """Score prefiltered (candidate, job, deterministic match) triples.
+
+    Shared by both ranking directions; ``subject_id`` picks the ID recorded in
+    ``stats.failed_ids`` for a failed pair.
+    """
+    if not use_llm:
+        for _, _, match in shortlist:
+            stats.deterministic_scored += 1
+            if match.overall_score >= min_score:
+                yield match
+            else:
+                stats.below_min_score += 1
+        return
+
+    deterministic = {(c.id, j.id): match for c, j, match in shortlist}
+
+    pairs = [(candidate, job) for candidate, job, _ in shortlist]
+    stored = await load_matches(session, pairs) if session is not None else {}
+    stats.cache_hits = len(stored)
+
+    for match in stored.values():
+        if match.overall_score >= min_score:
+            yield match
+        else:
+            stats.below_min_score += 1
+
+    fresh = []
+    misses = [(c, j) for c, j in pairs if (c.id, j.id) not in stored]
+    try:
+        async for outcome in iter_matches(matcher, misses):
+            if outcome.match is None:
+                stats.llm_failed += 1
+                stats.failed_ids.append(subject_id(outcome.candidate, outcome.job))
+                if not settings.ranking_deterministic_fallback:
+                    continue
+                match = deterministic[(outcome.candidate.id, outcome.job.id)]
+                stats.deterministic_scored += 1
+            else:
+                match = outcome.match
+                stats.llm_scored += 1
+                fresh.append((outcome.candidate, outcome.job, match))
+            if match.overall_score >= min_score:
+                yield match
+            else:
+                stats.below_min_score += 1
+    finally:
+        if session is not None:
+            await save_matches(session, fresh)
+
+
+def iter_ranked_matches(
+    matcher,
+    job,
+    candidates: Sequence[Any],
+    stats: RankingStats,
+    min_score: float,
+    prefilter_top_n: Optional[int] = None,
+    session: Optional[AsyncSession] = None,
+    use_llm: bool = True,
+) -> AsyncIterator[CandidateMatch]:
+    """Yield matches scoring at least ``min_score`` as soon as each is ready.
+
+    Stored matches come first, then LLM results in completion order. ``stats``
+    is updated in place. When a session is given, stored matches with
+    unchanged inputs are reused and fresh LLM results are written back, even
+    if the consumer stops early.
+
+    With ``use_llm`` off, the deterministic prefilter scores are the result.
+    Candidates whose LLM call fails fall back to them when
+    ``settings.ranking_deterministic_fallback`` is set.
+    """
+    top_n = settings.ranking_prefilter_top_n if prefilter_top_n is None else prefilter_top_n
+    shortlist, prefilter_scores = prefilter_candidates(candidates, job, top_n)
+    stats.total = stats.semantic_dropped + len(candidates)
+    stats.prefilter_dropped = len(candidates) - len(shortlist)
+    return _iter_scored(
+        matcher,
+        [(c, job, match) for c, match in zip(shortlist, prefilter_scores)],
+        stats,
+        min_score,
+        session,
+        use_llm,
+        lambda candidate, _: candidate.id,
+    )
+
+
+def iter_ranked_jobs(
+    matcher,
+    candidate,
+    jobs: Sequence[Any],
+    stats: RankingStats,
+    min_score: float,
+    prefilter_top_n: Optional[int] = None,
+    session: Optional[AsyncSession] = None,
+    use_llm: bool = True,
+) -> AsyncIterator[CandidateMatch]:
+    """Yield job matches for one candidate; the reverse of ``iter_ranked_matches``."""
+    top_n = settings.ranking_prefilter_top_n if prefilter_top_n is None else prefilter_top_n
+    shortlist, prefilter_scores = prefilter_jobs(candidate, jobs, top_n)
+    stats.total = len(jobs)
+    stats.prefilter_dropped = len(jobs) - len(shortlist)
+    return _iter_scored(
+        matcher,
+        [(candidate, j, match) for j, match in zip(shortlist, prefilter_scores)],
+        stats,
+        min_score,
+        session,
+        use_llm,
+        lambda _, job: job.id,
+    )
+
+
+def top_matches(matches: Sequence[CandidateMatch], limit: int) -> List[CandidateMatch]:
+    """Return the best ``limit`` matches, highest score first."""
+    return heapq.nlargest(limit, matches, key=lambda x: x.overall_score)
+
+
+async def rank_candidates(
+    matcher,
+    job,
+    candidates: Sequence[Any],
+    min_score: float,
+    limit: int,
+    prefilter_top_n: Optional[int] = None,
+    session: Optional[AsyncSession] = None,
+    use_llm: bool = True,
+    stats: Optional[RankingStats] = None,
+) -> CandidateRanking:
+    """Rank candidates for a job and report what each stage dropped."""
+    stats = stats or RankingStats()
+    matches = [
+        match async for match in iter_ranked_matches(
+            matcher, job, candidates, stats, min_score, prefilter_top_n, session, use_llm
+        )
+    ]
+    matches = top_matches(matches, limit)
+    stats.returned = len(matches)
+    return CandidateRanking(job_id=job.id, matches=matches, stats=stats)
+
+
+async def rank_jobs(
+    matcher,
+    candidate,
+    jobs: Sequence[Any],
+    min_score: float,
+    limit: int,
+    prefilter_top_n: Optional[int] = None,
+    session: Optional[AsyncSession] = None,
+    use_llm: bool = True,
+    stats: Optional[RankingStats] = None,
+) -> JobRanking:
+    """Rank jobs for a candidate and report what each stage dropped."""
+    stats = stats or RankingStats()
+    matches = [
+        match async for match in iter_ranked_jobs(
+            matcher, candidate, jobs, stats, min_score, prefilter_top_n, session, use_llm
+        )
+    ]
+    matches = top_matches(matches, limit)
+    stats.returned = len(matches)
+    return JobRanking(candidate_id=candidate.id, matches=matches, stats=stats)
+
+
+async def iter_ranking_events(
+    matcher,
+    job,
+    candidates: Sequence[Any],
+    min_score: float,
+    limit: int,
+    prefilter_top_n: Optional[int] = None,
+    session: Optional[AsyncSession] = None,
+    snapshot_every: int = 10,
+    use_llm: bool = True,
+    stats: Optional[RankingStats] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Stream a ranking as ``match``, ``snapshot`` and final ``done`` events.
+
+    Every ``match`` event carries one newly scored candidate. A ``snapshot``
+    with the current top ``limit`` follows every ``snapshot_every`` matches.
+    ``done`` carries the final ranking and stage statistics.
+    """
+    stats = stats or RankingStats()
+    matches: List[CandidateMatch] = []
+    async for match in iter_ranked_matches(
+        matcher, job, candidates, stats, min_score, prefilter_top_n, session, use_llm
+    ):
+        matches.append(match)
+        yield {"event": "match", "data": match.model_dump()}
+        if snapshot_every > 0 and len(matches) % snapshot_every == 0:
+            yield {
+                "event": "snapshot",
+                "data": [m.model_dump() for m in top_matches(matches, limit)],
+            }
+
+    ranked = top_matches(matches, limit)
+    stats.returned = len(ranked)
+    yield {
+        "event": "done",
+        "data": CandidateRanking(job_id=job.id, matches=ranked, stats=stats).model_dump(),
+    }
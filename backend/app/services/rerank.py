@@ -0,0 +1,242 @@
+"""Incremental re-ranking of stored matches when a job posting is edited."""
+
+import logging
+from types import SimpleNamespace
+from typing import Dict, FrozenSet, List, NamedTuple, Set
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.agents.job_matcher import PROMPT_VERSION, JobMatcherAgent
+from app.core.config import settings
+from app.core.database import async_session
+from app.core.llm import get_model_name
+from app.models.candidate import Candidate, CandidateMatch
+from app.models.job import Job
+from app.models.match_result import MatchResult
+from app.services.match_store import candidate_hash, job_hash, save_matches
+from app.services.ranking import iter_matches
+from app.services.scoring import (
+    EDUCATION_WEIGHT,
+    EXPERIENCE_WEIGHT,
+    SKILL_WEIGHT,
+    education_score,
+    experience_score,
+    skill_score,
+)
+
+logger = logging.getLogger(__name__)
+
+# Job fields whose change only moves one score component. Any other prompt
+# field (title, description) can shift every score and needs the LLM again.
+COMPONENT_FIELDS: Dict[str, str] = {
+    "required_skills": "skill_match",
+    "preferred_skills": "skill_match",
+    "experience_min": "experience_match",
+    "experience_max": "experience_match",
+    "education_level": "education_match",
+}
+FULL_RESCORE_FIELDS: FrozenSet[str] = frozenset({"title", "description"})
+COMPONENT_WEIGHTS: Dict[str, float] = {
+    "skill_match": SKILL_WEIGHT,
+    "experience_match": EXPERIENCE_WEIGHT,
+    "education_match": EDUCATION_WEIGHT,
+}
+
+
+class JobChange(NamedTuple):
+    """What an edit to a job posting invalidates in its stored matches."""
+    fields: Set[str]
+    components: Set[str]
+    full_rescore: bool
+
+
+def snapshot_job(job) -> SimpleNamespace:
+    """Copy the fields of a job that matching depends on, before it is edited."""
+    fields = ["id", *FULL_RESCORE_FIELDS, *COMPONENT_FIELDS]
+    return SimpleNamespace(**{field: getattr(job, field) for field in fields})
+
+
+def classify_job_change(before, after) -> JobChange:
+    """Diff two versions of a job and classify the affected score components.
+
+    Fields outside the matcher prompt (salary, location, ...) affect nothing.
+    """
+    fields = {
+        field for field in [*FULL_RESCORE_FIELDS, *COMPONENT_FIELDS]
+        if getattr(before, field) != getattr(after, field)
+    }
+    return JobChange(
+        fields=fields,
+        components={COMPONENT_FIELDS[f] for f in fields if f in COMPONENT_FIELDS},
+        full_rescore=bool(fields & FULL_RESCORE_FIELDS),
+    )
+
+
+def _clamp(score: float) -> float:
+    return round(min(max(score, 0.0), 100.0), 2)
+
+
+def _component_scores(candidate, job) -> Dict[str, float]:
+    return {
+        "skill_match": skill_score(candidate.skills, job)[0],
+        "experience_match": experience_score(candidate.experience_years, job),
+        "education_match": education_score(candidate.education, job),
+    }
+
+
+def patch_match(
+    match: CandidateMatch, candidate, before, after, components: Set[str]
+) -> CandidateMatch:
+    """Estimate a stored match after a job edit by shifting the affected components.
+
+    Components move by their deterministic delta and the overall score by the
+    same weights the prefilter uses; skill gaps and strengths are updated for
+    added or removed job skills. The result is marked provisional, and its
+    reasoning says so, since the LLM's analysis was of the old posting.
+    """
+    old = _component_scores(candidate, before)
+    new = _component_scores(candidate, after)
+    values = match.model_dump()
+    overall = match.overall_score
+
+    for component in components:
+        updated = _clamp(values[component] + new[component] - old[component])
+        overall += COMPONENT_WEIGHTS[component] * (updated - values[component])
+        values[component] = updated
+
+    if "skill_match" in components:
+        _, old_matched, old_missing = skill_score(candidate.skills, before)
+        _, new_matched, new_missing = skill_score(candidate.skills, after)
+        values["gaps"] = list(dict.fromkeys(
+            [g for g in match.gaps if g not in old_missing] + new_missing
+        ))
+        values["strengths"] = list(dict.fromkeys(
+            [s for s in match.strengths if s not in old_matched] + new_matched
+        ))
+
+    values["overall_score"] = _clamp(overall)
+    values["reasoning"] = (
+        f"Estimated from the previous analysis after the job's "
+        f"{', '.join(sorted(components))} changed."
+    )
+    values["provisional"] = True
+    return CandidateMatch(**values)
+
+
+async def refresh_stored_matches(
+    session: AsyncSession,
+    before,
+    job,
+    change: JobChange,
+    rescore_patched: bool = False,
+) -> List[int]:
+    """Update stored matches for an edited job without calling the LLM.
+
+    On a component-only change, up-to-date rows are replaced with provisional
+    estimates (``patch_match``) and need no LLM call, unless
+    ``rescore_patched`` asks for a fresh analysis of them too. On a full
+    rescore they are deleted. Rows that were already stale are deleted as
+    well, and left for the next ranking. Returns the IDs of candidates to
+    re-score. The caller commits.
+    """
+    if not change.fields:
+        return []
+
+    rows = (await session.execute(
+        select(MatchResult).where(MatchResult.job_id == job.id)
+    )).scalars().all()
+    if not rows:
+        return []
+
+    model_name = get_model_name("matcher")
+    old_hash, new_hash = job_hash(before), job_hash(job)
+    candidates = {
+        c.id: c for c in (await session.execute(
+            select(Candidate).where(Candidate.id.in_([row.candidate_id for row in rows]))
+        )).scalars().all()
+    }
+
+    rescore: List[int] = []
+    for row in rows:
+        candidate = candidates.get(row.candidate_id)
+        current = (
+            candidate is not None
+            and row.job_hash == old_hash
+            and row.candidate_hash == candidate_hash(candidate)
+            and row.model_name == model_name
+            and row.prompt_version == PROMPT_VERSION
+        )
+        if current and not change.full_rescore:
+            match = CandidateMatch(**row.result)
+            row.result = patch_match(match, candidate, before, job, change.components).model_dump()
+            row.job_hash = new_hash
+            if rescore_patched:
+                rescore.append(row.candidate_id)
+            continue
+        if current:
+            rescore.append(row.candidate_id)
+        await session.delete(row)
+    return rescore
+
+
+async def refresh_job_matches(
+    job_id: int,
+    before,
+    change: JobChange,
+    session_factory=async_session,
+) -> None:
+    """Background refresh of an edited job's stored matches.
+
+    Scheduled on job updates with ``rescore_on_job_update``; without it the
+    edit leaves the rows stale and the next ranking re-scores them. The LLM
+    only runs for rows a full rescore dropped, plus the patched ones when
+    ``rescore_patched_matches`` is set.
+    """
+    try:
+        async with session_factory() as session:
+            job = await session.get(Job, job_id)
+            if job is None:
+                return
+            candidate_ids = await refresh_stored_matches(
+                session, before, job, change, settings.rescore_patched_matches
+            )
+            await session.commit()
+    except Exception:
+        logger.exception("Refreshing stored matches failed for job %s", job_id)
+        return
+    if candidate_ids:
+        await rescore_job_matches(job_id, candidate_ids, session_factory)
+
+
+async def rescore_job_matches(
+    job_id: int,
+    candidate_ids: List[int],
+    session_factory=async_session,
+) -> None:
+    """Re-run the LLM for candidates whose stored match an edit invalidated.
+
+    Provisional rows that could not be re-scored are deleted, so the next
+    ranking scores them instead of serving the estimate.
+    """
+    try:
+        async with session_factory() as session:
+            job = await session.get(Job, job_id)
+            if job is None:
+                return
+            candidates = (await session.execute(
+                select(Candidate).where(Candidate.id.in_(candidate_ids))
+            )).scalars().all()
+            scored = []
+            async for outcome in iter_matches(JobMatcherAgent(), [(c, job) for c in candidates]):
+                if outcome.match is not None:
+                    scored.append((outcome.candidate, outcome.job, outcome.match))
+            await save_matches(session, scored)
+            failed = set(candidate_ids) - {candidate.id for candidate, _, _ in scored}
+            if failed:
+                await session.execute(delete(MatchResult).where(
+                    MatchResult.job_id == job_id, MatchResult.candidate_id.in_(failed)
+                ))
+                await session.commit()
+    except Exception:
+        logger.exception("Background rescoring failed for job %s", job_id)
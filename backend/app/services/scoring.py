@@ -0,0 +1,101 @@
+"""Deterministic candidate scoring used before any LLM call."""
+
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from app.models.candidate import CandidateMatch
+from app.tools.resume_tools import degree_level
+from app.tools.skill_taxonomy import canonical_skill_name
+
+SKILL_WEIGHT = 0.6
+EXPERIENCE_WEIGHT = 0.25
+EDUCATION_WEIGHT = 0.15
+PREFERRED_SKILL_WEIGHT = 0.5
+
+DETERMINISTIC_REASONING = "Deterministic prefilter score based on skills, experience and education."
+
+
+def normalize_skill(skill: str) -> str:
+    """Normalize a skill name for comparison, folding aliases like "k8s"."""
+    return canonical_skill_name(skill)
+
+
+def job_skill_weights(job) -> Tuple[Dict[str, float], float]:
+    """Weight each normalized job skill, returning (weights, total weight).
+
+    Required skills weigh 1 and preferred skills PREFERRED_SKILL_WEIGHT; a
+    skill listed as both counts once as required.
+    """
+    weights: Dict[str, float] = {}
+    for skill in job.preferred_skills or []:
+        if normalize_skill(skill):
+            weights[normalize_skill(skill)] = PREFERRED_SKILL_WEIGHT
+    for skill in job.required_skills or []:
+        if normalize_skill(skill):
+            weights[normalize_skill(skill)] = 1.0
+    return weights, sum(weights.values())
+
+
+def skill_score(candidate_skills: Iterable[str], job) -> Tuple[float, List[str], List[str]]:
+    """Score skill overlap, returning (score, matched, missing required)."""
+    have = {normalize_skill(s) for s in candidate_skills or []}
+    weights, total = job_skill_weights(job)
+    if not total:
+        return 100.0, [], []
+
+    required = [s for s in job.required_skills or [] if normalize_skill(s)]
+    preferred = [s for s in job.preferred_skills or [] if normalize_skill(s)]
+    matched = [s for s in required + preferred if normalize_skill(s) in have]
+    missing = [s for s in required if normalize_skill(s) not in have]
+
+    hits = sum(weight for name, weight in weights.items() if name in have)
+    return 100.0 * hits / total, matched, missing
+
+
+def experience_score(years: float, job) -> float:
+    """Score years of experience against the job's range."""
+    years = years or 0
+    minimum = job.experience_min or 0
+    maximum = job.experience_max
+
+    if years < minimum:
+        return 100.0 * years / minimum
+    if maximum is not None and years > maximum:
+        return max(50.0, 100.0 - 10.0 * (years - maximum))
+    return 100.0
+
+
+def education_score(education: Sequence[Any], job) -> float:
+    """Score the candidate's highest degree against the required level."""
+    required = degree_level(job.education_level or "")
+    if not required:
+        return 100.0
+
+    levels = [
+        degree_level(entry.get("degree", "") if isinstance(entry, dict) else str(entry))
+        for entry in education or []
+    ]
+    return 100.0 * min(max(levels, default=0), required) / required
+
+
+def score_candidate(candidate, job) -> CandidateMatch:
+    """Score a candidate against a job without calling the LLM."""
+    skills, matched, missing = skill_score(candidate.skills, job)
+    experience = experience_score(candidate.experience_years, job)
+    education = education_score(candidate.education, job)
+    overall = (
+        SKILL_WEIGHT * skills
+        + EXPERIENCE_WEIGHT * experience
+        + EDUCATION_WEIGHT * education
+    )
+
+    return CandidateMatch(
+        candidate_id=candidate.id,
+        job_id=job.id,
+        overall_score=round(overall, 2),
+        skill_match=round(skills, 2),
+        experience_match=round(experience, 2),
+        education_match=round(education, 2),
+        reasoning=DETERMINISTIC_REASONING,
+        gaps=missing,
+        strengths=matched,
+    )
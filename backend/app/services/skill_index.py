@@ -0,0 +1,171 @@
+"""Inverted index from canonical skills to candidates."""
+
+import logging
+from typing import Dict, Iterable, List
+
+from sqlalchemy import delete, exists, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.candidate import Candidate
+from app.models.skill import CandidateSkill, Skill, SkillAlias
+from app.tools.skill_taxonomy import (
+    canonical_skill_name,
+    get_skill_taxonomy,
+    normalize_skill_text,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def _lookup_aliases(session: AsyncSession, names: Iterable[str]) -> Dict[str, int]:
+    names = list(set(names))
+    if not names:
+        return {}
+    result = await session.execute(
+        select(SkillAlias.alias, SkillAlias.skill_id).where(SkillAlias.alias.in_(names))
+    )
+    return dict(result.all())
+
+
+async def _create_skill(session: AsyncSession, canonical: str, aliases: Iterable[str]) -> int:
+    """Insert a skill and its aliases, tolerating a concurrent insert of the same skill.
+
+    Aliases that already belong to another skill keep pointing there; the
+    new skill is created without them rather than not at all.
+    """
+    try:
+        async with session.begin_nested():
+            skill = Skill(name=canonical)
+            session.add(skill)
+            await session.flush()
+    except IntegrityError:
+        return (await session.execute(
+            select(Skill.id).where(Skill.name == canonical)
+        )).scalar_one()
+
+    wanted = {canonical, *aliases}
+    free = sorted(wanted - set(await _lookup_aliases(session, wanted)))
+    try:
+        async with session.begin_nested():
+            session.add_all(SkillAlias(alias=alias, skill_id=skill.id) for alias in free)
+            await session.flush()
+    except IntegrityError:
+        # Lost a race for some alias; add the rest one by one.
+        for alias in free:
+            try:
+                async with session.begin_nested():
+                    session.add(SkillAlias(alias=alias, skill_id=skill.id))
+                    await session.flush()
+            except IntegrityError:
+                continue
+    if len(free) < len(wanted):
+        logger.debug(
+            "Skill %r shares aliases with other skills: %s", canonical, sorted(wanted - set(free))
+        )
+    return skill.id
+
+
+async def seed_skills(session: AsyncSession) -> None:
+    """Load the skill taxonomy into the skills tables and index unindexed candidates."""
+    existing = set((await session.execute(select(Skill.name))).scalars().all())
+    for canonical, aliases in get_skill_taxonomy().items():
+        canonical = normalize_skill_text(canonical)
+        if canonical not in existing:
+            await _create_skill(
+                session, canonical, [normalize_skill_text(a) for a in aliases]
+            )
+    await session.commit()
+    await backfill_candidate_skills(session)
+
+
+async def backfill_candidate_skills(session: AsyncSession, batch_size: int = 500) -> int:
+    """Index candidates that have skills but no posting list entries.
+
+    Covers candidates stored before the index existed. Returns how many
+    were indexed.
+    """
+    indexed = select(CandidateSkill.candidate_id).where(CandidateSkill.candidate_id == Candidate.id)
+    result = await session.execute(
+        select(Candidate.id).where(~exists(indexed)).order_by(Candidate.id)
+    )
+    ids = list(result.scalars().all())
+    count = 0
+    for start in range(0, len(ids), batch_size):
+        batch = await session.execute(
+            select(Candidate).where(Candidate.id.in_(ids[start:start + batch_size]))
+        )
+        for candidate in batch.scalars().all():
+            if candidate.skills:
+                await index_candidate_skills(session, candidate)
+                count += 1
+        await session.commit()
+    return count
+
+
+async def resolve_skills(
+    session: AsyncSession,
+    names: Iterable[str],
+    create: bool = False,
+) -> Dict[str, int]:
+    """Map skill names to canonical skill IDs.
+
+    Unknown skills are left out unless ``create`` is set, in which case they
+    are added to the dictionary under their canonical name.
+    """
+    normalized = {name: normalize_skill_text(name) for name in names if normalize_skill_text(name)}
+    canonical = {name: canonical_skill_name(name) for name in normalized.values()}
+    ids = await _lookup_aliases(session, [*normalized.values(), *canonical.values()])
+
+    resolved: Dict[str, int] = {}
+    for name, text in normalized.items():
+        skill_id = ids.get(text) or ids.get(canonical[text])
+        if skill_id is None and create:
+            skill_id = await _create_skill(session, canonical[text], [text])
+            ids[text] = ids[canonical[text]] = skill_id
+        if skill_id is not None:
+            resolved[name] = skill_id
+    return resolved
+
+
+async def index_candidate_skills(session: AsyncSession, candidate) -> None:
+    """Rebuild a candidate's posting list entries from ``candidate.skills``.
+
+    The candidate must already have an ID; the caller commits.
+    """
+    skill_ids = set((await resolve_skills(session, candidate.skills or [], create=True)).values())
+    await session.execute(delete(CandidateSkill).where(CandidateSkill.candidate_id == candidate.id))
+    session.add_all(
+        CandidateSkill(candidate_id=candidate.id, skill_id=skill_id) for skill_id in skill_ids
+    )
+
+
+async def remove_candidate_skills(session: AsyncSession, candidate_id: int) -> None:
+    """Drop a candidate from every posting list."""
+    await session.execute(delete(CandidateSkill).where(CandidateSkill.candidate_id == candidate_id))
+
+
+async def find_candidates_with_skills(
+    session: AsyncSession,
+    skills: Iterable[str],
+    match_all: bool = True,
+) -> List[int]:
+    """Return IDs of candidates having all (or any) of the given skills."""
+    skills = [s for s in skills if normalize_skill_text(s)]
+    resolved = await resolve_skills(session, skills)
+    skill_ids = set(resolved.values())
+    wanted = {normalize_skill_text(s) for s in skills}
+    found = {normalize_skill_text(name) for name in resolved}
+    if not skill_ids or (match_all and len(found) < len(wanted)):
+        return []
+
+    query = (
+        select(CandidateSkill.candidate_id)
+        .where(CandidateSkill.skill_id.in_(skill_ids))
+        .group_by(CandidateSkill.candidate_id)
+        .order_by(CandidateSkill.candidate_id)
+    )
+    if match_all:
+        query = query.having(func.count(CandidateSkill.skill_id) == len(skill_ids))
+    result = await session.execute(query)
+    return list(result.scalars().all())
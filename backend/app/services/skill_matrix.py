@@ -0,0 +1,217 @@
+"""Vectorized deterministic scoring over a whole candidate pool."""
+
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import event
+
+from app.models.candidate import Candidate, CandidateMatch
+from app.services.scoring import (
+    DETERMINISTIC_REASONING,
+    EDUCATION_WEIGHT,
+    EXPERIENCE_WEIGHT,
+    SKILL_WEIGHT,
+    job_skill_weights,
+    normalize_skill,
+    skill_score,
+)
+from app.tools.resume_tools import degree_level
+
+
+class PoolScores(NamedTuple):
+    """Per-candidate sub-scores, aligned with the pool order."""
+    overall: np.ndarray
+    skill: np.ndarray
+    experience: np.ndarray
+    education: np.ndarray
+
+
+class CandidatePool:
+    """Candidates laid out as a sparse candidate x skill matrix plus feature vectors.
+
+    The skill matrix is stored in CSR form: the skill ids of candidate ``i``
+    are ``indices[indptr[i]:indptr[i + 1]]``.
+    """
+
+    def __init__(
+        self,
+        candidates: Sequence[Any],
+        vocabulary: Dict[str, int],
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        experience: np.ndarray,
+        education: np.ndarray,
+    ):
+        self.candidates = list(candidates)
+        self.vocabulary = vocabulary
+        self.indptr = indptr
+        self.indices = indices
+        self.experience = experience
+        self.education = education
+
+    @classmethod
+    def from_candidates(cls, candidates: Sequence[Any]) -> "CandidatePool":
+        """Build a pool from Candidate rows or any objects with the same fields.
+
+        Each distinct skill and degree string is normalised once per build.
+        """
+        vocabulary: Dict[str, int] = {}
+        columns: Dict[str, int] = {}  # raw skill string -> column, -1 for none
+        levels: Dict[str, int] = {}
+        indptr = np.zeros(len(candidates) + 1, dtype=np.int64)
+        indices: List[int] = []
+        experience = np.zeros(len(candidates), dtype=np.float64)
+        education = np.zeros(len(candidates), dtype=np.float64)
+
+        def column(skill: str) -> int:
+            name = normalize_skill(skill)
+            return vocabulary.setdefault(name, len(vocabulary)) if name else -1
+
+        def level(entry: Any) -> int:
+            degree = entry.get("degree", "") if isinstance(entry, dict) else str(entry)
+            if degree not in levels:
+                levels[degree] = degree_level(degree)
+            return levels[degree]
+
+        for i, candidate in enumerate(candidates):
+            skill_ids = set()
+            for skill in candidate.skills or []:
+                found = columns.get(skill)
+                if found is None:
+                    found = columns[skill] = column(skill)
+                if found >= 0:
+                    skill_ids.add(found)
+            indices.extend(skill_ids)
+            indptr[i + 1] = len(indices)
+            experience[i] = candidate.experience_years or 0
+            education[i] = max((level(e) for e in candidate.education or []), default=0)
+
+        return cls(
+            candidates,
+            vocabulary,
+            indptr,
+            np.asarray(indices, dtype=np.int64),
+            experience,
+            education,
+        )
+
+    def with_candidates(self, candidates: Sequence[Any]) -> "CandidatePool":
+        """The same pool holding other objects for the same candidates, in order."""
+        return CandidatePool(
+            candidates, self.vocabulary, self.indptr, self.indices, self.experience, self.education
+        )
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def skill_scores(self, job) -> np.ndarray:
+        """Weighted share of the job's skills each candidate has, 0-100."""
+        weights, total = job_skill_weights(job)
+        if not total:
+            return np.full(len(self), 100.0)
+
+        column_weights = np.zeros(len(self.vocabulary))
+        for name, weight in weights.items():
+            column = self.vocabulary.get(name)
+            if column is not None:
+                column_weights[column] = weight
+
+        cumulative = np.concatenate(([0.0], np.cumsum(column_weights[self.indices])))
+        hits = cumulative[self.indptr[1:]] - cumulative[self.indptr[:-1]]
+        return 100.0 * hits / total
+
+    def experience_scores(self, job) -> np.ndarray:
+        """Experience fit against the job's range, 0-100."""
+        years = self.experience
+        minimum = job.experience_min or 0
+        maximum = job.experience_max
+
+        scores = np.full(len(self), 100.0)
+        if minimum > 0:
+            below = years < minimum
+            scores[below] = 100.0 * years[below] / minimum
+        else:
+            below = np.zeros(len(self), dtype=bool)
+        if maximum is not None:
+            above = ~below & (years > maximum)
+            scores[above] = np.maximum(50.0, 100.0 - 10.0 * (years[above] - maximum))
+        return scores
+
+    def education_scores(self, job) -> np.ndarray:
+        """Highest degree against the required level, 0-100."""
+        required = degree_level(job.education_level or "")
+        if not required:
+            return np.full(len(self), 100.0)
+        return 100.0 * np.minimum(self.education, required) / required
+
+    def score(self, job) -> PoolScores:
+        """Score every candidate in the pool against a job."""
+        skill = self.skill_scores(job)
+        experience = self.experience_scores(job)
+        education = self.education_scores(job)
+        overall = (
+            SKILL_WEIGHT * skill
+            + EXPERIENCE_WEIGHT * experience
+            + EDUCATION_WEIGHT * education
+        )
+        return PoolScores(overall, skill, experience, education)
+
+    def top_n(self, scores: PoolScores, n: int) -> np.ndarray:
+        """Indices of the ``n`` best candidates, highest score first."""
+        n = min(max(n, 0), len(self))
+        if n == 0:
+            return np.zeros(0, dtype=np.int64)
+        keys = -scores.overall
+        if n < len(self):
+            candidates = np.argpartition(keys, n - 1)[:n]
+            return candidates[np.argsort(keys[candidates], kind="stable")]
+        return np.argsort(keys, kind="stable")
+
+    def to_match(self, index: int, job, scores: PoolScores) -> CandidateMatch:
+        """Build a CandidateMatch for one pool row."""
+        candidate = self.candidates[index]
+        _, matched, missing = skill_score(candidate.skills, job)
+
+        return CandidateMatch(
+            candidate_id=candidate.id,
+            job_id=job.id,
+            overall_score=round(float(scores.overall[index]), 2),
+            skill_match=round(float(scores.skill[index]), 2),
+            experience_match=round(float(scores.experience[index]), 2),
+            education_match=round(float(scores.education[index]), 2),
+            reasoning=DETERMINISTIC_REASONING,
+            gaps=missing,
+            strengths=matched,
+        )
+
+
+_cached_pool: Optional[Tuple[Tuple[Any, ...], CandidatePool]] = None
+_generation = 0
+
+
+@event.listens_for(Candidate, "after_insert")
+@event.listens_for(Candidate, "after_update")
+@event.listens_for(Candidate, "after_delete")
+def _candidate_changed(mapper, connection, target) -> None:
+    global _generation
+    _generation += 1
+
+
+def candidate_pool(candidates: Sequence[Any]) -> CandidatePool:
+    """A pool for ``candidates``, reused across rankings while they are unchanged.
+
+    The last pool built is kept, keyed on every candidate's id and
+    ``updated_at`` and dropped on any candidate write in this process.
+    The reused pool takes the given objects, so only their order and
+    versions have to match. Objects without ``updated_at`` are not cached.
+    """
+    global _cached_pool
+    key: Optional[Tuple[Any, ...]] = None
+    if all(getattr(c, "updated_at", None) is not None for c in candidates):
+        key = (_generation, tuple((c.id, c.updated_at) for c in candidates))
+    if key is not None and _cached_pool is not None and _cached_pool[0] == key:
+        return _cached_pool[1].with_candidates(candidates)
+    pool = CandidatePool.from_candidates(candidates)
+    if key is not None:
+        _cached_pool = (key, pool)
+    return pool
@@ -0,0 +1,179 @@
+"""Resume uploads, spooled to disk past a size threshold.
+
+Uploads are read in chunks and hashed as they are copied. Small files stay
+in memory; larger ones are written to a temporary file and handed to the
+extractors by path, so a worker holds at most ``settings.upload_spool_bytes``
+of any upload in memory regardless of its size.
+"""
+
+import asyncio
+import hashlib
+import io
+import os
+import tempfile
+import zipfile
+from typing import IO, Iterable, List, NamedTuple, Optional, Sequence, Union
+
+from fastapi import UploadFile
+
+from app.core.config import settings
+
+CHUNK_SIZE = 64 * 1024
+
+ResumeSource = Union[bytes, str]
+"""Resume file content in memory, or the path of a spooled temporary file."""
+
+
+class UploadTooLarge(Exception):
+    """An upload exceeded ``settings.upload_max_bytes``."""
+
+
+class SpooledResume(NamedTuple):
+    """An uploaded resume, in memory or on disk."""
+    filename: str
+    source: ResumeSource
+    digest: str
+    size: int
+
+
+class _Spool:
+    """Accumulates chunks in memory, moving them to a temp file once past the threshold."""
+
+    def __init__(self, filename: str, max_bytes: int):
+        self.filename = filename
+        self.max_bytes = max_bytes
+        self.hasher = hashlib.sha256()
+        self.buffer = bytearray()
+        self.file: Optional[IO[bytes]] = None
+        self.size = 0
+
+    def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.max_bytes > 0 and self.size > self.max_bytes:
+            self.discard()
+            raise UploadTooLarge(f"{self.filename} is larger than {self.max_bytes} bytes")
+        self.hasher.update(chunk)
+        if self.file is None and len(self.buffer) + len(chunk) > settings.upload_spool_bytes:
+            _, ext = os.path.splitext(self.filename)
+            self.file = tempfile.NamedTemporaryFile(prefix="resume-", suffix=ext, delete=False)
+            self.file.write(self.buffer)
+            self.buffer = bytearray()
+        if self.file is None:
+            self.buffer += chunk
+        else:
+            self.file.write(chunk)
+
+    def discard(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            os.unlink(self.file.name)
+            self.file = None
+
+    def finish(self) -> SpooledResume:
+        if self.file is None:
+            source: ResumeSource = bytes(self.buffer)
+        else:
+            self.file.close()
+            source = self.file.name
+        return SpooledResume(self.filename, source, self.hasher.hexdigest(), self.size)
+
+
+async def spool_upload(file: UploadFile, max_bytes: Optional[int] = None) -> SpooledResume:
+    """Copy an upload to a resume spool, rejecting it once it passes ``max_bytes``.
+
+    Starlette has already received the whole body into ``file.file`` when
+    the form was parsed, so ``max_bytes`` bounds what is kept rather than
+    what is received; only ``UploadSizeLimitMiddleware`` refuses a request
+    before reading it, from its Content-Length. The copy is still needed, as
+    extraction workers and background ingestion read spooled resumes by path
+    after the request has closed its upload. ``file.file`` is read in place,
+    in one worker thread.
+    """
+    filename = file.filename or "resume"
+    limit = settings.upload_max_bytes if max_bytes is None else max_bytes
+    if limit > 0 and file.size is not None and file.size > limit:
+        raise UploadTooLarge(f"{filename} is larger than {limit} bytes")
+    file.file.seek(0)
+    copy = asyncio.ensure_future(asyncio.to_thread(spool_stream, filename, file.file, limit))
+    try:
+        return await asyncio.shield(copy)
+    except asyncio.CancelledError:
+        copy.add_done_callback(_discard_abandoned)
+        raise
+
+
+def _discard_abandoned(copy: "asyncio.Future[SpooledResume]") -> None:
+    if not copy.cancelled() and copy.exception() is None:
+        discard_source(copy.result().source)
+
+
+def spool_stream(
+    filename: str, stream: IO[bytes], max_bytes: Optional[int] = None
+) -> SpooledResume:
+    """Copy a file object, such as an upload or a zip member, to a resume spool."""
+    spool = _Spool(filename, settings.upload_max_bytes if max_bytes is None else max_bytes)
+    try:
+        for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+            spool.write(chunk)
+    except BaseException:
+        spool.discard()
+        raise
+    return spool.finish()
+
+
+def open_source(source: ResumeSource) -> IO[bytes]:
+    """Open resume content as a binary file object."""
+    return open(source, "rb") if isinstance(source, str) else io.BytesIO(source)
+
+
+def read_source(source: ResumeSource) -> bytes:
+    """Load resume content into memory."""
+    with open_source(source) as f:
+        return f.read()
+
+
+def expand_archives(resumes: Sequence[SpooledResume]) -> List[SpooledResume]:
+    """Replace zip archives with the resumes inside them, spooling each member.
+
+    Members are subject to the same size limit as direct uploads. Archives
+    are removed once expanded, and on error every spooled file is removed.
+    """
+    expanded: List[SpooledResume] = []
+    try:
+        for resume in resumes:
+            if not resume.filename.lower().endswith(".zip"):
+                expanded.append(resume)
+                continue
+            with open_source(resume.source) as f, zipfile.ZipFile(f) as archive:
+                for info in archive.infolist():
+                    name = os.path.basename(info.filename)
+                    hidden = not name or name.startswith(".") or "__MACOSX" in info.filename
+                    if info.is_dir() or hidden:
+                        continue
+                    if len(expanded) >= settings.ingestion_max_files:
+                        raise ValueError(f"At most {settings.ingestion_max_files} files per batch")
+                    with archive.open(info) as member:
+                        expanded.append(spool_stream(name, member))
+            discard([resume])
+    except Exception:
+        discard([*resumes, *expanded])
+        raise
+    if len(expanded) > settings.ingestion_max_files:
+        discard(expanded)
+        raise ValueError(f"At most {settings.ingestion_max_files} files per batch")
+    return expanded
+
+
+def discard_source(source: ResumeSource) -> None:
+    """Delete the temporary file behind a resume source, if it has one."""
+    if isinstance(source, str):
+        try:
+            os.unlink(source)
+        except FileNotFoundError:
+            pass
+
+
+def discard(resumes: Iterable[SpooledResume]) -> None:
+    """Delete the temporary files of spooled resumes."""
+    for resume in resumes:
+        discard_source(resume.source)
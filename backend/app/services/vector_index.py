@@ -0,0 +1,204 @@
+"""ChromaDB-backed semantic index of candidates and jobs."""
+
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import async_session
+from app.core.llm import get_embedding_model
+from app.models.candidate import Candidate
+
+logger = logging.getLogger(__name__)
+
+CANDIDATE_COLLECTION = "candidates"
+JOB_COLLECTION = "jobs"
+
+
+@lru_cache()
+def get_vector_client():
+    """Get the persistent Chroma client."""
+    import chromadb
+    return chromadb.PersistentClient(path=settings.chroma_persist_dir)
+
+
+def _collection(name: str):
+    return get_vector_client().get_or_create_collection(
+        name, metadata={"hnsw:space": "cosine"}
+    )
+
+
+def candidate_document(candidate) -> str:
+    """Text embedded for a candidate: the resume, or a profile summary."""
+    if candidate.resume_text:
+        return candidate.resume_text
+    parts = [
+        candidate.name,
+        "Skills: " + ", ".join(candidate.skills or []),
+        "Work History: " + str(candidate.work_history or []),
+        "Education: " + str(candidate.education or []),
+    ]
+    return "\n".join(parts)
+
+
+def job_document(job) -> str:
+    """Text embedded for a job posting."""
+    return "\n".join([
+        job.title,
+        job.description,
+        "Required Skills: " + ", ".join(job.required_skills or []),
+        "Preferred Skills: " + ", ".join(job.preferred_skills or []),
+    ])
+
+
+async def index_candidate(candidate) -> None:
+    """Embed a candidate and upsert it into the candidate collection."""
+    await index_candidates([candidate])
+
+
+async def index_candidates(candidates: Sequence[Any]) -> None:
+    """Embed candidates in one call and upsert them into the candidate collection."""
+    if not candidates:
+        return
+    documents = [candidate_document(candidate) for candidate in candidates]
+    embeddings = await get_embedding_model().aembed_documents(documents)
+    await asyncio.to_thread(
+        _collection(CANDIDATE_COLLECTION).upsert,
+        ids=[str(candidate.id) for candidate in candidates],
+        embeddings=embeddings,
+        documents=documents,
+        metadatas=[
+            {
+                "status": candidate.status or "new",
+                "experience_years": candidate.experience_years or 0,
+            }
+            for candidate in candidates
+        ],
+    )
+
+
+async def indexed_candidate_ids() -> Set[int]:
+    """IDs of the candidates in the index."""
+    stored = await asyncio.to_thread(_collection(CANDIDATE_COLLECTION).get, include=[])
+    return {int(candidate_id) for candidate_id in stored["ids"]}
+
+
+async def unindexed_candidate_ids(session: AsyncSession) -> List[int]:
+    """IDs of stored candidates missing from the index.
+
+    The index is only listed when it holds fewer entries than there are
+    candidates, so a complete index costs two counts.
+    """
+    total = await session.scalar(select(func.count(Candidate.id))) or 0
+    size = await asyncio.to_thread(_collection(CANDIDATE_COLLECTION).count)
+    if size >= total:
+        return []
+    indexed = await indexed_candidate_ids()
+    ids = await session.scalars(select(Candidate.id).order_by(Candidate.id))
+    return [candidate_id for candidate_id in ids.all() if candidate_id not in indexed]
+
+
+async def backfill_candidate_index(session_factory=async_session, batch_size: int = 100) -> int:
+    """Index stored candidates the index is missing; returns how many were added.
+
+    Covers candidates created before the index was enabled or whose
+    background indexing failed.
+    """
+    async with session_factory() as session:
+        missing = await unindexed_candidate_ids(session)
+        for start in range(0, len(missing), batch_size):
+            batch = await session.scalars(
+                select(Candidate).where(Candidate.id.in_(missing[start:start + batch_size]))
+            )
+            await index_candidates(list(batch.all()))
+    if missing:
+        logger.info("Added %d candidates to the semantic index", len(missing))
+    return len(missing)
+
+
+async def index_job(job) -> None:
+    """Embed a job posting and upsert it into the job collection."""
+    document = job_document(job)
+    [embedding] = await get_embedding_model().aembed_documents([document])
+    await asyncio.to_thread(
+        _collection(JOB_COLLECTION).upsert,
+        ids=[str(job.id)],
+        embeddings=[embedding],
+        documents=[document],
+        metadatas=[{"status": job.status or "open"}],
+    )
+
+
+async def remove_candidate(candidate_id: int) -> None:
+    """Remove a candidate from the index."""
+    await asyncio.to_thread(_collection(CANDIDATE_COLLECTION).delete, ids=[str(candidate_id)])
+
+
+async def remove_job(job_id: int) -> None:
+    """Remove a job from the index."""
+    await asyncio.to_thread(_collection(JOB_COLLECTION).delete, ids=[str(job_id)])
+
+
+async def _job_embedding(job) -> List[float]:
+    stored = await asyncio.to_thread(
+        _collection(JOB_COLLECTION).get, ids=[str(job.id)], include=["embeddings"]
+    )
+    embeddings = stored.get("embeddings")
+    if embeddings is not None and len(embeddings):
+        return list(embeddings[0])
+    return await get_embedding_model().aembed_query(job_document(job))
+
+
+def _candidate_filter(
+    status: Optional[str],
+    min_experience: Optional[int],
+    max_experience: Optional[int],
+) -> Optional[Dict[str, Any]]:
+    conditions: List[Dict[str, Any]] = []
+    if status:
+        conditions.append({"status": status})
+    if min_experience is not None:
+        conditions.append({"experience_years": {"$gte": min_experience}})
+    if max_experience is not None:
+        conditions.append({"experience_years": {"$lte": max_experience}})
+    if not conditions:
+        return None
+    if len(conditions) == 1:
+        return conditions[0]
+    return {"$and": conditions}
+
+
+async def nearest_candidates(
+    job,
+    k: int,
+    status: Optional[str] = None,
+    min_experience: Optional[int] = None,
+    max_experience: Optional[int] = None,
+) -> List[Tuple[int, float]]:
+    """Return (candidate_id, cosine distance) for the k nearest candidates to a job."""
+    if k <= 0:
+        return []
+    embedding = await _job_embedding(job)
+    result = await asyncio.to_thread(
+        _collection(CANDIDATE_COLLECTION).query,
+        query_embeddings=[embedding],
+        n_results=k,
+        where=_candidate_filter(status, min_experience, max_experience),
+        include=["distances"],
+    )
+    return [
+        (int(candidate_id), float(distance))
+        for candidate_id, distance in zip(result["ids"][0], result["distances"][0])
+    ]
+
+
+async def run_index_task(func, *args) -> None:
+    """Run an indexing call in the background, logging instead of raising."""
+    try:
+        await func(*args)
+    except Exception:
+        logger.exception("Semantic index update failed: %s", func.__name__)
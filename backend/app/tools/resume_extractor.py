@@ -0,0 +1,165 @@
+"""Deterministic resume field extraction with compiled patterns."""
+
+import re
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from app.tools.resume_sections import split_sections
+from app.tools.resume_tools import degree_level
+from app.tools.skill_matcher import get_skill_matcher
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[a-zA-Z]{2,}")
+PHONE_RE = re.compile(r"(?<![\w+])\+?\d[\d\s().-]{7,}\d(?!\w)")
+NAME_RE = re.compile(r"^[A-Z][a-zA-Z'.-]*(?: [A-Z][a-zA-Z'.-]*){1,3}$")
+TITLE_LINES = {"curriculum vitae", "resume", "résumé", "cv"}
+# Date ranges in these sections are degrees, projects or grants, not jobs.
+NON_WORK_SECTIONS = {
+    "education", "publications", "projects", "certifications", "awards", "interests", "references",
+}
+
+_MONTHS = {
+    m: i for i, m in enumerate(
+        ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], 1
+    )
+}
+_DATE = (
+    r"(?:(?P<{p}m>" + "|".join(_MONTHS) + r")[a-z]*\.?\s+|(?P<{p}n>\d{{1,2}})/)?"
+    r"(?P<{p}y>(?:19|20)\d{{2}})"
+)
+DATE_RANGE_RE = re.compile(
+    _DATE.format(p="s")
+    + r"\s*(?:-|–|—|to)\s*"
+    + r"(?:(?P<present>present|current|now)|" + _DATE.format(p="e") + ")",
+    re.IGNORECASE,
+)
+
+DEGREE_RE = re.compile(
+    r"\b(ph\.?\s?d\.?|doctorate|master(?:'?s)?|m\.sc\.?|msc|m\.s\.|mba|"
+    r"bachelor(?:'?s)?|b\.sc\.?|bsc|b\.s\.|b\.a\.|associate(?:'?s)?|diploma)(?!\w)",
+    re.IGNORECASE,
+)
+
+
+def extract_skills(text: str) -> List[str]:
+    """Find taxonomy skills in text, as canonical names in order of appearance."""
+    return get_skill_matcher().extract(text)
+
+
+def extract_contact(text: str) -> Dict[str, str]:
+    """Find the first email address and phone number."""
+    contact = {}
+    email = EMAIL_RE.search(text)
+    if email:
+        contact["email"] = email.group(0)
+    phone = PHONE_RE.search(text)
+    if phone and sum(c.isdigit() for c in phone.group(0)) >= 10:
+        contact["phone"] = phone.group(0).strip()
+    return contact
+
+
+def extract_name(text: str) -> Optional[str]:
+    """Take the first line as the name if it looks like one, skipping a title line."""
+    for line in text.splitlines():
+        line = line.strip()
+        if line and line.lower().rstrip(":.") not in TITLE_LINES:
+            return line if NAME_RE.match(line) else None
+    return None
+
+
+def _degree_keyword(token: str) -> str:
+    """Map a matched degree token ("M.Sc.", "Bachelor's") to a DEGREE_LEVELS key."""
+    token = re.sub(r"[^a-z]", "", token.lower())
+    if token.startswith("ph"):
+        return "phd"
+    if token in ("msc", "ms"):
+        return "master"
+    if token in ("bsc", "bs", "ba"):
+        return "bachelor"
+    return token
+
+
+def extract_education(text: str) -> List[Dict[str, Any]]:
+    """Collect lines that name a degree, highest level first."""
+    entries: List[Dict[str, Any]] = []
+    for line in text.splitlines():
+        match = DEGREE_RE.search(line)
+        if not match:
+            continue
+        years = re.findall(r"\b(?:19|20)\d{2}\b", line)
+        entries.append({
+            "degree": line.strip(),
+            "year": int(years[-1]) if years else None,
+            "level": degree_level(_degree_keyword(match.group(1))),
+        })
+    entries.sort(key=lambda e: e["level"], reverse=True)
+    return entries
+
+
+def _month_index(match: "re.Match[str]", prefix: str, end: bool) -> int:
+    year = int(match.group(f"{prefix}y"))
+    name, number = match.group(f"{prefix}m"), match.group(f"{prefix}n")
+    if name:
+        month = _MONTHS[name[:3].lower()]
+    elif number:
+        month = int(number)
+    else:
+        month = 12 if end else 1
+    return year * 12 + month - 1
+
+
+def _work_text(text: str) -> str:
+    """The experience sections, or without headings for them, all but the non-work sections."""
+    sections = split_sections(text)
+    work = [s.text for s in sections if s.name == "experience"]
+    if not work:
+        work = [s.text for s in sections if s.name not in NON_WORK_SECTIONS]
+    return "\n".join(work)
+
+
+def extract_experience_years(text: str, today: Optional[date] = None) -> Optional[int]:
+    """Total years covered by the date ranges of work history, overlaps merged."""
+    today = today or date.today()
+    spans = []
+    for match in DATE_RANGE_RE.finditer(_work_text(text)):
+        start = _month_index(match, "s", end=False)
+        if match.group("present"):
+            end = today.year * 12 + today.month - 1
+        else:
+            end = _month_index(match, "e", end=True)
+        if end >= start:
+            spans.append((start, end + 1))
+    if not spans:
+        return None
+
+    spans.sort()
+    months = 0
+    current_start, current_end = spans[0]
+    for start, end in spans[1:]:
+        if start > current_end:
+            months += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    months += current_end - current_start
+    return months // 12
+
+
+def pre_extract(text: str) -> Dict[str, Any]:
+    """Extract the ParsedResume fields that patterns can find reliably.
+
+    Only fields that were actually found are returned.
+    """
+    fields: Dict[str, Any] = dict(extract_contact(text))
+    name = extract_name(text)
+    if name:
+        fields["name"] = name
+    skills = extract_skills(text)
+    if skills:
+        fields["skills"] = skills
+    education = extract_education(text)
+    if education:
+        fields["education"] = education
+    years = extract_experience_years(text)
+    if years is not None:
+        fields["experience_years"] = years
+    return fields
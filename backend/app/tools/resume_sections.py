@@ -0,0 +1,174 @@
+"""Resume sectioning and token-budgeted trimming before the parse prompt."""
+
+import re
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple
+
+SECTION_HEADINGS: Dict[str, List[str]] = {
+    "summary": ["summary", "professional summary", "profile", "objective", "about me", "about"],
+    "experience": [
+        "experience", "work experience", "professional experience", "employment",
+        "employment history", "work history", "career history",
+    ],
+    "education": ["education", "academic background", "qualifications"],
+    "skills": ["skills", "technical skills", "core competencies", "competencies", "technologies"],
+    "publications": [
+        "publications", "selected publications", "papers", "conference papers",
+        "presentations", "talks", "patents",
+    ],
+    "projects": ["projects", "selected projects", "research projects"],
+    "certifications": ["certifications", "certificates", "licenses"],
+    "awards": ["awards", "honors", "honours", "grants", "awards and honors"],
+    "interests": ["interests", "hobbies", "activities"],
+    "references": ["references", "referees"],
+}
+
+# Applied in order until the resume fits: lowest-value content goes first.
+TRIM_STEPS: List[Tuple[str, str]] = [
+    ("references", "drop"),
+    ("interests", "drop"),
+    ("publications", "compress"),
+    ("awards", "compress"),
+    ("projects", "compress"),
+    ("certifications", "compress"),
+    ("publications", "drop"),
+    ("awards", "drop"),
+    ("projects", "drop"),
+    ("summary", "compress"),
+    ("education", "compress"),
+    ("experience", "truncate"),
+    ("skills", "truncate"),
+    ("certifications", "drop"),
+    ("summary", "drop"),
+]
+COMPRESS_LINES = 6
+
+_HEADING_RE = re.compile(
+    r"^\s*(" + "|".join(
+        re.escape(h) for h in sorted(
+            (h for hs in SECTION_HEADINGS.values() for h in hs), key=len, reverse=True
+        )
+    ) + r")\s*:?\s*$",
+    re.IGNORECASE,
+)
+_SECTION_OF = {h: name for name, hs in SECTION_HEADINGS.items() for h in hs}
+
+
+class Section(NamedTuple):
+    """A named block of resume text, heading included."""
+    name: str
+    text: str
+
+
+def split_sections(text: str) -> List[Section]:
+    """Split resume text at recognised headings; text before the first is ``contact``."""
+    sections: List[Section] = []
+    name = "contact"
+    lines: List[str] = []
+    for line in text.splitlines():
+        match = _HEADING_RE.match(line)
+        if match:
+            if lines:
+                sections.append(Section(name, "\n".join(lines)))
+            name, lines = _SECTION_OF[match.group(1).lower()], []
+        lines.append(line)
+    if lines:
+        sections.append(Section(name, "\n".join(lines)))
+    return sections
+
+
+def _keep_words(line: str, max_tokens: int, count_tokens: Callable[[str], int]) -> str:
+    """Keep the leading whole words of ``line`` that fit in ``max_tokens``."""
+    ends = [m.end() for m in re.finditer(r"\S+", line)]
+    low, high = 0, len(ends)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if count_tokens(line[:ends[mid - 1]] + "\n") <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    return line[:ends[low - 1]] if low else ""
+
+
+def _keep_lines(text: str, max_tokens: int, count_tokens: Callable[[str], int]) -> str:
+    """Keep leading lines of ``text`` while they fit in ``max_tokens``.
+
+    The first line that does not fit keeps the whole words that do, so a
+    section written as one long paragraph is cut short rather than emptied.
+    """
+    kept, used = [], 0
+    for line in text.splitlines():
+        cost = count_tokens(line + "\n")
+        if used + cost > max_tokens:
+            partial = _keep_words(line, max_tokens - used, count_tokens)
+            if partial:
+                kept.append(partial)
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept)
+
+
+def _compress(text: str) -> str:
+    lines = [line for line in text.splitlines() if line.strip()]
+    if len(lines) <= COMPRESS_LINES + 1:
+        return text
+    omitted = len(lines) - COMPRESS_LINES - 1
+    return "\n".join(lines[:COMPRESS_LINES + 1] + [f"[{omitted} more lines omitted]"])
+
+
+def fit_to_budget(
+    text: str,
+    budget: int,
+    count_tokens: Callable[[str], int],
+) -> Tuple[str, Dict[str, Any]]:
+    """Trim resume text to ``budget`` tokens, section by section.
+
+    Returns the text to send and a report of the sections found and every
+    drop, compress or truncate decision taken.
+    """
+    sections = split_sections(text)
+    report: Dict[str, Any] = {
+        "budget": budget,
+        "tokens_before": count_tokens(text),
+        "sections": [s.name for s in sections],
+        "actions": [],
+    }
+    if report["tokens_before"] <= budget:
+        report["tokens_after"] = report["tokens_before"]
+        return text, report
+
+    tokens = [count_tokens(s.text) for s in sections]
+
+    def record(i: int, action: str, new_text: str) -> None:
+        before = tokens[i]
+        sections[i] = sections[i]._replace(text=new_text)
+        tokens[i] = count_tokens(new_text) if new_text else 0
+        report["actions"].append({
+            "section": sections[i].name,
+            "action": action,
+            "tokens_before": before,
+            "tokens_after": tokens[i],
+        })
+
+    for name, action in TRIM_STEPS:
+        for i, section in enumerate(sections):
+            if sum(tokens) <= budget:
+                break
+            if section.name != name or not section.text:
+                continue
+            if action == "drop":
+                record(i, "dropped", "")
+            elif action == "compress":
+                compressed = _compress(section.text)
+                if compressed != section.text:
+                    record(i, "compressed", compressed)
+            else:
+                allowed = max(budget - (sum(tokens) - tokens[i]), 0)
+                record(i, "truncated", _keep_lines(section.text, allowed, count_tokens))
+
+    fitted = "\n".join(s.text for s in sections if s.text)
+    if count_tokens(fitted) > budget:
+        fitted = _keep_lines(fitted, budget, count_tokens)
+        report["actions"].append({"section": "all", "action": "truncated"})
+    report["tokens_after"] = count_tokens(fitted)
+    return fitted, report
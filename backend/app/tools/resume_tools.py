@@ -3,6 +3,23 @@
 from typing import List, Dict, Any
 from langchain_core.tools import tool
 
+DEGREE_LEVELS = {
+    "phd": 5, "doctorate": 5,
+    "master": 4, "mba": 4,
+    "bachelor": 3,
+    "associate": 2,
+    "diploma": 1, "certificate": 1,
+}
+
+
+def degree_level(degree: str) -> int:
+    """Map a free-text degree or education requirement to a numeric level."""
+    degree = (degree or "").lower()
+    for key, value in DEGREE_LEVELS.items():
+        if key in degree:
+            return value
+    return 0
+
 
 @tool
 def extract_skills_tool(text: str) -> List[str]:
@@ -14,19 +31,9 @@ def extract_skills_tool(text: str) -> List[str]:
     Returns:
         List of extracted skills
     """
-    common_skills = [
-        "python", "javascript", "typescript", "java", "c++", "c#", "go", "rust",
-        "react", "angular", "vue", "node.js", "django", "flask", "fastapi",
-        "aws", "azure", "gcp", "docker", "kubernetes", "terraform",
-        "sql", "postgresql", "mysql", "mongodb", "redis",
-        "git", "ci/cd", "agile", "scrum",
-        "machine learning", "deep learning", "nlp", "computer vision",
-        "data analysis", "data science", "statistics",
-    ]
+    from app.tools.resume_extractor import extract_skills
 
-    text_lower = text.lower()
-    found_skills = [skill for skill in common_skills if skill in text_lower]
-    return found_skills
+    return extract_skills(text)
 
 
 @tool
@@ -57,22 +64,9 @@ def normalize_education_tool(education_entries: List[Dict[str, Any]]) -> List[Di
     Returns:
         Normalized education entries
     """
-    degree_levels = {
-        "phd": 5, "doctorate": 5,
-        "master": 4, "mba": 4,
-        "bachelor": 3,
-        "associate": 2,
-        "diploma": 1, "certificate": 1,
-    }
-
     normalized = []
     for entry in education_entries:
-        degree = entry.get("degree", "").lower()
-        level = 0
-        for key, value in degree_levels.items():
-            if key in degree:
-                level = value
-                break
+        level = degree_level(entry.get("degree", ""))
 
         normalized.append({
             "degree": entry.get("degree", "Unknown"),
@@ -0,0 +1,134 @@
+"""Multi-pattern skill matching over the skill taxonomy (Aho-Corasick)."""
+
+from functools import lru_cache
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from app.tools.skill_taxonomy import get_skill_taxonomy, normalize_skill_text
+
+# Characters that continue a token, so "go" does not match in "go-to" or "c++" in "c+++".
+_WORD_EXTRA_BEFORE = ".+#-"
+_WORD_EXTRA_AFTER = "+#-"
+
+
+class SkillMatch(NamedTuple):
+    """A skill found in text: its canonical name and the span it matched."""
+    skill: str
+    start: int
+    end: int
+
+
+def _is_word(char: str, extra: str) -> bool:
+    return char.isalnum() or char == "_" or char in extra
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton built once from canonical skills and their aliases.
+
+    Text is scanned in a single pass, lowercased and with whitespace runs
+    collapsed as in ``normalize_skill_text``, so "Machine\\n  Learning" is
+    found; spans refer to the original text.
+    """
+
+    def __init__(self, taxonomy: Dict[str, List[str]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Optional[Tuple[str, int]]] = [None]
+        self._link: List[int] = [0]
+        for name, aliases in taxonomy.items():
+            canonical = normalize_skill_text(name)
+            for term in [name, *aliases]:
+                self._add(normalize_skill_text(term), canonical)
+        self._build_links()
+
+    def __len__(self) -> int:
+        return sum(1 for output in self._output if output)
+
+    def _add(self, term: str, canonical: str) -> None:
+        if not term:
+            return
+        node = 0
+        for char in term:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(None)
+                self._link.append(0)
+            node = nxt
+        if self._output[node] is None:  # first canonical name claiming a term keeps it
+            self._output[node] = (canonical, len(term))
+
+    def _build_links(self) -> None:
+        """Breadth-first: failure links, then links to the nearest node with a match."""
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for char, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._fail[child] = self._goto[fail].get(char, 0)
+                self._link[child] = fail if self._output[fail] else self._link[fail]
+                queue.append(child)
+
+    def _scan(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """Yield (start, end, canonical) for every term occurrence, overlaps included."""
+        goto, fail, output, link = self._goto, self._fail, self._output, self._link
+        positions: List[int] = []
+        state, previous_space = 0, True
+        for index, char in enumerate(text):
+            if char.isspace():
+                if previous_space:
+                    continue
+                lowered, previous_space = " ", True
+            else:
+                lowered, previous_space = char.lower(), False
+            for fed in lowered:
+                positions.append(index)
+                while state and fed not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(fed, 0)
+                node = state if output[state] else link[state]
+                while node:
+                    hit = output[node]
+                    if hit is not None:  # always, for the nodes links lead to
+                        canonical, length = hit
+                        yield positions[len(positions) - length], index + 1, canonical
+                    node = link[node]
+
+    def _bounded(self, text: str, start: int, end: int) -> bool:
+        if start > 0 and _is_word(text[start - 1], _WORD_EXTRA_BEFORE):
+            return False
+        if end < len(text):
+            after = text[end]
+            if _is_word(after, _WORD_EXTRA_AFTER):
+                return False
+            if after == "." and end + 1 < len(text) and _is_word(text[end + 1], ""):
+                return False
+        return True
+
+    def find(self, text: str) -> List[SkillMatch]:
+        """Non-overlapping whole-word skill matches, leftmost and then longest first."""
+        candidates = sorted(
+            (start, -end, canonical)
+            for start, end, canonical in self._scan(text)
+            if self._bounded(text, start, end)
+        )
+        matches: List[SkillMatch] = []
+        covered = 0
+        for start, negative_end, canonical in candidates:
+            if start >= covered:
+                matches.append(SkillMatch(canonical, start, -negative_end))
+                covered = -negative_end
+        return matches
+
+    def extract(self, text: str) -> List[str]:
+        """Canonical names of the skills in text, in order of first appearance."""
+        return list(dict.fromkeys(match.skill for match in self.find(text)))
+
+
+@lru_cache()
+def get_skill_matcher() -> SkillMatcher:
+    """Get the matcher for the configured skill taxonomy, built on first use."""
+    return SkillMatcher(get_skill_taxonomy())
@@ -0,0 +1,92 @@
+"""Canonical skill names and their common aliases."""
+
+import json
+from functools import lru_cache
+from typing import Dict, List
+
+from app.core.config import settings
+
+DEFAULT_SKILL_ALIASES: Dict[str, List[str]] = {
+    "python": ["py", "python3"],
+    "javascript": ["js", "ecmascript"],
+    "typescript": ["ts"],
+    "java": [],
+    "c++": ["cpp"],
+    "c#": ["csharp", "c sharp"],
+    "go": ["golang"],
+    "rust": [],
+    "react": ["reactjs", "react.js"],
+    "angular": ["angularjs", "angular.js"],
+    "vue": ["vuejs", "vue.js"],
+    "node.js": ["node", "nodejs", "node js"],
+    "django": [],
+    "flask": [],
+    "fastapi": ["fast api"],
+    "aws": ["amazon web services"],
+    "azure": ["microsoft azure"],
+    "gcp": ["google cloud", "google cloud platform"],
+    "docker": [],
+    "kubernetes": ["k8s", "kube"],
+    "terraform": [],
+    "sql": [],
+    "postgresql": ["postgres", "psql"],
+    "mysql": [],
+    "mongodb": ["mongo"],
+    "redis": [],
+    "git": [],
+    "ci/cd": ["cicd", "ci cd", "continuous integration"],
+    "agile": [],
+    "scrum": [],
+    "machine learning": ["ml"],
+    "deep learning": [],
+    "nlp": ["natural language processing"],
+    "computer vision": [],
+    "data analysis": [],
+    "data science": [],
+    "statistics": [],
+}
+
+
+def normalize_skill_text(skill: str) -> str:
+    """Lowercase a skill name and collapse whitespace."""
+    return " ".join(str(skill).lower().split())
+
+
+def _build_alias_index(aliases: Dict[str, List[str]]) -> Dict[str, str]:
+    index: Dict[str, str] = {}
+    for canonical, names in aliases.items():
+        canonical = normalize_skill_text(canonical)
+        index[canonical] = canonical
+        for name in names:
+            index.setdefault(normalize_skill_text(name), canonical)
+    return index
+
+
+def load_skill_taxonomy(path: str) -> Dict[str, List[str]]:
+    """Read a JSON taxonomy file mapping canonical skill names to lists of aliases."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"Skill taxonomy {path} must map skill names to alias lists")
+    return {str(name): [str(a) for a in aliases or []] for name, aliases in data.items()}
+
+
+@lru_cache()
+def get_skill_taxonomy() -> Dict[str, List[str]]:
+    """The built-in taxonomy extended with ``settings.skill_taxonomy_path``, if set."""
+    taxonomy = {name: list(aliases) for name, aliases in DEFAULT_SKILL_ALIASES.items()}
+    if settings.skill_taxonomy_path:
+        for name, aliases in load_skill_taxonomy(settings.skill_taxonomy_path).items():
+            taxonomy.setdefault(normalize_skill_text(name), []).extend(aliases)
+    return taxonomy
+
+
+@lru_cache()
+def _alias_index() -> Dict[str, str]:
+    return _build_alias_index(get_skill_taxonomy())
+
+
+def canonical_skill_name(skill: str) -> str:
+    """Map a skill or alias ("k8s", "Node") to its canonical name."""
+    name = normalize_skill_text(skill)
+    return _alias_index().get(name, name)
@@ -0,0 +1,118 @@
+"""Benchmark PDF text extraction on large generated PDFs.
+
+Compares the original page loop (``text += page.extract_text() + "\\n"``),
+the serial page extractor and the chunked extraction used by the API with
+different worker counts::
+
+    cd backend
+    python -m benchmarks.pdf_extraction --pages 400 --workers 1 2 4
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import tempfile
+import time
+from typing import Callable, List
+
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+from app.services import extraction
+
+
+def make_pdf(pages: int, lines: int) -> bytes:
+    """A PDF of ``pages`` pages with ``lines`` lines of text each."""
+    writer = PdfWriter()
+    font = writer._add_object(DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+    }))
+    for number in range(pages):
+        page = writer.add_blank_page(width=612, height=792)
+        page[NameObject("/Resources")] = DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): font}),
+        })
+        body = " ".join(
+            f"(Page {number} line {i}: Senior engineer, Python, Kubernetes, PostgreSQL) '"
+            for i in range(lines)
+        )
+        stream = DecodedStreamObject()
+        stream.set_data(f"BT /F1 9 Tf 40 760 Td 11 TL {body} ET".encode())
+        page[NameObject("/Contents")] = writer._add_object(stream)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def naive_extract(path: str) -> str:
+    """The extraction loop this module replaced."""
+    reader = PdfReader(path)
+    text = ""
+    for page in reader.pages:
+        text += page.extract_text() + "\n"
+    return text
+
+
+def best_of(repeat: int, func: Callable[[], str]) -> "tuple[float, int]":
+    timings: List[float] = []
+    chars = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        chars = len(func())
+        timings.append(time.perf_counter() - started)
+    return min(timings), chars
+
+
+def chunked(path: str, workers: int) -> Callable[[], str]:
+    def run() -> str:
+        extraction.settings.extraction_workers = workers
+        extraction.shutdown_extraction_pool()
+        extraction.get_extraction_pool()
+        return asyncio.run(extraction.extract_text(path, "bench.pdf", strict=True))
+    return run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--lines", type=int, default=50)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument(
+        "--chunk-pages", type=int, default=extraction.settings.extraction_chunk_pages
+    )
+    parser.add_argument("--max-chars", type=int, default=0, help="character budget, 0 for none")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    settings = extraction.settings
+    settings.extraction_max_pages = 0
+    settings.extraction_max_chars = args.max_chars
+    settings.extraction_chunk_pages = args.chunk_pages
+    settings.extraction_cpu_seconds = 0
+    settings.extraction_timeout_seconds = 3600
+
+    content = make_pdf(args.pages, args.lines)
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+        f.write(content)
+    print(f"{args.pages} pages, {len(content) / 1e6:.1f} MB, {os.cpu_count()} CPUs")
+    print(f"{'method':<28}{'seconds':>10}{'chars':>12}")
+    try:
+        cases = [
+            ("naive += loop", lambda: naive_extract(f.name)),
+            ("serial pages", lambda: extraction.extract_pdf_text(f.name, 0, args.max_chars)),
+        ] + [
+            (f"chunked, {workers} workers", chunked(f.name, workers)) for workers in args.workers
+        ]
+        for name, func in cases:
+            seconds, chars = best_of(args.repeat, func)
+            print(f"{name:<28}{seconds:>10.3f}{chars:>12}")
+    finally:
+        extraction.shutdown_extraction_pool()
+        os.unlink(f.name)
+
+
+if __name__ == "__main__":
+    main()
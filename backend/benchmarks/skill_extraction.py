@@ -0,0 +1,88 @@
+"""Benchmark skill extraction against a large generated taxonomy.
+
+Compares the Aho-Corasick matcher with a single regex alternation of every
+term (the previous approach) as the taxonomy grows::
+
+    cd backend
+    python -m benchmarks.skill_extraction --skills 1000 10000 --resume-chars 8000
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import Callable, Dict, List
+
+from app.tools.skill_matcher import SkillMatcher
+from app.tools.skill_taxonomy import DEFAULT_SKILL_ALIASES, normalize_skill_text
+
+WORDS = (
+    "senior engineer built scalable services team lead data platform migration "
+    "python kubernetes react postgresql designed mentored delivered api cloud"
+).split()
+
+
+def make_taxonomy(size: int) -> Dict[str, List[str]]:
+    taxonomy = {name: list(aliases) for name, aliases in DEFAULT_SKILL_ALIASES.items()}
+    for n in range(size):
+        taxonomy[f"skill{n} framework"] = [f"sk{n}", f"skill {n}"]
+    return taxonomy
+
+
+def regex_extractor(taxonomy: Dict[str, List[str]]) -> Callable[[str], List[str]]:
+    canonical = {}
+    for name, aliases in taxonomy.items():
+        for alias in [name, *aliases]:
+            canonical.setdefault(normalize_skill_text(alias), normalize_skill_text(name))
+    terms = sorted(canonical, key=len, reverse=True)
+    pattern = re.compile(
+        r"(?<![\w.+#-])(" + "|".join(re.escape(t) for t in terms) + r")(?![\w+#-]|\.\w)",
+        re.IGNORECASE,
+    )
+    return lambda text: list(dict.fromkeys(
+        canonical[normalize_skill_text(m.group(1))] for m in pattern.finditer(text)
+    ))
+
+
+def make_resume(chars: int, skills: int) -> str:
+    rng = random.Random(0)
+    words: List[str] = []
+    while sum(len(w) + 1 for w in words) < chars:
+        words.append(f"sk{rng.randrange(skills)}" if rng.random() < 0.05 else rng.choice(WORDS))
+    return " ".join(words)
+
+
+def timed(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--skills", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--resume-chars", type=int, default=8000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'skills':>8}{'build ac':>11}{'scan ac':>10}{'build re':>11}{'scan re':>10}")
+    for size in args.skills:
+        taxonomy = make_taxonomy(size)
+        resume = make_resume(args.resume_chars, size)
+        started = time.perf_counter()
+        matcher = SkillMatcher(taxonomy)
+        build_ac = time.perf_counter() - started
+        started = time.perf_counter()
+        regex = regex_extractor(taxonomy)
+        build_re = time.perf_counter() - started
+        assert matcher.extract(resume) == regex(resume)
+        scan_ac = timed(lambda: matcher.extract(resume), args.repeat)
+        scan_re = timed(lambda: regex(resume), args.repeat)
+        print(f"{size:>8}{build_ac:>11.3f}{scan_ac:>10.4f}{build_re:>11.3f}{scan_re:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Embedding cache tests."""
+
+from typing import List
+
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from app.core.embedding_cache import CachedEmbeddings, EmbeddingStore
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    """Fake embeddings that record every batch sent to the provider."""
+
+    batches: List[List[str]] = []
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.batches.append(list(texts))
+        return super().embed_documents(texts)
+
+
+@pytest.fixture
+def inner():
+    CountingEmbeddings.batches = []
+    return CountingEmbeddings(size=8)
+
+
+def test_only_misses_are_embedded_in_one_batch(tmp_path, inner):
+    cached = CachedEmbeddings(inner, "fake", EmbeddingStore(str(tmp_path / "e.db"), 100))
+    first = cached.embed_documents(["a", "b", "a"])
+    second = cached.embed_documents(["b", "c", "a"])
+
+    assert inner.batches == [["a", "b"], ["c"]]
+    assert first[0] == first[2] == second[2]
+    assert second[0] == first[1]
+
+
+def test_keys_include_model_name(tmp_path, inner):
+    store = EmbeddingStore(str(tmp_path / "e.db"), 100)
+    CachedEmbeddings(inner, "model-a", store).embed_documents(["same text"])
+    CachedEmbeddings(inner, "model-b", store).embed_documents(["same text"])
+    assert len(inner.batches) == 2
+
+
+def test_store_evicts_least_recently_used(tmp_path):
+    store = EmbeddingStore(str(tmp_path / "e.db"), max_entries=2)
+    store.put_many({"old": [1.0]})
+    store.put_many({"newer": [2.0]})
+    store.get_many(["old"])
+    store.put_many({"newest": [3.0]})
+
+    assert len(store) == 2
+    assert set(store.get_many(["old", "newer", "newest"])) == {"old", "newest"}
+
+
+@pytest.mark.asyncio
+async def test_async_embedding_uses_cache(tmp_path, inner):
+    cached = CachedEmbeddings(inner, "fake", EmbeddingStore(str(tmp_path / "e.db"), 100))
+    expected = cached.embed_documents(["resume"])
+    inner.batches.clear()
+    assert await cached.aembed_documents(["resume"]) == expected
+    assert inner.batches == []
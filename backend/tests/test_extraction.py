@@ -0,0 +1,183 @@
+"""Tests for resume text extraction in the worker pool."""
+
+import io
+import time
+
+import pytest
+from docx import Document
+from httpx import AsyncClient
+from pypdf import PageObject, PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+from app.services import extraction
+from app.services.extraction import extract_text, extraction_errors, extraction_seconds, page_errors
+
+
+def blank_pdf(pages: int) -> bytes:
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=72, height=72)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def text_pdf(pages: int) -> bytes:
+    """A PDF whose page ``n`` reads "page n"."""
+    writer = PdfWriter()
+    font = writer._add_object(DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+    }))
+    for number in range(pages):
+        page = writer.add_blank_page(width=612, height=792)
+        page[NameObject("/Resources")] = DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): font}),
+        })
+        stream = DecodedStreamObject()
+        stream.set_data(f"BT /F1 10 Tf 50 750 Td (page {number}) Tj ET".encode())
+        page[NameObject("/Contents")] = writer._add_object(stream)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def busy_loop(*args):
+    while True:
+        pass
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(extraction.settings, "extraction_workers", 1)
+    extraction.shutdown_extraction_pool()
+    yield
+    extraction.shutdown_extraction_pool()
+
+
+@pytest.mark.asyncio
+async def test_extracts_docx_and_capped_pdf_in_worker_process(pool, monkeypatch):
+    monkeypatch.setattr(extraction.settings, "extraction_max_pages", 3)
+    doc = Document()
+    doc.add_paragraph("Jane Doe")
+    doc.add_paragraph("Python, Kubernetes")
+    buffer = io.BytesIO()
+    doc.save(buffer)
+
+    before = extraction_seconds.count(format="docx")
+    assert await extract_text(buffer.getvalue(), "resume.DOCX") == "Jane Doe\nPython, Kubernetes"
+    assert extraction_seconds.count(format="docx") == before + 1
+
+    assert await extract_text(blank_pdf(10), "resume.pdf") == "\n" * 3
+
+
+@pytest.mark.asyncio
+async def test_extraction_errors_are_reported_not_raised(pool, monkeypatch):
+    errors = extraction_errors.value(format="pdf")
+    text = await extract_text(b"not a pdf", "resume.pdf")
+    assert text.startswith("Error extracting PDF")
+
+    monkeypatch.setattr(extraction, "extract_pdf_pages", busy_loop)
+    extraction.shutdown_extraction_pool()  # fork workers that see the patched extractor
+    monkeypatch.setattr(extraction.settings, "extraction_cpu_seconds", 1)
+    text = await extract_text(blank_pdf(1), "resume.pdf")
+    assert text == "Error extracting PDF: CPU time limit exceeded"
+    assert extraction_errors.value(format="pdf") == errors + 2
+
+
+@pytest.mark.asyncio
+async def test_pdf_page_over_the_cpu_limit_fails_the_file(pool, monkeypatch):
+    monkeypatch.setattr(PageObject, "extract_text", busy_loop)
+    monkeypatch.setattr(extraction.settings, "extraction_cpu_seconds", 1)
+    errors = page_errors.value()
+    text = await extract_text(text_pdf(2), "resume.pdf")
+    assert text == "Error extracting PDF: CPU time limit exceeded"
+    assert page_errors.value() == errors
+
+
+@pytest.mark.asyncio
+async def test_pdf_pages_are_extracted_in_parallel_chunks_in_order(pool, monkeypatch):
+    monkeypatch.setattr(extraction.settings, "extraction_chunk_pages", 3)
+    monkeypatch.setattr(extraction.settings, "extraction_max_pages", 10)
+    text = await extract_text(text_pdf(12), "resume.pdf")
+    assert text == "".join(f"page {n}\n" for n in range(10))
+
+
+@pytest.mark.asyncio
+async def test_pdf_extraction_stops_at_character_budget(monkeypatch):
+    monkeypatch.setattr(extraction.settings, "extraction_workers", 0)
+    monkeypatch.setattr(extraction.settings, "extraction_chunk_pages", 2)
+    monkeypatch.setattr(extraction.settings, "extraction_max_chars", 20)
+    requested = []
+    extract_pages = extraction.extract_pdf_pages
+
+    def recording(source, start, stop, max_chars):
+        requested.append((start, stop))
+        return extract_pages(source, start, stop, max_chars)
+
+    monkeypatch.setattr(extraction, "extract_pdf_pages", recording)
+    text = await extract_text(text_pdf(40), "resume.pdf")
+    assert text == "page 0\npage 1\npage 2\n"[:20]
+    assert requested == [(0, 2), (2, 4)]
+
+
+@pytest.mark.asyncio
+async def test_unreadable_pdf_page_is_skipped(monkeypatch):
+    monkeypatch.setattr(extraction.settings, "extraction_workers", 0)
+    extract_page = PageObject.extract_text
+
+    def flaky(page, *args, **kwargs):
+        text = extract_page(page, *args, **kwargs)
+        if text == "page 1":
+            raise ValueError("bad content stream")
+        return text
+
+    monkeypatch.setattr(PageObject, "extract_text", flaky)
+    errors = page_errors.value()
+    assert await extract_text(text_pdf(3), "resume.pdf") == "page 0\n\npage 2\n"
+    assert page_errors.value() == errors + 1
+
+
+@pytest.mark.asyncio
+async def test_cpu_limit_covers_the_whole_pdf_not_each_chunk(pool, monkeypatch):
+    extract_page = PageObject.extract_text
+
+    def slow(page, *args, **kwargs):
+        started = time.process_time()
+        while time.process_time() - started < 0.4:
+            pass
+        return extract_page(page, *args, **kwargs)
+
+    monkeypatch.setattr(PageObject, "extract_text", slow)
+    monkeypatch.setattr(extraction.settings, "extraction_chunk_pages", 1)
+    monkeypatch.setattr(extraction.settings, "extraction_cpu_seconds", 1)
+    text = await extract_text(text_pdf(5), "resume.pdf")
+    assert text == "Error extracting PDF: CPU time limit exceeded"
+
+
+@pytest.mark.asyncio
+async def test_chunks_in_flight_share_the_remaining_cpu_budget(pool, monkeypatch):
+    monkeypatch.setattr(extraction.settings, "extraction_workers", 3)
+    monkeypatch.setattr(extraction.settings, "extraction_chunk_pages", 1)
+    monkeypatch.setattr(extraction.settings, "extraction_cpu_seconds", 30)
+    submitted = []
+    submit = extraction._submit
+
+    def recording(pool, func, *args, cpu_seconds=None):
+        submitted.append(cpu_seconds)
+        return submit(pool, func, *args, cpu_seconds=cpu_seconds)
+
+    monkeypatch.setattr(extraction, "_submit", recording)
+    assert await extract_text(text_pdf(4), "resume.pdf") == "page 0\npage 1\npage 2\npage 3\n"
+    first, *chunks = submitted
+    assert first is None and len(chunks) == 3
+    assert sum(chunks) <= 30 and all(0 < share <= 10 for share in chunks)
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_extraction_time(client: AsyncClient):
+    await extract_text(b"plain text resume", "resume.txt")
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert "# TYPE resume_extraction_seconds summary" in response.text
@@ -0,0 +1,172 @@
+"""Tests for bulk resume ingestion."""
+
+import asyncio
+import io
+import zipfile
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.services import ingestion
+
+
+class FakeParser:
+    """Parser that reads "name|email|skill,skill" resumes without an LLM."""
+
+    async def parse_text(self, raw_text, mode=None):
+        if "garbage" in raw_text:
+            raise ValueError("not a resume")
+        name, email, skills = raw_text.strip().split("|")
+        return {"name": name, "email": email, "skills": skills.split(","), "experience_years": 3}
+
+
+def zip_of(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_bulk_upload_ingests_files_and_reports_progress(
+    client: AsyncClient, test_engine, monkeypatch
+):
+    monkeypatch.setattr(ingestion, "ResumeParserAgent", FakeParser)
+    monkeypatch.setattr(
+        ingestion, "async_session",
+        async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False),
+    )
+    monkeypatch.setattr(ingestion.settings, "ingestion_commit_batch_size", 2)
+    monkeypatch.setattr(ingestion.settings, "upload_spool_bytes", 16)  # spool most files to disk
+    archive = zip_of({
+        "resumes/alice.txt": "Alice|alice.bulk@example.com|python,sql",
+        "resumes/bob.txt": "Bob|bob.bulk@example.com|go",
+        "__MACOSX/._bob.txt": "junk",
+        "resumes/bob-again.txt": "Bob|bob.bulk@example.com|go,rust",
+        "resumes/bob-copy.txt": "Bob|bob.bulk@example.com|go",
+    })
+    response = await client.post("/api/candidates/bulk", files=[
+        ("files", ("batch.zip", archive, "application/zip")),
+        ("files", ("carol.txt", b"Carol|carol.bulk@example.com|rust", "text/plain")),
+        ("files", ("broken.txt", b"garbage", "text/plain")),
+    ])
+    assert response.status_code == 202
+    batch = response.json()
+    assert batch["total"] == 6
+    assert [f["status"] for f in batch["files"]] == ["queued"] * 6
+
+    response = await client.get(f"/api/candidates/bulk/{batch['id']}")
+    batch = response.json()
+    assert batch["status"] == "completed"
+    assert (batch["succeeded"], batch["failed"], batch["duplicates"]) == (3, 1, 2)
+    files = {f["filename"]: f for f in batch["files"]}
+    assert files["broken.txt"]["error"].startswith("Parsing failed")
+    for name in ["bob-again.txt", "bob-copy.txt"]:
+        assert files[name]["status"] == "duplicate"
+        assert files[name]["candidate_id"] == files["bob.txt"]["candidate_id"]
+
+    candidate = (await client.get(f"/api/candidates/{files['alice.txt']['candidate_id']}")).json()
+    assert candidate["skills"] == ["python", "sql"]
+    assert (await client.get("/api/candidates/search", params={"skills": "rust"})).json()
+
+
+@pytest.mark.asyncio
+async def test_failing_stage_cancels_the_others(client: AsyncClient, test_engine, monkeypatch):
+    async def broken_persist(*args):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(ingestion, "ResumeParserAgent", FakeParser)
+    monkeypatch.setattr(
+        ingestion, "async_session",
+        async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False),
+    )
+    monkeypatch.setattr(ingestion, "_persist", broken_persist)
+    monkeypatch.setattr(ingestion.settings, "ingestion_queue_size", 1)
+    response = await client.post("/api/candidates/bulk", files=[
+        ("files", (f"r{n}.txt", f"R{n}|r{n}.lost@example.com|go".encode(), "text/plain"))
+        for n in range(8)
+    ])
+    assert response.status_code == 202
+
+    batch = (await client.get(f"/api/candidates/bulk/{response.json()['id']}")).json()
+    assert batch["status"] == "failed"
+    stages = {"_extract_stage", "_parse_stage", "_persist_stage"}
+    running = {task.get_coro().__qualname__.split(".")[0] for task in asyncio.all_tasks()}
+    assert not running & stages
+
+
+@pytest.mark.asyncio
+async def test_bulk_upload_rejects_too_many_files(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(ingestion.settings, "ingestion_max_files", 1)
+    response = await client.post("/api/candidates/bulk", files=[
+        ("files", ("a.txt", b"a", "text/plain")),
+        ("files", ("b.txt", b"b", "text/plain")),
+    ])
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_upload_reuses_cached_parse_and_flags_duplicates(client: AsyncClient, monkeypatch):
+    from app.api import candidates as candidates_api
+
+    calls = []
+
+    class CountingParser:
+        async def parse(self, content, filename, mode=None):
+            calls.append(filename)
+            name, email, skills = content.decode().split("|")
+            return {
+                "name": name, "email": email, "skills": skills.split(","),
+                "raw_text": content.decode(),
+            }
+
+    monkeypatch.setattr(candidates_api, "ResumeParserAgent", CountingParser)
+    resume = b"Dana|dana.dedup@example.com|java"
+
+    upload = {"file": ("dana.txt", resume)}
+    first = (await client.post("/api/candidates/upload", files=upload)).json()
+    assert first["duplicate"] is False
+    again = (await client.post("/api/candidates/upload", files={"file": ("cv.txt", resume)})).json()
+    assert again["duplicate"] is True
+    assert again["id"] == first["id"]
+    assert calls == ["dana.txt"]
+
+    await client.delete(f"/api/candidates/{first['id']}")
+    recreated = (await client.post("/api/candidates/upload", files=upload)).json()
+    assert recreated["duplicate"] is False
+    assert calls == ["dana.txt"]
+
+
+@pytest.mark.asyncio
+async def test_resumes_without_an_email_are_not_duplicates(
+    client: AsyncClient, test_engine, monkeypatch
+):
+    from app.api import candidates as candidates_api
+
+    class NoEmailParser:
+        async def parse(self, content, filename, mode=None):
+            name, _, skills = content.decode().split("|")
+            return {"name": name, "skills": skills.split(","), "raw_text": content.decode()}
+
+    monkeypatch.setattr(candidates_api, "ResumeParserAgent", NoEmailParser)
+    first, second = [
+        (await client.post("/api/candidates/upload", files={"file": upload})).json()
+        for upload in [("eve.txt", b"Eve||go"), ("finn.txt", b"Finn||go")]
+    ]
+    assert (first["duplicate"], second["duplicate"]) == (False, False)
+    assert first["id"] != second["id"]
+    assert first["email"] != second["email"]
+
+    monkeypatch.setattr(ingestion, "ResumeParserAgent", FakeParser)
+    monkeypatch.setattr(
+        ingestion, "async_session",
+        async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False),
+    )
+    response = await client.post("/api/candidates/bulk", files=[
+        ("files", ("gus.txt", b"Gus||go", "text/plain")),
+        ("files", ("hana.txt", b"Hana||go", "text/plain")),
+    ])
+    batch = (await client.get(f"/api/candidates/bulk/{response.json()['id']}")).json()
+    assert (batch["succeeded"], batch["duplicates"]) == (2, 0)
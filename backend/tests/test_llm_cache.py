@@ -0,0 +1,73 @@
+"""LLM response cache tests."""
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from app.core import llm as llm_module
+from app.core import llm_cache
+from app.core.llm_cache import LLMCache, cache_hits, cache_misses
+
+
+class FakeChatModel(FakeListChatModel):
+    temperature: float = 0.0
+
+
+@pytest.fixture
+def fresh_llm(monkeypatch, tmp_path):
+    monkeypatch.setattr(llm_module.settings, "llm_cache_enabled", True)
+    monkeypatch.setattr(llm_module.settings, "llm_cache_path", str(tmp_path / "llm.db"))
+    llm_module.get_llm.cache_clear()
+    llm_module.get_llm_cache.cache_clear()
+    yield
+    llm_module.get_llm.cache_clear()
+    llm_module.get_llm_cache.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_identical_prompts_are_answered_from_cache(tmp_path):
+    cache = LLMCache(str(tmp_path / "llm.db"), 3600, 100)
+    model = FakeChatModel(responses=["first", "second"], cache=cache)
+    hits, misses = cache_hits.value(), cache_misses.value()
+
+    assert (await model.ainvoke("Parse this resume")).content == "first"
+    assert (await model.ainvoke("Parse this resume")).content == "first"
+    assert (await model.ainvoke("Parse another resume")).content == "second"
+    assert (cache_hits.value() - hits, cache_misses.value() - misses) == (1, 2)
+
+    other_model = FakeChatModel(responses=["other"], temperature=0.1, cache=model.cache)
+    assert other_model.invoke("Parse this resume").content == "other"
+
+
+def test_entries_expire_and_least_recently_used_are_evicted(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    cache = LLMCache(str(tmp_path / "llm.db"), ttl_seconds=60, max_entries=2)
+    model = FakeChatModel(responses=["a", "b", "c", "d"], cache=cache)
+    model.invoke("one")
+    model.invoke("two")
+    now[0] += 30
+    model.invoke("one")
+    model.invoke("three")
+    assert len(cache) == 2
+    assert model.invoke("one").content == "a"
+    now[0] += 61
+    assert model.invoke("one").content == "d"
+
+
+def test_sampled_models_bypass_the_cache_unless_forced(fresh_llm, monkeypatch):
+    monkeypatch.setattr(
+        llm_module, "_build_chat_model",
+        lambda spec: FakeChatModel(responses=["x"], temperature=0.7),
+    )
+    assert llm_module.get_llm().cache is None
+
+    llm_module.get_llm.cache_clear()
+    monkeypatch.setattr(llm_module.settings, "llm_cache_force", True)
+    assert isinstance(llm_module.get_llm().cache, LLMCache)
+
+    llm_module.get_llm.cache_clear()
+    monkeypatch.setattr(llm_module.settings, "llm_cache_force", False)
+    monkeypatch.setattr(
+        llm_module, "_build_chat_model", lambda spec: FakeChatModel(responses=["x"])
+    )
+    assert isinstance(llm_module.get_llm().cache, LLMCache)
@@ -0,0 +1,125 @@
+"""LLM chain instrumentation tests."""
+
+import json
+from uuid import uuid4
+
+import pytest
+from fastapi import Request
+from fastapi.routing import APIRoute
+from httpx import AsyncClient
+from langchain_core.exceptions import OutputParserException
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+from app.agents import job_matcher, scheduler
+from app.core import llm_metrics
+from app.core.llm import get_model_name
+from app.core.llm_metrics import (
+    LLMMetricsHandler,
+    call_seconds,
+    chain_seconds,
+    completion_tokens,
+    current_endpoint,
+    estimated_cost,
+    model_price,
+    parse_failures,
+    prompt_tokens,
+    track_endpoint,
+)
+from app.core.metrics import Counter
+from tests.test_ranking import make_candidate, make_job
+
+
+@pytest.mark.asyncio
+async def test_agent_calls_are_tagged_with_the_endpoint(client: AsyncClient, monkeypatch):
+    answer = {
+        "recommended_time": "2030-01-07T10:00:00",
+        "reasoning": "Monday morning",
+        "alternatives": [],
+    }
+    model = FakeListChatModel(responses=[json.dumps(answer)])
+    monkeypatch.setattr(scheduler, "get_llm", lambda *_: model)
+    labels = {
+        "agent": "scheduler",
+        "endpoint": "POST /api/interviews/schedule",
+        "model": get_model_name("scheduler"),
+    }
+    calls, tokens = call_seconds.count(status="ok", **labels), completion_tokens.value(**labels)
+
+    response = await client.post(
+        "/api/interviews/schedule",
+        params={"candidate_id": 1, "job_id": 1},
+        json={"interviewers": ["lead@example.com"]},
+    )
+    assert response.status_code == 200
+    assert call_seconds.count(status="ok", **labels) == calls + 1
+    assert chain_seconds.count(**labels) >= 1
+    assert completion_tokens.value(**labels) > tokens
+
+    metrics = (await client.get("/metrics")).text
+    series = 'llm_call_seconds_count{agent="scheduler",endpoint="POST /api/interviews/schedule"'
+    assert series in metrics
+
+
+def test_label_values_are_escaped():
+    counter = Counter("test_escaped_total", "Label escaping")
+    counter.inc(model='local:"tiny"\\v1\nbeta')
+    assert counter.render()[-1] == r'test_escaped_total{model="local:\"tiny\"\\v1\nbeta"} 1.0'
+
+
+@pytest.mark.asyncio
+async def test_endpoint_label_is_the_route_template():
+    route = APIRoute("/{candidate_id}/match/{job_id}", lambda: None, methods=["POST"])
+    request = Request({
+        "type": "http", "method": "POST", "path": "/api/candidates/1/match/1",
+        "path_params": {"candidate_id": 1, "job_id": 1}, "route": route,
+        "headers": [], "query_string": b"",
+    })
+    await track_endpoint(request)
+    assert current_endpoint.get() == "POST /api/candidates/{candidate_id}/match/{job_id}"
+
+    request.scope["route"] = APIRoute(
+        "/api/candidates/{candidate_id}/match/{job_id}", lambda: None, methods=["POST"]
+    )
+    await track_endpoint(request)
+    assert current_endpoint.get() == "POST /api/candidates/{candidate_id}/match/{job_id}"
+
+
+@pytest.mark.asyncio
+async def test_unparseable_output_counts_one_parse_failure(monkeypatch):
+    model = FakeListChatModel(responses=["not json"])
+    monkeypatch.setattr(job_matcher, "get_llm", lambda *_: model)
+    labels = {"agent": "matcher", "endpoint": "background", "model": get_model_name("matcher")}
+    failures = parse_failures.value(**labels)
+
+    with pytest.raises(OutputParserException):
+        await job_matcher.JobMatcherAgent().match(make_candidate(1, ["python"]), make_job())
+    assert parse_failures.value(**labels) == failures + 1
+
+
+def test_reported_usage_is_counted_and_priced():
+    endpoint = "GET /api/jobs/{job_id}/candidates"
+    handler = LLMMetricsHandler("matcher", "openai:gpt-4o-mini", endpoint)
+    run_id = uuid4()
+    handler.on_chat_model_start(
+        {}, [[HumanMessage("score")]], run_id=run_id,
+        metadata={"ls_provider": "openai", "ls_model_name": "gpt-4o-2024-08-06"},
+    )
+    usage = {"input_tokens": 1000, "output_tokens": 200, "total_tokens": 1200}
+    message = AIMessage("{}", usage_metadata=usage)
+    labels = {"agent": "matcher", "endpoint": endpoint, "model": "openai:gpt-4o-2024-08-06"}
+    cost = estimated_cost.value(**labels)
+
+    handler.on_llm_end(LLMResult(generations=[[ChatGeneration(message=message)]]), run_id=run_id)
+    assert prompt_tokens.value(**labels) == 1000
+    assert completion_tokens.value(**labels) == 200
+    assert estimated_cost.value(**labels) - cost == pytest.approx((1000 * 2.5 + 200 * 10.0) / 1e6)
+
+
+def test_model_prices_match_the_longest_prefix(monkeypatch):
+    assert model_price("openai:gpt-4o-mini-2024-07-18") == (0.15, 0.6)
+    assert model_price("ollama:llama3.2") == (0.0, 0.0)
+    assert model_price("anthropic:unknown-model") is None
+    monkeypatch.setattr(llm_metrics.settings, "llm_prices", {"unknown-model": [1.0, 2.0]})
+    assert model_price("anthropic:unknown-model") == (1.0, 2.0)
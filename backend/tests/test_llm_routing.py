@@ -0,0 +1,86 @@
+"""Per-agent model routing and fallback chain tests."""
+
+import asyncio
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from app.core import llm as llm_module
+from app.core.llm import LLMSpec, fallback_specs, get_llm, get_model_name, llm_spec
+
+
+class FailingChatModel(FakeListChatModel):
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        raise ValueError("model unavailable")
+
+
+class SlowChatModel(FakeListChatModel):
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(1)
+        return await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+
+@pytest.fixture
+def routing(monkeypatch):
+    settings = llm_module.settings
+    monkeypatch.setattr(settings, "llm_provider", "openai")
+    monkeypatch.setattr(settings, "openai_model", "gpt-4o")
+    monkeypatch.setattr(settings, "ollama_model", "llama3")
+    monkeypatch.setattr(settings, "llm_temperature", 0.7)
+    monkeypatch.setattr(settings, "llm_cache_enabled", False)
+    get_llm.cache_clear()
+    yield settings
+    get_llm.cache_clear()
+
+
+def test_role_overrides_fall_back_to_global_settings(routing, monkeypatch):
+    monkeypatch.setattr(routing, "parser_llm_provider", "ollama")
+    monkeypatch.setattr(routing, "parser_llm_temperature", 0.0)
+    monkeypatch.setattr(routing, "matcher_llm_model", "gpt-4o-mini")
+
+    assert llm_spec() == LLMSpec("openai", "gpt-4o", 0.7)
+    assert llm_spec("parser") == LLMSpec("ollama", "llama3", 0.0)
+    assert llm_spec("matcher") == LLMSpec("openai", "gpt-4o-mini", 0.7)
+    assert get_model_name("parser") == "ollama:llama3"
+    assert get_model_name("scheduler") == "openai:gpt-4o"
+    with pytest.raises(ValueError):
+        llm_spec("reviewer")
+
+
+def test_fallbacks_name_a_provider_and_optionally_a_model(routing, monkeypatch):
+    monkeypatch.setattr(routing, "llm_fallbacks", ["ollama", "openai:gpt-4o-mini"])
+    monkeypatch.setattr(routing, "matcher_llm_fallbacks", ["anthropic:claude-3-5-haiku-latest"])
+
+    assert fallback_specs("parser") == [
+        LLMSpec("ollama", "llama3", 0.7),
+        LLMSpec("openai", "gpt-4o-mini", 0.7),
+    ]
+    assert fallback_specs("matcher") == [LLMSpec("anthropic", "claude-3-5-haiku-latest", 0.7)]
+
+
+@pytest.mark.asyncio
+async def test_failing_or_slow_primary_hands_over_to_the_fallback(routing, monkeypatch):
+    monkeypatch.setattr(routing, "llm_fallbacks", ["ollama"])
+    monkeypatch.setattr(routing, "llm_fallback_timeout_seconds", 0.05)
+    primary = {"openai": FailingChatModel(responses=["unused"])}
+    monkeypatch.setattr(
+        llm_module,
+        "_build_chat_model",
+        lambda spec: primary.get(spec.provider) or FakeListChatModel(responses=["from fallback"]),
+    )
+    assert (await get_llm("matcher").ainvoke("score")).content == "from fallback"
+
+    get_llm.cache_clear()
+    primary["openai"] = SlowChatModel(responses=["too late"])
+    assert (await get_llm("matcher").ainvoke("score")).content == "from fallback"
+
+
+def test_models_are_built_once_per_role(routing, monkeypatch):
+    built = []
+    monkeypatch.setattr(
+        llm_module, "_build_chat_model",
+        lambda spec: built.append(spec) or FakeListChatModel(responses=["x"]),
+    )
+    assert get_llm("parser") is get_llm("parser")
+    assert get_llm("parser") is not get_llm("matcher")
+    assert len(built) == 2
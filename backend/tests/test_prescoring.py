@@ -0,0 +1,54 @@
+"""Tests for background pre-scoring of uploaded candidates."""
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.candidate import Candidate, CandidateMatch
+from app.models.job import Job
+from app.services import prescoring
+from app.services.match_store import load_matches
+from app.services.prescoring import PrescorePool
+
+
+class EchoMatcher:
+    async def match(self, candidate, job) -> CandidateMatch:
+        return CandidateMatch(
+            candidate_id=candidate.id, job_id=job.id, overall_score=75,
+            skill_match=75, experience_match=75, education_match=75, reasoning="prescored",
+        )
+
+
+@pytest.mark.asyncio
+async def test_prescore_pool_stores_matches(test_engine, test_session, monkeypatch):
+    monkeypatch.setattr(prescoring, "JobMatcherAgent", EchoMatcher)
+    applied = Job(title="Rust Engineer", description="Systems work.", required_skills=["Rust"])
+    other = Job(title="Rust Lead", description="Lead a team.", required_skills=["Rust"])
+    closed = Job(
+        title="Rust Intern", description="Learn.", required_skills=["Rust"], status="closed"
+    )
+    first = Candidate(name="Applicant", email="applicant@example.com", skills=["rust"])
+    second = Candidate(name="Walk-in", email="walkin@example.com", skills=["rust"])
+    test_session.add_all([applied, other, closed, first, second])
+    await test_session.commit()
+
+    sessions = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+    pool = PrescorePool(2, 10, sessions)
+    assert pool.submit(first.id, applied.id)
+    assert pool.submit(second.id)
+    await pool.join()
+    await pool.stop()
+
+    stored = await load_matches(test_session, [(first, applied), (first, other)])
+    assert list(stored) == [(first.id, applied.id)]
+    stored = await load_matches(test_session, [(second, job) for job in (applied, other, closed)])
+    assert set(stored) == {(second.id, applied.id), (second.id, other.id)}
+
+
+@pytest.mark.asyncio
+async def test_prescore_pool_is_bounded():
+    pool = PrescorePool(1, 1)
+    pool.start()
+    pool._tasks[0].cancel()
+    assert pool.submit(1)
+    assert not pool.submit(2)
+    await pool.stop()
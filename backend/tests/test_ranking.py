@@ -0,0 +1,366 @@
+"""Candidate ranking tests."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from httpx import AsyncClient
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.agents import job_matcher
+from app.api import candidates as candidates_api
+from app.api import jobs as jobs_api
+from app.models.candidate import Candidate, CandidateMatch
+from app.models.job import Job
+from app.models.match_result import MatchResult
+from app.services import ranking
+from app.services.prefilter import prefilter_candidates
+from app.services.ranking import rank_candidates, rank_jobs
+from app.services.scoring import DETERMINISTIC_REASONING, score_candidate
+
+
+def make_job(**overrides):
+    data = {
+        "id": 1,
+        "title": "Backend Engineer",
+        "description": "Build APIs.",
+        "required_skills": ["Python", "FastAPI"],
+        "preferred_skills": ["Docker"],
+        "experience_min": 3,
+        "experience_max": 8,
+        "education_level": "Bachelor",
+    }
+    data.update(overrides)
+    return SimpleNamespace(**data)
+
+
+def make_candidate(id, skills, years=5, degree="BSc Bachelor of Science"):
+    return SimpleNamespace(
+        id=id,
+        name=f"Candidate {id}",
+        skills=skills,
+        experience_years=years,
+        education=[{"degree": degree}],
+        work_history=[],
+    )
+
+
+def analysis(score, **extra):
+    return {
+        "overall_score": score,
+        "skill_match": score,
+        "experience_match": score,
+        "education_match": score,
+        "reasoning": "looks good",
+        "gaps": [],
+        "strengths": [],
+        **extra,
+    }
+
+
+class FakeMatcher:
+    """Matcher that echoes a fixed score without calling an LLM."""
+
+    calls = 0
+
+    async def match(self, candidate, job) -> CandidateMatch:
+        FakeMatcher.calls += 1
+        return CandidateMatch(
+            candidate_id=candidate.id,
+            job_id=job.id,
+            overall_score=90.0 - candidate.id % 10,
+            skill_match=80.0,
+            experience_match=80.0,
+            education_match=80.0,
+            reasoning="fake",
+        )
+
+
+class FlakyMatcher(FakeMatcher):
+    """Matcher that fails for one candidate."""
+
+    async def match(self, candidate, job) -> CandidateMatch:
+        if candidate.id == 2:
+            raise RuntimeError("provider error")
+        return await super().match(candidate, job)
+
+
+class HalfBatchMatcher(FakeMatcher):
+    """Batch matcher that only scores odd candidate IDs."""
+
+    batches = 0
+
+    async def match_batch(self, candidates, job, fallback=True):
+        HalfBatchMatcher.batches += 1
+        return [await self.match(c, job) for c in candidates if c.id % 2]
+
+
+def test_score_candidate_full_match():
+    match = score_candidate(make_candidate(1, ["python", "FastAPI", "docker"]), make_job())
+    assert match.overall_score == 100.0
+    assert match.gaps == []
+
+
+def test_score_candidate_reports_gaps():
+    match = score_candidate(make_candidate(1, ["Python"], years=1, degree="Diploma"), make_job())
+    assert match.gaps == ["FastAPI"]
+    assert match.skill_match == pytest.approx(100 / 2.5, abs=0.01)
+    assert match.experience_match == pytest.approx(100 / 3, abs=0.01)
+    assert match.education_match == pytest.approx(100 / 3, abs=0.01)
+
+
+def test_prefilter_keeps_top_n():
+    job = make_job()
+    candidates = [
+        make_candidate(1, []),
+        make_candidate(2, ["python", "fastapi"]),
+        make_candidate(3, ["python"]),
+    ]
+    survivors, scores = prefilter_candidates(candidates, job, top_n=2)
+    assert [c.id for c in survivors] == [2, 3]
+    assert scores[0].overall_score >= scores[1].overall_score
+
+
+@pytest.mark.asyncio
+async def test_rank_candidates_survives_partial_failure(monkeypatch):
+    monkeypatch.setattr(ranking.settings, "ranking_deterministic_fallback", False)
+    candidates = [make_candidate(i, ["python", "fastapi"]) for i in range(1, 5)]
+    result = await rank_candidates(FlakyMatcher(), make_job(), candidates, min_score=0, limit=10)
+    assert result.stats.llm_failed == 1
+    assert result.stats.failed_ids == [2]
+    assert [m.candidate_id for m in result.matches] == [1, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_rank_candidates_falls_back_to_deterministic_scores():
+    candidates = [make_candidate(i, ["python", "fastapi"]) for i in range(1, 5)]
+    result = await rank_candidates(FlakyMatcher(), make_job(), candidates, min_score=0, limit=10)
+    assert result.stats.llm_failed == result.stats.deterministic_scored == 1
+    fallback = next(m for m in result.matches if m.candidate_id == 2)
+    assert fallback.reasoning == DETERMINISTIC_REASONING
+
+
+@pytest.mark.asyncio
+async def test_rank_candidates_without_llm():
+    candidates = [make_candidate(i, ["python"] * i) for i in range(1, 4)]
+    result = await rank_candidates(
+        None, make_job(), candidates, min_score=0, limit=2, use_llm=False
+    )
+    assert result.stats.deterministic_scored == 3
+    assert len(result.matches) == 2
+
+
+@pytest.mark.asyncio
+async def test_rank_candidates_batches_and_retries_leftovers(monkeypatch):
+    monkeypatch.setattr(ranking.settings, "match_batch_size", 3)
+    HalfBatchMatcher.batches = 0
+    candidates = [make_candidate(i, ["python"]) for i in range(1, 7)]
+    result = await rank_candidates(
+        HalfBatchMatcher(), make_job(), candidates, min_score=0, limit=10
+    )
+    assert HalfBatchMatcher.batches == 2
+    assert result.stats.llm_scored == 6
+
+
+@pytest.mark.asyncio
+async def test_iter_matches_reports_pairs_a_crashed_producer_left(monkeypatch):
+    class BrokenBatchMatcher(FakeMatcher):
+        async def match_batch(self, candidates, job, fallback=True):
+            return [None]  # not a match: fails outside the matcher's own error handling
+
+    candidates = [make_candidate(i, ["python"]) for i in range(1, 5)]
+    pairs = [(candidate, make_job()) for candidate in candidates]
+    outcomes = await asyncio.wait_for(
+        _collect(ranking.iter_matches(BrokenBatchMatcher(), pairs, batch_size=3)), 5
+    )
+    assert sorted(o.candidate.id for o in outcomes) == [1, 2, 3, 4]
+    assert [o.candidate.id for o in outcomes if o.error] == [1, 2, 3]
+    assert all(isinstance(o.error, AttributeError) for o in outcomes if o.error)
+
+
+async def _collect(outcomes):
+    return [outcome async for outcome in outcomes]
+
+
+@pytest.mark.asyncio
+async def test_match_batch_falls_back_for_invalid_items(monkeypatch):
+    batch_response = json.dumps({"matches": [
+        analysis(80, candidate_id=1),
+        analysis(150, candidate_id=2),
+    ]})
+    single_response = json.dumps(analysis(60))
+    llm = FakeListChatModel(responses=[batch_response, single_response])
+    monkeypatch.setattr(job_matcher, "get_llm", lambda *_: llm)
+
+    candidates = [make_candidate(1, ["python"]), make_candidate(2, ["go"])]
+    matches = await job_matcher.JobMatcherAgent().match_batch(candidates, make_job())
+    assert [(m.candidate_id, m.overall_score) for m in matches] == [(1, 80), (2, 60)]
+
+
+@pytest.mark.asyncio
+async def test_rank_jobs_prefilters_and_scores_each_job(monkeypatch):
+    monkeypatch.setattr(ranking.settings, "ranking_deterministic_fallback", False)
+    candidate = make_candidate(2, ["Python", "FastAPI"])
+    jobs = [
+        make_job(id=11),
+        make_job(id=12, required_skills=["Python"]),
+        make_job(id=13, required_skills=["COBOL"]),
+    ]
+    result = await rank_jobs(
+        FakeMatcher(), candidate, jobs, min_score=0, limit=10, prefilter_top_n=2
+    )
+    assert result.candidate_id == 2
+    assert sorted(m.job_id for m in result.matches) == [11, 12]
+    assert result.stats.total == 3
+    assert result.stats.prefilter_dropped == 1
+
+    result = await rank_jobs(FlakyMatcher(), candidate, jobs, min_score=0, limit=10)
+    assert result.matches == []
+    assert result.stats.failed_ids == [11, 12, 13]
+
+
+@pytest.mark.asyncio
+async def test_get_matched_jobs_only_ranks_open_jobs(
+    client: AsyncClient, test_session, monkeypatch
+):
+    monkeypatch.setattr(candidates_api, "JobMatcherAgent", FakeMatcher)
+    job = {"title": "Go Developer", "description": "Write Go services.", "required_skills": ["Go"]}
+    open_id = (await client.post("/api/jobs", json=job)).json()["id"]
+    closed = Job(**job, status="closed")
+    candidate = Candidate(name="Mobile", email="mobile@example.com", skills=["golang"])
+    test_session.add_all([closed, candidate])
+    await test_session.commit()
+
+    response = await client.get(
+        f"/api/candidates/{candidate.id}/jobs",
+        params={"min_score": 0, "limit": 100, "prefilter_top_n": 100},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    job_ids = [m["job_id"] for m in data["matches"]]
+    assert open_id in job_ids
+    assert closed.id not in job_ids
+    assert data["stats"]["llm_scored"] == data["stats"]["total"]
+
+    response = await client.get("/api/candidates/999999/jobs")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_matched_candidates_reports_stage_counts(
+    client: AsyncClient, test_session, monkeypatch
+):
+    monkeypatch.setattr(jobs_api, "JobMatcherAgent", FakeMatcher)
+    FakeMatcher.calls = 0
+
+    response = await client.post("/api/jobs", json={
+        "title": "Backend Engineer",
+        "description": "Build APIs with Python and FastAPI.",
+        "required_skills": ["Python", "FastAPI"],
+    })
+    job_id = response.json()["id"]
+
+    for i, skills in enumerate([["python", "fastapi"], ["python"], ["cobol"]]):
+        test_session.add(Candidate(
+            name=f"Ranked {i}",
+            email=f"ranked{i}@example.com",
+            skills=skills,
+        ))
+    await test_session.commit()
+
+    response = await client.get(
+        f"/api/jobs/{job_id}/candidates",
+        params={"prefilter_top_n": 2, "min_score": 0},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    stats = data["stats"]
+    assert stats["prefilter_dropped"] == stats["total"] - 2
+    assert stats["llm_scored"] == 2
+    assert FakeMatcher.calls == 2
+    assert len(data["matches"]) == stats["returned"] == 2
+
+
+@pytest.mark.asyncio
+async def test_ranking_reuses_stored_matches_across_job_edits(
+    client: AsyncClient, test_session, monkeypatch
+):
+    monkeypatch.setattr(jobs_api, "JobMatcherAgent", FakeMatcher)
+    job = {
+        "title": "Data Engineer",
+        "description": "Own our data pipelines end to end.",
+        "required_skills": ["SQL"],
+    }
+    response = await client.post("/api/jobs", json=job)
+    job_id = response.json()["id"]
+    test_session.add(Candidate(name="Cached", email="cached@example.com", skills=["sql"]))
+    await test_session.commit()
+
+    params = {"prefilter_top_n": 1, "min_score": 0}
+    FakeMatcher.calls = 0
+    first = (await client.get(f"/api/jobs/{job_id}/candidates", params=params)).json()
+    second = (await client.get(f"/api/jobs/{job_id}/candidates", params=params)).json()
+    assert FakeMatcher.calls == 1
+    assert second["stats"]["cache_hits"] == 1
+    assert second["matches"] == first["matches"]
+
+    await client.put(f"/api/jobs/{job_id}", json={**job, "salary_max": 200000})
+    await client.get(f"/api/jobs/{job_id}/candidates", params=params)
+    assert FakeMatcher.calls == 1
+
+    await client.put(f"/api/jobs/{job_id}", json={**job, "required_skills": ["SQL", "Spark"]})
+    third = (await client.get(f"/api/jobs/{job_id}/candidates", params=params)).json()
+    assert FakeMatcher.calls == 2
+    assert third["stats"]["cache_hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_matched_candidates_emits_matches_then_done(
+    client: AsyncClient, test_session, monkeypatch
+):
+    monkeypatch.setattr(jobs_api, "JobMatcherAgent", FakeMatcher)
+    response = await client.post("/api/jobs", json={
+        "title": "Platform Engineer",
+        "description": "Run our Kubernetes platform.",
+        "required_skills": ["Kubernetes"],
+    })
+    job_id = response.json()["id"]
+    for i in range(3):
+        test_session.add(Candidate(
+            name=f"Streamed {i}", email=f"streamed{i}@example.com", skills=["kubernetes"]
+        ))
+    await test_session.commit()
+
+    response = await client.get(
+        f"/api/jobs/{job_id}/candidates/stream",
+        params={"prefilter_top_n": 3, "min_score": 0, "snapshot_every": 2, "limit": 2},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    kinds = [event["event"] for event in events]
+    assert kinds == ["match", "match", "snapshot", "match", "done"]
+    assert len(events[2]["data"]) == 2
+    assert events[-1]["data"]["stats"]["llm_scored"] == 3
+    assert len(events[-1]["data"]["matches"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_rankings_of_one_job_both_store_their_matches(test_engine, test_session):
+    job = Job(title="Data Engineer", description="Build pipelines.", required_skills=["Python"])
+    candidate = Candidate(name="Concurrent", email="concurrent@example.com", skills=["python"])
+    test_session.add_all([job, candidate])
+    await test_session.commit()
+
+    sessions = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+    async with sessions() as first, sessions() as second:
+        rankings = await asyncio.gather(*(
+            rank_candidates(FakeMatcher(), job, [candidate], min_score=0, limit=10, session=session)
+            for session in (first, second)
+        ))
+    assert [r.stats.llm_scored for r in rankings] == [1, 1]
+    rows = await test_session.execute(select(MatchResult).where(MatchResult.job_id == job.id))
+    assert len(rows.scalars().all()) == 1
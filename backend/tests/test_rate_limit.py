@@ -0,0 +1,132 @@
+"""Tests for LLM rate limiting, retries and adaptive concurrency."""
+
+import asyncio
+import time
+
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from app.core import rate_limit
+from app.core.rate_limit import (
+    AdaptiveConcurrency,
+    ProviderLimiter,
+    RateLimitedChatModel,
+    TokenBucket,
+    throttled_calls,
+)
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+class FlakyModel(BaseChatModel):
+    """Fails the first ``failures`` calls with a 429 and tracks concurrency."""
+
+    failures: int = 0
+    delay: float = 0.0
+    calls: int = 0
+    active: int = 0
+    peak: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "flaky"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        raise NotImplementedError
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.calls <= self.failures:
+                raise RateLimitError("slow down")
+        finally:
+            self.active -= 1
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="ok"))])
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    monkeypatch.setattr(rate_limit.settings, "llm_retry_max_wait_seconds", 0.01)
+    limiter = ProviderLimiter("test")
+    limiter.concurrency = AdaptiveConcurrency(4)
+    monkeypatch.setitem(rate_limit._limiters, "test", limiter)
+    return limiter
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_calls_are_retried_and_concurrency_backs_off(limiter):
+    inner = FlakyModel(failures=2)
+    model = RateLimitedChatModel(inner=inner, provider="test")
+    throttled = throttled_calls.value(provider="test")
+
+    assert (await model.ainvoke("hello")).content == "ok"
+    assert inner.calls == 3
+    assert throttled_calls.value(provider="test") == throttled + 2
+    assert limiter.concurrency.limit == 2  # 4 halved twice, then one success adds one back
+
+
+@pytest.mark.asyncio
+async def test_retries_give_up_after_max_retries(limiter, monkeypatch):
+    monkeypatch.setattr(rate_limit.settings, "llm_max_retries", 1)
+    inner = FlakyModel(failures=5)
+    with pytest.raises(RateLimitError):
+        await RateLimitedChatModel(inner=inner, provider="test").ainvoke("hello")
+    assert inner.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_in_flight_calls_are_capped(limiter):
+    limiter.concurrency = AdaptiveConcurrency(2)
+    inner = FlakyModel(delay=0.02)
+    model = RateLimitedChatModel(inner=inner, provider="test")
+    await asyncio.gather(*(model.ainvoke(f"prompt {n}") for n in range(6)))
+    assert inner.peak == 2
+    assert limiter.concurrency.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_reserved_work_and_direct_calls_share_one_cap(limiter):
+    limiter.concurrency = AdaptiveConcurrency(2)
+    inner = FlakyModel(delay=0.02)
+    model = RateLimitedChatModel(inner=inner, provider="test")
+
+    async def reserved(n):
+        async with limiter.reserve():
+            await model.ainvoke(f"first {n}")
+            await model.ainvoke(f"second {n}")
+
+    await asyncio.gather(
+        *(reserved(n) for n in range(3)), *(model.ainvoke(f"direct {n}") for n in range(3))
+    )
+    assert inner.calls == 9
+    assert inner.peak == 2
+    assert limiter.concurrency.in_flight == 0
+
+
+def test_concurrency_halves_on_overload_and_recovers_additively():
+    concurrency = AdaptiveConcurrency(8)
+    concurrency.on_overload()
+    concurrency.on_overload()
+    assert concurrency.limit == 2
+    for _ in range(2):
+        concurrency.on_success()
+    assert concurrency.limit == 3
+    for _ in range(3):
+        concurrency.on_success()
+    assert concurrency.limit == 4
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(per_minute=60_000)
+    await bucket.acquire(60_000)
+    started = time.monotonic()
+    await bucket.acquire(100)
+    assert time.monotonic() - started >= 0.09
@@ -0,0 +1,162 @@
+"""Tests for incremental re-ranking after job edits."""
+
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+
+from app.models.candidate import Candidate, CandidateMatch
+from app.models.job import Job
+from app.models.match_result import MatchResult
+from app.services import rerank
+from app.services.match_store import load_matches, save_matches
+from app.services.rerank import (
+    classify_job_change,
+    patch_match,
+    refresh_stored_matches,
+    snapshot_job,
+)
+
+
+def make_job(**overrides):
+    data = {
+        "id": 1,
+        "title": "Platform Engineer",
+        "description": "Run our clusters.",
+        "required_skills": ["Kubernetes"],
+        "preferred_skills": [],
+        "experience_min": 2,
+        "experience_max": None,
+        "education_level": None,
+    }
+    data.update(overrides)
+    return SimpleNamespace(**data)
+
+
+def test_classify_job_change():
+    job = make_job()
+    assert classify_job_change(job, make_job()).fields == set()
+
+    change = classify_job_change(job, make_job(required_skills=["Kubernetes", "Go"]))
+    assert change.components == {"skill_match"}
+    assert not change.full_rescore
+
+    change = classify_job_change(job, make_job(experience_min=5, education_level="Master"))
+    assert change.components == {"experience_match", "education_match"}
+
+    assert classify_job_change(job, make_job(description="Run everything.")).full_rescore
+
+
+def test_patch_match_only_moves_affected_components():
+    candidate = SimpleNamespace(id=1, skills=["k8s"], experience_years=4, education=[])
+    match = CandidateMatch(
+        candidate_id=1, job_id=1, overall_score=85, skill_match=90,
+        experience_match=80, education_match=70, reasoning="llm",
+        strengths=["Kubernetes"],
+    )
+    edited = make_job(required_skills=["Kubernetes", "Go"])
+    patched = patch_match(match, candidate, make_job(), edited, {"skill_match"})
+    assert patched.skill_match == 40
+    assert patched.overall_score == 55
+    assert patched.experience_match == 80
+    assert patched.gaps == ["Go"]
+    assert patched.provisional
+    assert "skill_match" in patched.reasoning
+
+
+class FreshMatcher:
+    async def match(self, candidate, job):
+        return CandidateMatch(
+            candidate_id=candidate.id, job_id=job.id, overall_score=60, skill_match=60,
+            experience_match=60, education_match=60, reasoning="fresh",
+        )
+
+
+async def stored_job_match(session, skills=("Linux",)):
+    job = Job(title="SRE", description="Keep it up.", required_skills=list(skills))
+    email = f"oncall-{len(skills)}@example.com"
+    candidate = Candidate(name="Oncall", email=email, skills=["linux"])
+    session.add_all([job, candidate])
+    await session.commit()
+    stored = CandidateMatch(
+        candidate_id=candidate.id, job_id=job.id, overall_score=70, skill_match=70,
+        experience_match=70, education_match=70, reasoning="old",
+    )
+    await save_matches(session, [(candidate, job, stored)])
+    return job, candidate
+
+
+@pytest.mark.asyncio
+async def test_full_rescore_drops_rows_and_rescores_in_background(test_session, monkeypatch):
+    job, candidate = await stored_job_match(test_session)
+    before = snapshot_job(job)
+    job.description = "Keep it up, and build tooling."
+    await test_session.commit()
+
+    change = classify_job_change(before, job)
+    dropped = await refresh_stored_matches(test_session, before, job, change)
+    await test_session.commit()
+    assert dropped == [candidate.id]
+    rows = await test_session.execute(select(MatchResult).where(MatchResult.job_id == job.id))
+    assert rows.scalars().all() == []
+
+    monkeypatch.setattr(rerank, "JobMatcherAgent", FreshMatcher)
+    await rerank.rescore_job_matches(job.id, dropped, session_factory=lambda: test_session)
+    stored = await load_matches(test_session, [(candidate, job)])
+    assert stored[(candidate.id, job.id)].reasoning == "fresh"
+
+
+@pytest.mark.asyncio
+async def test_patched_rows_are_provisional_until_the_llm_refresh(test_session, monkeypatch):
+    job, candidate = await stored_job_match(test_session, skills=("Linux", "Go"))
+    before = snapshot_job(job)
+    job.required_skills = ["Linux"]
+    await test_session.commit()
+    change = classify_job_change(before, job)
+
+    rescore = await refresh_stored_matches(test_session, before, job, change, rescore_patched=True)
+    assert rescore == [candidate.id]
+    await test_session.commit()
+    interim = (await load_matches(test_session, [(candidate, job)]))[(candidate.id, job.id)]
+    assert interim.provisional and interim.reasoning != "old"
+
+    class BrokenMatcher:
+        async def match(self, candidate, job):
+            raise RuntimeError("provider down")
+
+    monkeypatch.setattr(rerank, "JobMatcherAgent", BrokenMatcher)
+    await rerank.rescore_job_matches(job.id, [candidate.id], session_factory=lambda: test_session)
+    assert await load_matches(test_session, [(candidate, job)]) == {}
+
+
+class CountingMatcher(FreshMatcher):
+    calls = 0
+
+    async def match(self, candidate, job):
+        CountingMatcher.calls += 1
+        return await super().match(candidate, job)
+
+
+@pytest.mark.asyncio
+async def test_refresh_job_matches_patches_without_the_llm(test_session, monkeypatch):
+    job, candidate = await stored_job_match(test_session, skills=("Linux", "Go", "Rust"))
+    before = snapshot_job(job)
+    job.experience_min = 6
+    await test_session.commit()
+
+    monkeypatch.setattr(rerank, "JobMatcherAgent", CountingMatcher)
+    change = classify_job_change(before, job)
+    await rerank.refresh_job_matches(job.id, before, change, session_factory=lambda: test_session)
+    stored = (await load_matches(test_session, [(candidate, job)]))[(candidate.id, job.id)]
+    assert stored.provisional and CountingMatcher.calls == 0
+
+    job = await test_session.get(Job, job.id)
+    before = snapshot_job(job)
+    job.experience_min = 7
+    await test_session.commit()
+    monkeypatch.setattr(rerank.settings, "rescore_patched_matches", True)
+    change = classify_job_change(before, job)
+    await rerank.refresh_job_matches(job.id, before, change, session_factory=lambda: test_session)
+    stored = (await load_matches(test_session, [(candidate, job)]))[(candidate.id, job.id)]
+    assert (stored.reasoning, stored.provisional) == ("fresh", False)
+    assert CountingMatcher.calls == 1
@@ -0,0 +1,111 @@
+"""Tests for deterministic resume pre-extraction and parse modes."""
+
+import json
+from datetime import date
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from app.agents import resume_parser
+from app.agents.resume_parser import ResumeParserAgent
+from app.core.tokens import approximate_tokens
+from app.tools.resume_extractor import extract_experience_years, extract_skills, pre_extract
+
+RESUME = """Jane Q Doe
+jane.doe@example.com | +1 (415) 555-0134
+
+Skills: Python, k8s, Node.js, C++, PostgreSQL, a go-to person for MS Office
+
+Senior Engineer, Acme    Jan 2019 - Present
+Engineer, Beta           03/2015 – 12/2018
+Intern                   2014 to 2014
+
+M.Sc. Computer Science, MIT, 2014
+B.A. Mathematics, 2012
+"""
+
+
+def test_pre_extract_finds_confident_fields():
+    fields = pre_extract(RESUME)
+    assert fields["name"] == "Jane Q Doe"
+    assert fields["email"] == "jane.doe@example.com"
+    assert fields["phone"] == "+1 (415) 555-0134"
+    assert fields["skills"] == ["python", "kubernetes", "node.js", "c++", "postgresql"]
+    assert [e["level"] for e in fields["education"]] == [4, 3]
+    assert fields["education"][0]["year"] == 2014
+    assert "summary" not in fields
+
+
+def test_experience_merges_overlapping_ranges():
+    text = "2010 - 2012\nJun 2011 - Dec 2013\nFeb 2020 - present"
+    assert extract_experience_years(text, today=date(2021, 1, 1)) == 5
+    assert extract_experience_years("no dates here") is None
+
+
+def test_experience_counts_only_work_history():
+    text = (
+        "Curriculum Vitae\nSam Lee\n\nEducation\nB.Sc. Physics, 2010 - 2014\n\n"
+        "Experience\nAnalyst, Gamma    2014 - 2016\n"
+    )
+    assert extract_experience_years(text) == 3
+    assert pre_extract(text)["name"] == "Sam Lee"
+
+    unheaded = "Analyst, Gamma 2014 - 2016\n\nEducation\nB.Sc. Physics 2010 - 2014"
+    assert extract_experience_years(unheaded) == 3
+
+
+def test_skill_matching_respects_word_boundaries():
+    text = "Golang and Go, not good or google; React.js, reactive"
+    assert extract_skills(text) == ["go", "react"]
+
+
+@pytest.mark.asyncio
+async def test_fast_mode_skips_the_llm(monkeypatch):
+    monkeypatch.setattr(resume_parser, "get_llm", lambda *_: pytest.fail("LLM called"))
+    result = await ResumeParserAgent().parse_text(RESUME, mode="fast")
+    assert result["name"] == "Jane Q Doe"
+    assert result["experience_years"] > 0
+    assert result["work_history"] == []
+    assert result["parse_mode"] == "fast"
+    assert "email" in result["deterministic_fields"]
+
+
+@pytest.mark.asyncio
+async def test_hybrid_mode_only_asks_for_missing_fields(monkeypatch):
+    answer = {"summary": "Backend engineer", "skills": ["Python", "Leadership"], "work_history": []}
+    llm = FakeListChatModel(responses=[json.dumps(answer)])
+    monkeypatch.setattr(resume_parser, "get_llm", lambda *_: llm)
+    monkeypatch.setattr(resume_parser, "get_token_counter", lambda *_: approximate_tokens)
+    prompts = []
+    original = ResumeParserAgent._llm_parse
+
+    async def spy(self, raw_text, format_instructions):
+        prompts.append(format_instructions)
+        return await original(self, raw_text, format_instructions)
+
+    monkeypatch.setattr(ResumeParserAgent, "_llm_parse", spy)
+    result = await ResumeParserAgent().parse_text(RESUME, mode="hybrid")
+
+    [instructions] = prompts
+    assert '"summary"' in instructions and '"work_history"' in instructions
+    assert '"email"' not in instructions
+    assert result["summary"] == "Backend engineer"
+    assert result["email"] == "jane.doe@example.com"
+    assert result["skills"] == [
+        "python", "kubernetes", "node.js", "c++", "postgresql", "Leadership"
+    ]
+    assert result["trimming"]["actions"] == []
+
+
+@pytest.mark.asyncio
+async def test_hybrid_mode_lets_the_llm_correct_the_name(monkeypatch):
+    answer = {"name": "Jane Doe", "skills": [], "summary": None}
+    llm = FakeListChatModel(responses=[json.dumps(answer)])
+    monkeypatch.setattr(resume_parser, "get_llm", lambda *_: llm)
+    monkeypatch.setattr(resume_parser, "get_token_counter", lambda *_: approximate_tokens)
+    text = "Senior Backend Engineer\n" + RESUME
+    result = await ResumeParserAgent().parse_text(text, mode="hybrid")
+
+    assert result["name"] == "Jane Doe"
+    assert "name" not in result["deterministic_fields"]
+    assert "email" in result["deterministic_fields"]
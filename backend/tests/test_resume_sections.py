@@ -0,0 +1,88 @@
+"""Tests for token-budgeted resume sectioning."""
+
+import json
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from app.agents import resume_parser
+from app.agents.resume_parser import ResumeParserAgent
+from app.tools.resume_sections import fit_to_budget, split_sections
+
+
+def words(text: str) -> int:
+    return len(text.split())
+
+
+CV = "\n".join([
+    "Prof. Ada Example",
+    "ada@example.edu",
+    "Summary",
+    "Researcher in distributed systems.",
+    "Experience",
+    *[f"Role {i} at University {i} doing distributed systems research" for i in range(10)],
+    "Education",
+    "PhD Computer Science, 2010",
+    "Skills",
+    "Python, Go, Kubernetes",
+    "Publications",
+    *[f"Paper {i}: On consensus in the presence of faults, Journal {i}" for i in range(40)],
+    "References",
+    "Available on request from three former supervisors",
+])
+
+
+def test_split_sections_recognises_headings():
+    names = [s.name for s in split_sections(CV)]
+    assert names == [
+        "contact", "summary", "experience", "education", "skills", "publications", "references",
+    ]
+
+
+def test_fit_to_budget_leaves_short_resumes_alone():
+    text, report = fit_to_budget(CV, 10_000, words)
+    assert text == CV
+    assert report["actions"] == []
+
+
+def test_fit_to_budget_trims_low_value_sections_first():
+    text, report = fit_to_budget(CV, 200, words)
+    assert words(text) <= 200
+    actions = [(a["section"], a["action"]) for a in report["actions"]]
+    assert actions[:2] == [("references", "dropped"), ("publications", "compressed")]
+    assert "Role 9 at University 9" in text
+    assert "PhD Computer Science" in text
+    assert "more lines omitted" in text
+    assert report["tokens_before"] > report["tokens_after"]
+
+
+def test_fit_to_budget_truncates_when_dropping_is_not_enough():
+    text, report = fit_to_budget(CV, 40, words)
+    assert words(text) <= 40
+    assert text.startswith("Prof. Ada Example")
+    assert ("experience", "truncated") in [(a["section"], a["action"]) for a in report["actions"]]
+
+
+def test_fit_to_budget_cuts_a_single_paragraph_at_a_word():
+    paragraph = " ".join(f"word{i}" for i in range(100))
+    text, _ = fit_to_budget(f"Jo Example\nExperience\n{paragraph}", 30, words)
+    assert text == "Jo Example\nExperience\n" + " ".join(f"word{i}" for i in range(27))
+
+    text, report = fit_to_budget(paragraph, 10, words)
+    assert text == " ".join(f"word{i}" for i in range(10))
+    assert report["tokens_after"] == 10
+
+
+@pytest.mark.asyncio
+async def test_parser_records_trimming(monkeypatch):
+    llm = FakeListChatModel(responses=[json.dumps({"name": "Ada Example", "skills": []})])
+    monkeypatch.setattr(resume_parser, "get_llm", lambda *_: llm)
+    monkeypatch.setattr(resume_parser, "get_token_counter", lambda *_: words)
+    monkeypatch.setattr(resume_parser.settings, "resume_max_tokens", 150)
+
+    result = await ResumeParserAgent().parse_text(CV, mode="full")
+    assert result["trimming"]["budget"] == 150
+    assert result["trimming"]["actions"][0] == {
+        "section": "references", "action": "dropped", "tokens_before": 8, "tokens_after": 0,
+    }
+    assert result["raw_text"] == CV
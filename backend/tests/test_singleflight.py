@@ -0,0 +1,115 @@
+"""In-flight call coalescing tests."""
+
+import asyncio
+import json
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from app.agents import job_matcher, resume_parser
+from app.core.singleflight import SingleFlight, shared_calls
+from app.core.tokens import approximate_tokens
+from tests.test_ranking import analysis, make_candidate, make_job
+
+
+class CountingChatModel(FakeListChatModel):
+    calls: int = 0
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.02)
+        return await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_matches_share_one_llm_call(monkeypatch):
+    llm = CountingChatModel(responses=[json.dumps(analysis(70)), json.dumps(analysis(40))])
+    monkeypatch.setattr(job_matcher, "get_llm", lambda *_: llm)
+    agent, job = job_matcher.JobMatcherAgent(), make_job()
+    shared = shared_calls.value(group="matcher")
+
+    same = make_candidate(1, ["python"])
+    other = make_candidate(2, ["go"])
+    matches = await asyncio.gather(
+        agent.match(same, job), agent.match(same, job), agent.match(other, job)
+    )
+    assert llm.calls == 2
+    assert [m.overall_score for m in matches] == [70, 70, 40]
+    assert shared_calls.value(group="matcher") == shared + 1
+    assert len(job_matcher._inflight) == 0
+
+
+@pytest.mark.asyncio
+async def test_coalesced_parses_get_their_own_copy(monkeypatch):
+    llm = CountingChatModel(responses=[json.dumps({"name": "Ada Example", "skills": ["Python"]})])
+    monkeypatch.setattr(resume_parser, "get_llm", lambda *_: llm)
+    monkeypatch.setattr(resume_parser, "get_token_counter", lambda *_: approximate_tokens)
+    agent = resume_parser.ResumeParserAgent()
+
+    first, second = await asyncio.gather(
+        agent.parse_text("Ada Example\nPython", mode="full"),
+        agent.parse_text("Ada Example\nPython", mode="full"),
+    )
+    assert llm.calls == 1
+    first["skills"].append("Go")
+    assert second["skills"] == ["Python"]
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller_and_are_not_kept():
+    flight: SingleFlight[str] = SingleFlight("test")
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("provider down")
+
+    results = await asyncio.gather(
+        *(flight.do("key", failing) for _ in range(3)), return_exceptions=True
+    )
+    assert [type(r) for r in results] == [ValueError] * 3
+    assert len(calls) == 1
+    assert len(flight) == 0
+
+    async def working():
+        return "ok"
+
+    assert await flight.do("key", working) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_call_runs_on_until_every_caller_is_cancelled():
+    flight: SingleFlight[str] = SingleFlight("test")
+    started, finished = asyncio.Event(), asyncio.Event()
+    cancelled = []
+
+    async def slow():
+        started.set()
+        try:
+            await finished.wait()
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+        return "done"
+
+    first = asyncio.ensure_future(flight.do("key", slow))
+    second = asyncio.ensure_future(flight.do("key", slow))
+    await started.wait()
+    first.cancel()
+    await asyncio.sleep(0)
+    assert not cancelled
+    finished.set()
+    assert await second == "done"
+    assert first.cancelled()
+
+    finished.clear()
+    started.clear()
+    lone = asyncio.ensure_future(flight.do("key", slow))
+    await started.wait()
+    lone.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await lone
+    await asyncio.sleep(0)
+    assert cancelled == [1]
+    assert len(flight) == 0
@@ -0,0 +1,86 @@
+"""Skill index tests."""
+
+import pytest
+from httpx import AsyncClient
+
+from app.models.candidate import Candidate
+from app.services import skill_index
+from app.services.skill_index import index_candidate_skills, resolve_skills, seed_skills
+from app.tools.skill_taxonomy import canonical_skill_name
+
+
+def test_canonical_skill_name_folds_aliases():
+    assert canonical_skill_name("K8s") == "kubernetes"
+    assert canonical_skill_name(" Node ") == "node.js"
+    assert canonical_skill_name("Elixir") == "elixir"
+
+
+@pytest.mark.asyncio
+async def test_search_intersects_posting_lists(client: AsyncClient, test_session):
+    profiles = {
+        "full": ["Python", "FastAPI", "Postgres"],
+        "partial": ["python", "fastapi"],
+        "other": ["k8s", "Postgresql"],
+    }
+    ids = {}
+    for name, skills in profiles.items():
+        candidate = Candidate(name=name, email=f"skills-{name}@example.com", skills=skills)
+        test_session.add(candidate)
+        await test_session.flush()
+        await index_candidate_skills(test_session, candidate)
+        ids[name] = candidate.id
+    await test_session.commit()
+
+    resolved = await resolve_skills(test_session, ["postgres", "PostgreSQL"])
+    assert len(set(resolved.values())) == 1
+
+    response = await client.get(
+        "/api/candidates/search",
+        params=[("skills", "python"), ("skills", "FastAPI"), ("skills", "postgresql")],
+    )
+    assert response.status_code == 200
+    assert [c["id"] for c in response.json()] == [ids["full"]]
+
+    response = await client.get(
+        "/api/candidates/search",
+        params=[("skills", "kubernetes"), ("skills", "fastapi"), ("match", "any")],
+    )
+    assert {c["id"] for c in response.json()} == {ids["full"], ids["partial"], ids["other"]}
+
+    response = await client.get(
+        "/api/candidates/search",
+        params=[("skills", s) for s in ["python", "Python", "python", "postgres"]],
+    )
+    assert [c["id"] for c in response.json()] == [ids["full"]]
+
+    response = await client.get("/api/candidates/search", params={"skills": "cobol"})
+    assert response.json() == []
+
+
+@pytest.mark.asyncio
+async def test_seeding_keeps_skills_whose_aliases_are_taken(test_session, monkeypatch):
+    monkeypatch.setattr(skill_index, "get_skill_taxonomy", lambda: {
+        "seedlang": ["seed-lang"],
+        "seedlang toolkit": ["seed-lang", "seedkit"],
+    })
+    await seed_skills(test_session)
+
+    resolved = await resolve_skills(test_session, ["seed-lang", "seedkit", "seedlang toolkit"])
+    assert resolved["seed-lang"] == (await resolve_skills(test_session, ["seedlang"]))["seedlang"]
+    assert resolved["seedkit"] == resolved["seedlang toolkit"] != resolved["seed-lang"]
+
+
+@pytest.mark.asyncio
+async def test_seeding_backfills_candidates_stored_before_the_index(
+    client: AsyncClient, test_session, monkeypatch
+):
+    monkeypatch.setattr(skill_index, "get_skill_taxonomy", lambda: {})
+    candidate = Candidate(name="Legacy", email="legacy-skills@example.com", skills=["Backfillium"])
+    test_session.add(candidate)
+    await test_session.commit()
+    response = await client.get("/api/candidates/search", params={"skills": "backfillium"})
+    assert response.json() == []
+
+    await seed_skills(test_session)
+    response = await client.get("/api/candidates/search", params={"skills": "backfillium"})
+    assert [c["id"] for c in response.json()] == [candidate.id]
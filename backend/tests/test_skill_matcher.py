@@ -0,0 +1,55 @@
+"""Tests for the Aho-Corasick skill matcher and loadable taxonomy."""
+
+import json
+
+import pytest
+
+from app.tools import skill_matcher, skill_taxonomy
+from app.tools.skill_matcher import SkillMatch, SkillMatcher
+from app.tools.skill_taxonomy import DEFAULT_SKILL_ALIASES, canonical_skill_name
+
+
+@pytest.fixture
+def clear_taxonomy_caches():
+    caches = [
+        skill_taxonomy.get_skill_taxonomy,
+        skill_taxonomy._alias_index,
+        skill_matcher.get_skill_matcher,
+    ]
+    for cache in caches:
+        cache.cache_clear()
+    yield
+    for cache in caches:
+        cache.cache_clear()
+
+
+def test_matches_have_canonical_names_and_spans():
+    matcher = SkillMatcher(DEFAULT_SKILL_ALIASES)
+    text = "K8s, Node.js and Machine\n  Learning; c++ but not c+++ or pythonic"
+    assert matcher.find(text) == [
+        SkillMatch("kubernetes", 0, 3),
+        SkillMatch("node.js", 5, 12),
+        SkillMatch("machine learning", 17, 35),
+        SkillMatch("c++", 37, 40),
+    ]
+    assert text[17:35] == "Machine\n  Learning"
+
+
+def test_longest_alias_wins_and_overlapping_suffixes_are_found():
+    matcher = SkillMatcher({"google cloud": ["gcp"], "cloud": [], "loud": [], "cloud run": []})
+    assert matcher.extract("google cloud, cloud run; loud") == ["google cloud", "cloud run", "loud"]
+
+
+def test_loaded_taxonomy_extends_the_built_in_one(tmp_path, monkeypatch, clear_taxonomy_caches):
+    taxonomy = {f"skill{n}": [f"alias {n}"] for n in range(10_000)}
+    taxonomy["Python"] = ["cpython"]
+    path = tmp_path / "skills.json"
+    path.write_text(json.dumps(taxonomy))
+    monkeypatch.setattr(skill_taxonomy.settings, "skill_taxonomy_path", str(path))
+
+    matcher = skill_matcher.get_skill_matcher()
+    assert len(matcher) > 20_000
+    assert matcher.extract("CPython, Alias 9999, skill42, skill4200x, golang") == [
+        "python", "skill9999", "skill42", "go",
+    ]
+    assert canonical_skill_name("alias 7") == "skill7"
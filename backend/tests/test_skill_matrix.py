@@ -0,0 +1,88 @@
+"""Vectorized skill scorer tests."""
+
+import random
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.services.prefilter import prefilter_candidates
+from app.services.scoring import score_candidate
+from app.services.skill_matrix import CandidatePool, candidate_pool
+
+SKILLS = ["python", "go", "rust", "sql", "docker", "kubernetes", "react", "aws"]
+DEGREES = ["", "Diploma", "Bachelor of Arts", "Master of Science", "PhD"]
+
+
+def random_candidates(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        SimpleNamespace(
+            id=i,
+            skills=rng.sample(SKILLS, rng.randint(0, 5)),
+            experience_years=rng.randint(0, 15),
+            education=[{"degree": rng.choice(DEGREES)}],
+        )
+        for i in range(n)
+    ]
+
+
+JOB = SimpleNamespace(
+    id=7,
+    required_skills=["Python", "SQL", "Docker"],
+    preferred_skills=["Kubernetes", "python"],
+    experience_min=3,
+    experience_max=8,
+    education_level="Master's degree",
+)
+
+
+def test_pool_scores_match_scalar_scorer():
+    candidates = random_candidates(200)
+    pool = CandidatePool.from_candidates(candidates)
+    scores = pool.score(JOB)
+    for i, candidate in enumerate(candidates):
+        assert pool.to_match(i, JOB, scores) == score_candidate(candidate, JOB)
+
+
+def test_pool_handles_empty_job_requirements():
+    job = SimpleNamespace(
+        id=1, required_skills=[], preferred_skills=[],
+        experience_min=0, experience_max=None, education_level=None,
+    )
+    scores = CandidatePool.from_candidates(random_candidates(10)).score(job)
+    assert (scores.overall == 100.0).all()
+
+
+def test_top_n_orders_best_first():
+    pool = CandidatePool.from_candidates(random_candidates(500))
+    scores = pool.score(JOB)
+    top = pool.top_n(scores, 10)
+    assert list(scores.overall[top]) == sorted(scores.overall, reverse=True)[:10]
+
+
+def test_prefilters_100k_candidates_quickly():
+    candidates = random_candidates(100_000)
+    for candidate in candidates:
+        candidate.updated_at = datetime(2026, 1, 1)
+    start = time.perf_counter()
+    survivors, scores = prefilter_candidates(candidates, JOB, 50)
+    assert time.perf_counter() - start < 1.0
+    assert len(survivors) == len(scores) == 50
+
+    start = time.perf_counter()
+    prefilter_candidates(candidates, JOB, 50)
+    assert time.perf_counter() - start < 0.25
+
+
+def test_cached_pool_is_rebuilt_when_a_candidate_changes():
+    candidates = random_candidates(20)
+    for candidate in candidates:
+        candidate.updated_at = datetime(2026, 1, 1)
+    pool = candidate_pool(candidates)
+    assert candidate_pool(list(candidates)).indices is pool.indices
+
+    candidates[3].skills = ["rust"]
+    candidates[3].updated_at = datetime(2026, 1, 2)
+    rebuilt = candidate_pool(candidates)
+    assert rebuilt.indices is not pool.indices
+    assert rebuilt.to_match(3, JOB, rebuilt.score(JOB)) == score_candidate(candidates[3], JOB)
@@ -0,0 +1,110 @@
+"""Tests for streaming, size-limited resume uploads."""
+
+import hashlib
+import io
+import os
+
+import pytest
+from fastapi import UploadFile
+from httpx import AsyncClient
+from pypdf import PdfWriter
+
+from app.services import uploads
+from app.services.extraction import extract_text
+from app.services.uploads import UploadTooLarge, discard, spool_upload
+
+
+def blank_pdf(pages: int) -> bytes:
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=72, height=72)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def small_spool(monkeypatch):
+    monkeypatch.setattr(uploads.settings, "upload_spool_bytes", 100)
+    monkeypatch.setattr(uploads, "CHUNK_SIZE", 64)
+
+
+@pytest.mark.asyncio
+async def test_spool_keeps_small_files_in_memory_and_large_ones_on_disk(small_spool):
+    small = await spool_upload(UploadFile(io.BytesIO(b"short resume"), filename="a.txt"))
+    assert small.source == b"short resume"
+    assert small.digest == hashlib.sha256(b"short resume").hexdigest()
+
+    content = blank_pdf(3)
+    large = await spool_upload(UploadFile(io.BytesIO(content), filename="b.pdf"))
+    assert isinstance(large.source, str) and large.source.endswith(".pdf")
+    assert large.size == len(content)
+    assert large.digest == hashlib.sha256(content).hexdigest()
+    assert await extract_text(large.source, large.filename) == "\n" * 3
+
+    discard([small, large])
+    assert not os.path.exists(large.source)
+
+
+@pytest.mark.asyncio
+async def test_spool_rejects_oversized_upload_and_removes_temp_file(small_spool, monkeypatch):
+    created = []
+    named_temporary_file = uploads.tempfile.NamedTemporaryFile
+
+    def tracking(*args, **kwargs):
+        f = named_temporary_file(*args, **kwargs)
+        created.append(f.name)
+        return f
+
+    monkeypatch.setattr(uploads.tempfile, "NamedTemporaryFile", tracking)
+    with pytest.raises(UploadTooLarge):
+        await spool_upload(UploadFile(io.BytesIO(b"x" * 1000), filename="big.pdf"), max_bytes=500)
+    assert len(created) == 1 and not os.path.exists(created[0])
+
+
+@pytest.mark.asyncio
+async def test_spool_removes_temp_file_when_the_read_fails(small_spool, monkeypatch):
+    created = []
+    named_temporary_file = uploads.tempfile.NamedTemporaryFile
+
+    def tracking(*args, **kwargs):
+        f = named_temporary_file(*args, **kwargs)
+        created.append(f.name)
+        return f
+
+    class FailingStream(io.BytesIO):
+        def read(self, size=-1):
+            if self.tell() >= 500:
+                raise OSError("connection reset")
+            return super().read(size)
+
+    monkeypatch.setattr(uploads.tempfile, "NamedTemporaryFile", tracking)
+    with pytest.raises(OSError):
+        await spool_upload(UploadFile(FailingStream(b"x" * 1000), filename="cut.pdf"))
+    assert len(created) == 1 and not os.path.exists(created[0])
+
+    with pytest.raises(UploadTooLarge):
+        await spool_upload(UploadFile(io.BytesIO(b"x" * 1000), filename="big.pdf", size=1000), 500)
+    assert len(created) == 1
+
+
+@pytest.mark.asyncio
+async def test_upload_endpoints_return_413_when_too_large(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(uploads.settings, "upload_max_bytes", 100)
+    response = await client.post(
+        "/api/candidates/upload", files={"file": ("resume.txt", b"x" * 101)}
+    )
+    assert response.status_code == 413
+
+    response = await client.post("/api/candidates/bulk", files=[
+        ("files", ("a.txt", b"fine", "text/plain")),
+        ("files", ("b.txt", b"x" * 101, "text/plain")),
+    ])
+    assert response.status_code == 413
+
+    monkeypatch.setattr(uploads.settings, "upload_max_request_bytes", 50)
+    response = await client.post(
+        "/api/candidates/upload", files={"file": ("resume.txt", b"x" * 10)}
+    )
+    assert response.status_code == 413
+    assert "larger than 50 bytes" in response.json()["detail"]
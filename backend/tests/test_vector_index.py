@@ -0,0 +1,112 @@
+"""Semantic candidate index tests."""
+
+from types import SimpleNamespace
+
+import pytest
+from httpx import AsyncClient
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api import jobs as jobs_api
+from app.models.candidate import Candidate
+from app.models.job import Job
+from app.services import vector_index
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_index.settings, "chroma_persist_dir", str(tmp_path))
+    monkeypatch.setattr(
+        vector_index, "get_embedding_model", lambda: DeterministicFakeEmbedding(size=32)
+    )
+    vector_index.get_vector_client.cache_clear()
+    yield vector_index
+    vector_index.get_vector_client.cache_clear()
+
+
+JOB = SimpleNamespace(
+    id=1,
+    title="ML Engineer",
+    description="Train and ship models.",
+    required_skills=["Python", "PyTorch"],
+    preferred_skills=[],
+    status="open",
+)
+
+
+def make_candidate(id, resume_text, years, status="new"):
+    return SimpleNamespace(
+        id=id,
+        name=f"Candidate {id}",
+        resume_text=resume_text,
+        skills=[],
+        work_history=[],
+        education=[],
+        experience_years=years,
+        status=status,
+    )
+
+
+@pytest.mark.asyncio
+async def test_nearest_candidates_ranks_and_filters(index):
+    await index.index_job(JOB)
+    await index.index_candidate(make_candidate(1, index.job_document(JOB), years=5))
+    chef = "Pastry chef with ten years in bakeries."
+    await index.index_candidate(make_candidate(2, chef, years=10))
+    await index.index_candidate(
+        make_candidate(3, index.job_document(JOB), years=1, status="rejected")
+    )
+
+    nearest = await index.nearest_candidates(JOB, k=3)
+    assert [candidate_id for candidate_id, _ in nearest][0] in (1, 3)
+    assert nearest[0][1] == pytest.approx(0.0, abs=1e-5)
+
+    filtered = await index.nearest_candidates(JOB, k=3, status="new", min_experience=2)
+    assert [candidate_id for candidate_id, _ in filtered] == [1, 2]
+
+    await index.remove_candidate(1)
+    remaining = await index.nearest_candidates(JOB, k=3, status="new")
+    assert [candidate_id for candidate_id, _ in remaining] == [2]
+
+
+@pytest.mark.asyncio
+async def test_backfill_indexes_candidates_the_index_is_missing(index, test_engine, test_session):
+    first = Candidate(name="Indexed", email="indexed.vi@example.com", resume_text="Python ML")
+    second = Candidate(name="Missed", email="missed.vi@example.com", resume_text="Go services")
+    test_session.add_all([first, second])
+    await test_session.commit()
+    await index.index_candidate(first)
+
+    assert second.id in await index.unindexed_candidate_ids(test_session)
+    sessions = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+    assert await index.backfill_candidate_index(sessions) >= 1
+    assert await index.unindexed_candidate_ids(test_session) == []
+    assert {first.id, second.id} <= await index.indexed_candidate_ids()
+
+
+@pytest.mark.asyncio
+async def test_semantic_ranking_keeps_unindexed_candidates_and_survives_index_errors(
+    index, client: AsyncClient, test_session, monkeypatch
+):
+    monkeypatch.setattr(jobs_api.settings, "semantic_index_enabled", True)
+    job = Job(title="ML Engineer", description="Train models.", required_skills=["Python"])
+    profile = {"resume_text": "Python", "skills": ["python"]}
+    indexed = Candidate(name="Near", email="near.vi@example.com", **profile)
+    unindexed = Candidate(name="New", email="new.vi@example.com", **profile)
+    test_session.add_all([job, indexed, unindexed])
+    await test_session.commit()
+    await index.index_candidate(indexed)
+
+    params = {"semantic_k": 1, "use_llm": False, "min_score": 0, "limit": 1000}
+    response = await client.get(f"/api/jobs/{job.id}/candidates", params=params)
+    ranked = {m["candidate_id"] for m in response.json()["matches"]}
+    assert {indexed.id, unindexed.id} <= ranked
+
+    async def broken(*args, **kwargs):
+        raise ConnectionError("index unavailable")
+
+    monkeypatch.setattr(jobs_api, "nearest_candidates", broken)
+    response = await client.get(f"/api/jobs/{job.id}/candidates", params=params)
+    assert response.status_code == 200
+    assert response.json()["stats"]["semantic_dropped"] == 0
+    assert {indexed.id, unindexed.id} <= {m["candidate_id"] for m in response.json()["matches"]}
@@ -9,6 +9,38 @@ const client = axios.create({
   },
 })
 
+export interface CandidateMatch {
+  candidate_id: number
+  job_id: number
+  overall_score: number
+  skill_match: number
+  experience_match: number
+  education_match: number
+  reasoning: string
+  gaps: string[]
+  strengths: string[]
+  provisional: boolean
+}
+
+export interface RankingStats {
+  total: number
+  semantic_dropped: number
+  prefilter_dropped: number
+  cache_hits: number
+  llm_scored: number
+  llm_failed: number
+  failed_ids: number[]
+  deterministic_scored: number
+  below_min_score: number
+  returned: number
+}
+
+export interface CandidateRanking {
+  job_id: number
+  matches: CandidateMatch[]
+  stats: RankingStats
+}
+
 export const api = {
   // Candidates
   getCandidates: async () => {
@@ -53,8 +85,13 @@ export const api = {
     return data
   },
 
-  getJobCandidates: async (jobId: number) => {
-    const { data } = await client.get(`/api/jobs/${jobId}/candidates`)
+  getJobCandidates: async (jobId: number): Promise<CandidateMatch[]> => {
+    const ranking = await api.getJobRanking(jobId)
+    return ranking.matches
+  },
+
+  getJobRanking: async (jobId: number): Promise<CandidateRanking> => {
+    const { data } = await client.get<CandidateRanking>(`/api/jobs/${jobId}/candidates`)
     return data
   },
 